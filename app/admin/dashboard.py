@@ -16,8 +16,10 @@ from sqladmin import BaseView, expose
 from sqlalchemy import desc, func
 from sqlalchemy.orm import Session
 from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from app.db import engine
+from app.queries.cache import query_cache_stats
 
 
 class DashboardView(BaseView):
@@ -35,6 +37,10 @@ class DashboardView(BaseView):
             context=data,
         )
 
+    @expose("/query-cache", methods=["GET"])
+    async def query_cache(self, request: Request) -> JSONResponse:
+        return JSONResponse(query_cache_stats())
+
 
 # ---------------------------------------------------------------------------
 # Orchestrator
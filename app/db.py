@@ -1,11 +1,41 @@
+import os
+from collections.abc import AsyncIterator
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from context_db.connection import engine as engine
 from context_db.connection import get_session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+def _async_database_url(url: str) -> str:
+    """Rewrite a sync Postgres URL (psycopg2 or bare) for the asyncpg driver."""
+    _, _, rest = url.partition("://")
+    # asyncpg takes `ssl` rather than libpq's `sslmode`
+    return f"postgresql+asyncpg://{rest.replace('sslmode=', 'ssl=')}"
+
+
+ASYNC_DB_POOL_SIZE = int(os.environ.get("ASYNC_DB_POOL_SIZE", "10"))
+ASYNC_DB_MAX_OVERFLOW = int(os.environ.get("ASYNC_DB_MAX_OVERFLOW", "20"))
+
+async_engine = create_async_engine(
+    _async_database_url(os.environ["DATABASE_URL"]),
+    pool_size=ASYNC_DB_POOL_SIZE,
+    max_overflow=ASYNC_DB_MAX_OVERFLOW,
+    pool_timeout=float(os.environ.get("ASYNC_DB_POOL_TIMEOUT", "10")),
+    pool_recycle=1800,
+    pool_pre_ping=True,
+)
+async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
 
 
 def get_db():  # type: ignore[no-untyped-def]
     with get_session() as session:
         yield session
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with async_session_factory() as session:
+        yield session
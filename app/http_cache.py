@@ -0,0 +1,151 @@
+"""
+HTTP caching for read endpoints, so CloudFront and browsers can reuse
+responses.
+
+Routes opt in with the cache_control dependency. The ETag middleware then
+tags every opted-in 200 GET response with a strong ETag of its body and
+answers matching conditional requests with 304 Not Modified.
+"""
+
+import hashlib
+from collections.abc import Callable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Headers a 304 must repeat from the 200 it stands in for (RFC 9110 15.4.5)
+_NOT_MODIFIED_HEADERS = {
+    "cache-control",
+    "content-location",
+    "date",
+    "etag",
+    "expires",
+    "last-modified",
+    "vary",
+}
+
+
+def cache_control(
+    max_age: int = 0, s_maxage: int = 60, stale_while_revalidate: int = 300
+) -> Callable[[Response], None]:
+    """
+    Dependency setting a public Cache-Control header. s-maxage applies to
+    shared caches (the CDN); max-age to browsers.
+    """
+    value = (
+        f"public, max-age={max_age}, s-maxage={s_maxage}, "
+        f"stale-while-revalidate={stale_while_revalidate}"
+    )
+
+    def dependency(response: Response) -> None:
+        response.headers["Cache-Control"] = value
+
+    return dependency
+
+
+def set_last_modified(response: Response, modified_at: datetime) -> None:
+    """Set Last-Modified; naive datetimes are taken to be UTC."""
+    if modified_at.tzinfo is None:
+        modified_at = modified_at.replace(tzinfo=UTC)
+    response.headers["Last-Modified"] = format_datetime(
+        modified_at.astimezone(UTC), usegmt=True
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified: str) -> bool:
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def _is_not_modified(
+    request_headers: Headers, etag: str, last_modified: str | None
+) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        return _not_modified_since(if_modified_since, last_modified)
+    return False
+
+
+class ETagMiddleware:
+    """
+    Buffers opted-in GET responses (200 with a Cache-Control header), adds a
+    strong ETag from a hash of the body, and replies 304 when the client's
+    validators still match. Other responses, including streams, pass through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        start: Message | None = None
+        body = bytearray()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                cacheable = (
+                    message["status"] == 200
+                    and "cache-control" in headers
+                    and "etag" not in headers
+                )
+                if cacheable:
+                    start = message
+                    return
+                await send(message)
+                return
+
+            if start is None:
+                await send(message)
+                return
+
+            body.extend(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            await self._send_tagged(start, bytes(body), request_headers, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_tagged(
+        self, start: Message, body: bytes, request_headers: Headers, send: Send
+    ) -> None:
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        headers = MutableHeaders(raw=list(start["headers"]))
+        headers["ETag"] = etag
+
+        if _is_not_modified(request_headers, etag, headers.get("last-modified")):
+            raw = [
+                (name, value)
+                for name, value in headers.raw
+                if name.decode("latin-1") in _NOT_MODIFIED_HEADERS
+            ]
+            await send({"type": "http.response.start", "status": 304, "headers": raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({**start, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,84 @@
+"""
+Backfill og:image URLs for recent articles into api_article_images.
+
+Scraping publisher pages happens here rather than on the request path, so
+feed latency never depends on third-party sites. Run it on a schedule, or
+keep it running with --interval:
+
+    python -m app.jobs.backfill_article_images --since-days 3 --interval 60
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from context_db.connection import engine, get_session
+
+from app.models import create_tables
+from app.queries.news.article_images_queries import (
+    query_articles_missing_images,
+    upsert_article_images,
+)
+from app.services.utils.image_fetcher import close_client, fetch_og_images
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_once(since: datetime, batch_size: int) -> int:
+    """Fetch and store images for one batch. Returns the number processed."""
+    # Blocking DB calls are fine here: the job's loop runs nothing else
+    with get_session() as db:
+        pending = query_articles_missing_images(db, since, limit=batch_size)
+        if not pending:
+            return 0
+
+        url_to_image = await fetch_og_images(list({url for _, url in pending}))
+        upsert_article_images(
+            db,
+            [(article_id, url, url_to_image.get(url)) for article_id, url in pending],
+        )
+        db.commit()
+
+    found = sum(1 for _, url in pending if url_to_image.get(url))
+    logger.info("Stored images for %d/%d articles", found, len(pending))
+    return len(pending)
+
+
+async def _run(since_days: int, batch_size: int, interval: float | None) -> None:
+    # One loop for the whole run, so the fetcher's pooled connections are
+    # reused across batches
+    try:
+        while True:
+            # published_at is compared naive, like the ranges from get_date_range
+            since = datetime.now() - timedelta(days=since_days)
+            # Drain everything pending before sleeping
+            while await backfill_once(since, batch_size) == batch_size:
+                pass
+            if interval is None:
+                break
+            await asyncio.sleep(interval)
+    finally:
+        await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--since-days", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="Seconds to sleep between passes; omit to run a single pass",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    create_tables(engine)
+
+    asyncio.run(_run(args.since_days, args.batch_size, args.interval))
+
+
+if __name__ == "__main__":
+    main()
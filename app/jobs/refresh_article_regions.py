@@ -0,0 +1,61 @@
+"""
+Refresh api_article_regions, the article -> region mapping behind the region
+filters on articles and entity analytics.
+
+Like refresh_story_regions, this matches each article's resolved locations
+against REGION_COUNTRY_CODES once, so region-filtered queries read a narrow
+index instead of joining entities and locations per request. The API runs it
+in-process (app.jobs.scheduler). Each pass re-maps articles published in the
+last --since-days plus any ingested since the previous pass; articles
+ingested after that are matched live. The first pass, or one with --full,
+maps every article:
+
+    python -m app.jobs.refresh_article_regions --full
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+
+from context_db.connection import engine
+from sqlalchemy.orm import Session
+
+from app.jobs.watermark import refresh_with_watermark
+from app.models import ArticleRegion, create_tables
+from app.queries.news.article_regions_queries import refresh_article_regions
+
+
+def refresh_once(since: datetime, full: bool = False) -> int:
+    def refresh(db: Session, ingested_since: datetime | None) -> int:
+        if ingested_since is None:
+            return refresh_article_regions(db, None)
+        return refresh_article_regions(db, since, ingested_since=ingested_since)
+
+    return refresh_with_watermark(ArticleRegion.__tablename__, refresh, full=full)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--since-days", type=int, default=3)
+    parser.add_argument("--full", action="store_true", help="Re-map every article")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="Seconds to sleep between passes; omit to run a single pass",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    create_tables(engine)
+
+    while True:
+        refresh_once(datetime.now() - timedelta(days=args.since_days), full=args.full)
+        if args.interval is None:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Refresh api_story_regions, the story -> region mapping behind region filters.
+
+Matching a story's locations against REGION_COUNTRY_CODES is a four-way
+join; doing it here once per story keeps region-filtered feeds to a single
+index scan. The API runs it in-process (app.jobs.scheduler); this entry point
+is for one-off passes. Each pass re-maps stories from the last --since-days
+plus any updated since the previous pass. Stories updated after that are
+matched live by the read queries, so the table only needs to be roughly
+current. The first pass, or one with --full, maps every story:
+
+    python -m app.jobs.refresh_story_regions --full
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+
+from context_db.connection import engine
+from sqlalchemy.orm import Session
+
+from app.jobs.watermark import refresh_with_watermark
+from app.models import StoryRegion, create_tables
+from app.queries.news.story_regions_queries import refresh_story_regions
+
+
+def refresh_once(since: datetime, full: bool = False) -> int:
+    def refresh(db: Session, updated_since: datetime | None) -> int:
+        if updated_since is None:
+            return refresh_story_regions(db, None)
+        return refresh_story_regions(db, since, updated_since=updated_since)
+
+    return refresh_with_watermark(StoryRegion.__tablename__, refresh, full=full)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--since-days", type=int, default=3)
+    parser.add_argument("--full", action="store_true", help="Re-map every story")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="Seconds to sleep between passes; omit to run a single pass",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    create_tables(engine)
+
+    while True:
+        refresh_once(datetime.now() - timedelta(days=args.since_days), full=args.full)
+        if args.interval is None:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Refresh api_story_threads, the story -> thread (connected component of
+story_edges) mapping behind related stories and thread listings.
+
+A rebuild labels the whole graph with union-find. Incremental passes pick up
+edges of stories updated in the last --since-minutes (or since the previous
+pass, if that is earlier) and merge the threads they connect, so only the
+affected threads are rewritten. Stories without edges get a thread of their
+own, so every story the job has seen has a row. The API runs incremental
+passes in-process (app.jobs.scheduler), and the first pass is a rebuild.
+Edges are only ever added between rebuilds; pass --rebuild to also drop
+removed ones:
+
+    python -m app.jobs.refresh_story_threads --rebuild
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+
+from context_db.connection import engine
+from sqlalchemy.orm import Session
+
+from app.jobs.watermark import refresh_with_watermark
+from app.models import StoryThread, create_tables
+from app.queries.news.stories_queries import query_story_edges
+from app.queries.news.story_threads_queries import (
+    label_unthreaded_stories,
+    query_thread_members,
+    replace_story_threads,
+)
+from app.services.utils.union_find import UnionFind
+
+
+def _thread_by_story(components: list[list[str]]) -> dict[str, str]:
+    return {
+        story_id: min(component) for component in components for story_id in component
+    }
+
+
+def rebuild_threads(db: Session) -> int:
+    threads: UnionFind[str] = UnionFind()
+    for a, b in query_story_edges(db):
+        threads.union(a, b)
+    written = replace_story_threads(
+        db, _thread_by_story(threads.components()), clear=True
+    )
+    return written + label_unthreaded_stories(db)
+
+
+def update_threads(db: Session, since: datetime) -> int:
+    written = 0
+    edges = query_story_edges(db, updated_since=since)
+    if edges:
+        threads: UnionFind[str] = UnionFind()
+        # Start from the existing threads the new edges touch, then join them up
+        endpoints = {story_id for edge in edges for story_id in edge}
+        for story_id, thread_id in query_thread_members(db, endpoints):
+            threads.union(thread_id, story_id)
+        for a, b in edges:
+            threads.union(a, b)
+        written = replace_story_threads(db, _thread_by_story(threads.components()))
+    # New stories the edges did not reach are threads of their own
+    return written + label_unthreaded_stories(db, updated_since=since)
+
+
+def refresh_once(since: datetime | None) -> int:
+    """
+    Rebuild all threads when since is None or no pass has run yet, else
+    update incrementally from since or the previous pass, whichever is
+    earlier.
+    """
+
+    def refresh(db: Session, updated_since: datetime | None) -> int:
+        if since is None or updated_since is None:
+            return rebuild_threads(db)
+        return update_threads(db, min(since, updated_since))
+
+    return refresh_with_watermark(
+        StoryThread.__tablename__, refresh, full=since is None
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--since-minutes", type=int, default=60)
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Relabel the whole graph before the first incremental pass",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="Seconds to sleep between passes; omit to run a single pass",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    create_tables(engine)
+
+    if args.rebuild:
+        refresh_once(None)
+        if args.interval is None:
+            return
+        time.sleep(args.interval)
+
+    while True:
+        refresh_once(datetime.now() - timedelta(minutes=args.since_minutes))
+        if args.interval is None:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Runs the refresh jobs in the background of the API process, so the tables
+they maintain stay current wherever the API is deployed. Each pass takes an
+advisory lock, so with several workers only one does the work and the rest
+skip. REFRESH_JOBS_INTERVAL_SECONDS=0 turns this off, e.g. when the jobs run
+on their own schedule instead.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from app.jobs import (
+    refresh_article_regions,
+    refresh_story_regions,
+    refresh_story_threads,
+)
+
+logger = logging.getLogger(__name__)
+
+REFRESH_JOBS_INTERVAL = float(os.environ.get("REFRESH_JOBS_INTERVAL_SECONDS", "60"))
+
+# How far back each pass re-maps, on top of rows updated since the last pass
+_SINCE = timedelta(days=3)
+_THREADS_SINCE = timedelta(hours=1)
+
+
+def _refresh_story_regions() -> int:
+    return refresh_story_regions.refresh_once(datetime.now() - _SINCE)
+
+
+def _refresh_article_regions() -> int:
+    return refresh_article_regions.refresh_once(datetime.now() - _SINCE)
+
+
+def _refresh_story_threads() -> int:
+    # Each pass also covers everything updated since the previous one
+    return refresh_story_threads.refresh_once(datetime.now() - _THREADS_SINCE)
+
+
+async def _run_every(name: str, refresh: Callable[[], int], interval: float) -> None:
+    while True:
+        try:
+            await asyncio.to_thread(refresh)
+        except Exception:
+            logger.exception("Refreshing %s failed", name)
+        await asyncio.sleep(interval)
+
+
+def start_refresh_jobs() -> list[asyncio.Task[None]]:
+    """Start the periodic passes; the caller cancels the tasks on shutdown."""
+    if REFRESH_JOBS_INTERVAL <= 0:
+        return []
+    jobs = {
+        "story regions": _refresh_story_regions,
+        "article regions": _refresh_article_regions,
+        "story threads": _refresh_story_threads,
+    }
+    return [
+        asyncio.create_task(_run_every(name, refresh, REFRESH_JOBS_INTERVAL))
+        for name, refresh in jobs.items()
+    ]
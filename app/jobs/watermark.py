@@ -0,0 +1,47 @@
+"""
+The lock-and-watermark pass shared by the refresh jobs. Each pass takes an
+advisory lock on its table, so concurrent passes (several API workers, or a
+one-off run alongside them) skip instead of writing the same rows, and
+records when it started so the next pass knows what changed since.
+"""
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from context_db.connection import get_session
+from sqlalchemy.orm import Session
+
+from app.queries.watermarks import query_watermark, set_watermark, try_lock_refresh
+
+logger = logging.getLogger(__name__)
+
+# Re-read rows changed shortly before the last pass too, in case their
+# transaction committed after that pass read them
+_OVERLAP = timedelta(minutes=5)
+
+
+def refresh_with_watermark(
+    table_name: str,
+    refresh: Callable[[Session, datetime | None], int],
+    full: bool = False,
+) -> int:
+    """
+    Run refresh(db, changed_since) for table_name in one transaction and
+    return the rows it wrote. changed_since is None on a full pass: the first
+    one, or any with full=True. Returns 0 without calling refresh while
+    another pass holds the table's lock.
+    """
+    with get_session() as db:
+        if not try_lock_refresh(db, table_name):
+            logger.info("%s is being refreshed elsewhere, skipping", table_name)
+            return 0
+        # Source timestamps are stored naive, like the ranges from get_date_range
+        started = datetime.now()
+        last_refreshed = None if full else query_watermark(db, table_name)
+        changed_since = None if last_refreshed is None else last_refreshed - _OVERLAP
+        written = refresh(db, changed_since)
+        set_watermark(db, table_name, started)
+        db.commit()
+    logger.info("Wrote %d rows to %s", written, table_name)
+    return written
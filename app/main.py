@@ -1,4 +1,7 @@
+import asyncio
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,15 +9,37 @@ from starlette.middleware.sessions import SessionMiddleware
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
 from app.admin.admin import init_admin
+from app.db import engine
+from app.http_cache import ETagMiddleware
+from app.jobs.scheduler import start_refresh_jobs
+from app.models import create_tables
+from app.responses import ORJSONResponse
 from app.router import router
+from app.services.utils.image_fetcher import close_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Queries outer-join the service's own tables, so they must exist first
+    await asyncio.to_thread(create_tables, engine)
+    refresh_jobs = start_refresh_jobs()
+    yield
+    for task in refresh_jobs:
+        task.cancel()
+    await close_client()
+
 
 app = FastAPI(
     title="Context API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     root_path="/api",
     root_path_in_servers=False,
     redirect_slashes=False,
 )
-# Innermost: CORS
+# Innermost: ETags and 304s for responses that opted into caching
+app.add_middleware(ETagMiddleware)
+# CORS wraps ETag so 304s carry CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
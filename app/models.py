@@ -0,0 +1,95 @@
+"""
+Tables owned by this service. The shared schema lives in context_db; these
+hold derived data the API precomputes for itself. Migrations for the shared
+schema live in context-db, so create_tables() creates these at app startup
+(and in the jobs under app/jobs that populate them).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Engine, Integer, String, func, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+# Arbitrary advisory lock key serialising create_tables across processes
+_CREATE_TABLES_LOCK = 7_301_001
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class ArticleImage(Base):
+    __tablename__ = "api_article_images"
+
+    article_id: Mapped[str] = mapped_column(String, primary_key=True)
+    url: Mapped[str] = mapped_column(String)
+    image_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=1)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class StoryRegion(Base):
+    """
+    Regions each story mentions, derived from its location entities and
+    REGION_COUNTRY_CODES. Keyed so a region's stories in a period are one
+    index range scan in story_period order.
+    """
+
+    __tablename__ = "api_story_regions"
+
+    region: Mapped[str] = mapped_column(String, primary_key=True)
+    story_period: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    story_id: Mapped[str] = mapped_column(String, primary_key=True, index=True)
+
+
+class ArticleRegion(Base):
+    """
+    Regions each article mentions, derived from its resolved location
+    entities like StoryRegion. Keyed so a region's articles in a period are
+    one index range scan in published_at order.
+    """
+
+    __tablename__ = "api_article_regions"
+
+    region: Mapped[str] = mapped_column(String, primary_key=True)
+    published_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    article_id: Mapped[str] = mapped_column(String, primary_key=True, index=True)
+
+
+class StoryThread(Base):
+    """
+    Connected components of the story_edges graph. thread_id is the smallest
+    story id in the component, so every story in a thread is one index
+    lookup away. Stories without edges are threads of their own; stories with
+    no row have not been reached by the thread job yet.
+    """
+
+    __tablename__ = "api_story_threads"
+
+    story_id: Mapped[str] = mapped_column(String, primary_key=True)
+    thread_id: Mapped[str] = mapped_column(String, index=True)
+
+
+class JobWatermark(Base):
+    """
+    When each refresh job under app/jobs last completed a pass, keyed by the
+    table it maintains. Rows changed at or after refreshed_at may not be
+    reflected in that table yet, so readers match them live instead.
+    """
+
+    __tablename__ = "api_job_watermarks"
+
+    table_name: Mapped[str] = mapped_column(String, primary_key=True)
+    # Naive, like the shared schema's story_period and updated_at
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+def create_tables(engine: Engine) -> None:
+    """
+    Create any of the tables above that don't exist yet. Workers starting
+    at the same time take turns, since concurrent CREATE TABLEs of the same
+    table fail on the catalog's unique keys.
+    """
+    with engine.begin() as conn:
+        conn.execute(select(func.pg_advisory_xact_lock(_CREATE_TABLES_LOCK)))
+        Base.metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,52 @@
+import asyncio
+import os
+from collections.abc import Callable
+from typing import Concatenate, ParamSpec, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db import ASYNC_DB_MAX_OVERFLOW, ASYNC_DB_POOL_SIZE, async_session_factory
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# A story list fans out to four or five isolated sessions, so without a cap a
+# handful of concurrent requests would take every pooled connection. Two thirds
+# of the pool are left to them; the rest stays free for request sessions.
+ISOLATED_QUERY_LIMIT = int(
+    os.environ.get(
+        "ASYNC_DB_ISOLATED_LIMIT",
+        str(max(1, (ASYNC_DB_POOL_SIZE + ASYNC_DB_MAX_OVERFLOW) * 2 // 3)),
+    )
+)
+_isolated_slots = asyncio.Semaphore(ISOLATED_QUERY_LIMIT)
+
+
+async def run_query(
+    db: AsyncSession,
+    fn: Callable[Concatenate[Session, P], T],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> T:
+    """
+    Await any query function from app.queries on an AsyncSession.
+    The query runs against the asyncpg connection, so no thread is blocked.
+    """
+    return await db.run_sync(fn, *args, **kwargs)
+
+
+async def run_query_isolated(
+    fn: Callable[Concatenate[Session, P], T],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> T:
+    """
+    Run a query function on its own pooled connection.
+    Independent lookups can be gathered concurrently this way, since a single
+    AsyncSession does not allow overlapping operations. At most
+    ISOLATED_QUERY_LIMIT run at once per process; the rest wait their turn
+    instead of queueing on pool checkout.
+    """
+    async with _isolated_slots, async_session_factory() as session:
+        return await session.run_sync(fn, *args, **kwargs)
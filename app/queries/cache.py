@@ -0,0 +1,153 @@
+"""
+In-process result cache for slow-changing query functions.
+
+    @cached_query(ttl=3600)
+    def query_sources(db: Session) -> list[TSSource]: ...
+
+Results are keyed on every argument except the session. ORM instances and
+rows in a result are replaced by read-only snapshots of their column values
+before being cached, so concurrent requests share plain values rather than
+mapped objects, and nothing is lazy-loaded later. Entries live per process
+(MemoryCache). Nothing in the API writes to the cached tables, so the TTL
+bounds staleness.
+"""
+
+import inspect
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from functools import update_wrapper
+from typing import Any, Concatenate, Generic, ParamSpec, TypeVar
+
+from sqlalchemy import Row
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import InstanceState, Session
+
+from app.services.utils.cache_backends import MISSING, MemoryCache
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_registry: dict[str, "CachedQuery[Any, Any]"] = {}
+_registry_lock = threading.Lock()
+
+
+@dataclass
+class QueryCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+def _freeze(value: Any) -> Any:
+    """Turn an argument into a hashable, stable key component."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set | frozenset):
+        return tuple(sorted(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class CachedRow:
+    """Read-only snapshot of an ORM instance's column values."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: dict[str, Any]) -> None:
+        object.__setattr__(self, "_values", values)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"cached query results are read-only: {name}")
+
+    def __repr__(self) -> str:
+        return f"CachedRow({self._values!r})"
+
+
+def _snapshot(value: Any) -> Any:
+    if isinstance(value, Row | tuple):
+        return tuple(_snapshot(item) for item in value)
+    if isinstance(value, list):
+        return [_snapshot(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    state = sa_inspect(value, raiseerr=False)
+    if isinstance(state, InstanceState):
+        return CachedRow(
+            {attr.key: getattr(value, attr.key) for attr in state.mapper.column_attrs}
+        )
+    return value
+
+
+class CachedQuery(Generic[P, T]):
+    def __init__(
+        self,
+        fn: Callable[Concatenate[Session, P], T],
+        ttl: float,
+        maxsize: int,
+    ) -> None:
+        self.fn = fn
+        self.ttl = ttl
+        self.stats = QueryCacheStats()
+        self._stats_lock = threading.Lock()
+        self._signature = inspect.signature(fn)
+        self._entries = MemoryCache(max_entries=maxsize)
+        update_wrapper(self, fn)
+
+    def _key(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+        bound = self._signature.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        # Skip the session, the first parameter
+        arguments = list(bound.arguments.items())[1:]
+        return repr(tuple((name, _freeze(value)) for name, value in arguments))
+
+    def __call__(self, db: Session, *args: P.args, **kwargs: P.kwargs) -> T:
+        key = self._key(args, kwargs)
+        value = self._entries.get(key)
+        if value is not MISSING:
+            with self._stats_lock:
+                self.stats.hits += 1
+            return value  # type: ignore[no-any-return]
+
+        with self._stats_lock:
+            self.stats.misses += 1
+        value = _snapshot(self.fn(db, *args, **kwargs))
+        self._entries.set(key, value, self.ttl)
+        return value  # type: ignore[no-any-return]
+
+    def info(self) -> dict[str, Any]:
+        with self._stats_lock:
+            hits, misses = self.stats.hits, self.stats.misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "size": len(self._entries),
+            "ttl": self.ttl,
+        }
+
+
+def cached_query(
+    ttl: float, maxsize: int = 256
+) -> Callable[[Callable[Concatenate[Session, P], T]], CachedQuery[P, T]]:
+    """Cache a query function's results for ttl seconds, LRU-bounded by maxsize."""
+
+    def decorator(fn: Callable[Concatenate[Session, P], T]) -> CachedQuery[P, T]:
+        cached = CachedQuery(fn, ttl, maxsize)
+        with _registry_lock:
+            _registry[f"{fn.__module__}.{fn.__qualname__}"] = cached
+        return cached
+
+    return decorator
+
+
+def query_cache_stats() -> dict[str, dict[str, Any]]:
+    return {name: cached.info() for name, cached in sorted(_registry.items())}
@@ -1,30 +1,83 @@
+from collections.abc import Iterator, Sequence
 from datetime import date
+from typing import Any
 
 from context_db.models import TSDatapoint
+from sqlalchemy import Date, Select, cast, func, select
 from sqlalchemy.orm import Session
 
+from app.schemas.enums import TSResolution
 
-def query_datapoints(
+
+def query_datapoint_columns(
     db: Session,
     indicator_ids: list[str],
     entity_ids: list[str] | None = None,
     from_date: date | None = None,
     to_date: date | None = None,
-) -> list[TSDatapoint]:
+    resolution: TSResolution | None = None,
+) -> list[Any]:
+    """
+    (indicator_id, entity_id, date, value) tuples ordered by series and date,
+    without ORM instances. With a resolution, values are averaged per
+    date_trunc bucket and dated at the bucket start.
+    """
     if not indicator_ids:
         return []
 
-    q = db.query(TSDatapoint).filter(TSDatapoint.indicator_id.in_(indicator_ids))
+    stmt = _datapoint_columns_stmt(
+        indicator_ids, entity_ids, from_date, to_date, resolution
+    )
+    return list(db.execute(stmt).tuples())
+
+
+def stream_datapoint_columns(
+    db: Session,
+    indicator_ids: list[str],
+    entity_ids: list[str] | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    batch_size: int = 1000,
+) -> Iterator[Sequence[Any]]:
+    """
+    Raw rows as query_datapoint_columns returns them, in batches of up to
+    batch_size read through a server-side cursor.
+    """
+    if not indicator_ids:
+        return
+
+    stmt = _datapoint_columns_stmt(indicator_ids, entity_ids, from_date, to_date)
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    yield from result.tuples().partitions()
+
+
+def _datapoint_columns_stmt(
+    indicator_ids: list[str],
+    entity_ids: list[str] | None,
+    from_date: date | None,
+    to_date: date | None,
+    resolution: TSResolution | None = None,
+) -> Select[Any]:
+    day: Any = TSDatapoint.date
+    value: Any = TSDatapoint.value
+    if resolution is not None:
+        day = cast(func.date_trunc(resolution.value, TSDatapoint.date), Date)
+        value = func.avg(TSDatapoint.value)
+
+    stmt = select(
+        TSDatapoint.indicator_id,
+        TSDatapoint.entity_id,
+        day.label("date"),
+        value.label("value"),
+    ).where(TSDatapoint.indicator_id.in_(indicator_ids))
 
     if entity_ids:
-        q = q.filter(TSDatapoint.entity_id.in_(entity_ids))
+        stmt = stmt.where(TSDatapoint.entity_id.in_(entity_ids))
     if from_date:
-        q = q.filter(TSDatapoint.date >= from_date)
+        stmt = stmt.where(TSDatapoint.date >= from_date)
     if to_date:
-        q = q.filter(TSDatapoint.date <= to_date)
+        stmt = stmt.where(TSDatapoint.date <= to_date)
+    if resolution is not None:
+        stmt = stmt.group_by(TSDatapoint.indicator_id, TSDatapoint.entity_id, day)
 
-    return q.order_by(  # type: ignore[no-any-return]
-        TSDatapoint.indicator_id,
-        TSDatapoint.entity_id,
-        TSDatapoint.date,
-    ).all()
+    return stmt.order_by(TSDatapoint.indicator_id, TSDatapoint.entity_id, day)
@@ -1,7 +1,12 @@
 from context_db.models import TSEntity
 from sqlalchemy.orm import Session
 
+from app.queries.cache import cached_query
 
+_CACHE_TTL = 3600
+
+
+@cached_query(ttl=_CACHE_TTL)
 def query_entities(
     db: Session,
     entity_type: str | None = None,
@@ -12,10 +17,12 @@ def query_entities(
     return q.order_by(TSEntity.name).all()  # type: ignore[no-any-return]
 
 
+@cached_query(ttl=_CACHE_TTL)
 def query_entity(db: Session, entity_id: str) -> TSEntity | None:
     return db.query(TSEntity).filter(TSEntity.id == entity_id).first()
 
 
+@cached_query(ttl=_CACHE_TTL)
 def query_entities_by_ids(db: Session, entity_ids: list[str]) -> dict[str, TSEntity]:
     if not entity_ids:
         return {}
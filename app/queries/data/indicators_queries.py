@@ -1,11 +1,17 @@
 from context_db.models import TSIndicator, TSSource
 from sqlalchemy.orm import Session
 
+from app.queries.cache import cached_query
 
+_CACHE_TTL = 3600
+
+
+@cached_query(ttl=_CACHE_TTL)
 def query_sources(db: Session) -> list[TSSource]:
     return db.query(TSSource).order_by(TSSource.name).all()  # type: ignore[no-any-return]
 
 
+@cached_query(ttl=_CACHE_TTL)
 def query_indicators(
     db: Session,
     source_id: int | None = None,
@@ -21,6 +27,7 @@ def query_indicators(
     return q.order_by(TSIndicator.name).all()  # type: ignore[no-any-return]
 
 
+@cached_query(ttl=_CACHE_TTL)
 def query_indicator(
     db: Session, indicator_id: str
 ) -> tuple[TSIndicator, TSSource] | None:
@@ -32,6 +39,7 @@ def query_indicator(
     )
 
 
+@cached_query(ttl=_CACHE_TTL)
 def query_indicators_by_ids(
     db: Session, indicator_ids: list[str]
 ) -> dict[str, tuple[TSIndicator, TSSource]]:
@@ -1,10 +1,16 @@
 from context_db.models import TgChannel
 from sqlalchemy.orm import Session
 
+from app.queries.cache import cached_query
 
+_CACHE_TTL = 300
+
+
+@cached_query(ttl=_CACHE_TTL)
 def query_channels(db: Session) -> list[TgChannel]:
     return db.query(TgChannel).order_by(TgChannel.username).all()  # type: ignore[no-any-return]
 
 
+@cached_query(ttl=_CACHE_TTL)
 def query_channel(db: Session, channel_id: int) -> TgChannel | None:
     return db.query(TgChannel).filter(TgChannel.id == channel_id).first()
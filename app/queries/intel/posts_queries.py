@@ -1,9 +1,24 @@
 from datetime import datetime
 
 from context_db.models import TgPost
+from sqlalchemy import ColumnElement, and_, or_
 from sqlalchemy.orm import Session
 
 
+def after_post(date: datetime | None, id: int) -> ColumnElement[bool]:
+    """
+    Posts after (date, id) in date DESC NULLS LAST, id DESC order: older ones,
+    same-date ones with a lower id, then the undated ones at the end.
+    """
+    if date is None:
+        return and_(TgPost.date.is_(None), TgPost.id < id)
+    return or_(
+        TgPost.date < date,
+        and_(TgPost.date == date, TgPost.id < id),
+        TgPost.date.is_(None),
+    )
+
+
 def query_posts(
     db: Session,
     channel_id: int | None = None,
@@ -11,7 +26,13 @@ def query_posts(
     to_date: datetime | None = None,
     limit: int = 50,
     offset: int = 0,
+    after: tuple[datetime | None, int] | None = None,
 ) -> list[TgPost]:
+    """
+    Posts newest first, undated ones last. `after` is the (date, id) of the
+    previous page's last post; the page then seeks past it instead of
+    skipping `offset` rows.
+    """
     q = db.query(TgPost)
     if channel_id is not None:
         q = q.filter(TgPost.channel_id == channel_id)
@@ -19,4 +40,11 @@ def query_posts(
         q = q.filter(TgPost.date >= from_date)
     if to_date:
         q = q.filter(TgPost.date <= to_date)
-    return q.order_by(TgPost.date.desc()).offset(offset).limit(limit).all()  # type: ignore[no-any-return]
+    if after is not None:
+        q = q.filter(after_post(*after))
+    return (  # type: ignore[no-any-return]
+        q.order_by(TgPost.date.desc().nulls_last(), TgPost.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
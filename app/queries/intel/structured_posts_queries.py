@@ -3,6 +3,8 @@ from datetime import datetime
 from context_db.models import TgPost, TgStructuredPost
 from sqlalchemy.orm import Session
 
+from app.queries.intel.posts_queries import after_post
+
 
 def query_structured_posts(
     db: Session,
@@ -14,7 +16,12 @@ def query_structured_posts(
     has_coordinates: bool | None = None,
     limit: int = 50,
     offset: int = 0,
+    after: tuple[datetime | None, int] | None = None,
 ) -> list[tuple[TgStructuredPost, TgPost]]:
+    """
+    Structured posts with their source post, ordered and paged by the source
+    post as in query_posts.
+    """
     q = db.query(TgStructuredPost, TgPost).join(
         TgPost, TgStructuredPost.post_id == TgPost.id
     )
@@ -32,4 +39,11 @@ def query_structured_posts(
         q = q.filter(TgStructuredPost.latitude.isnot(None))
     elif has_coordinates is False:
         q = q.filter(TgStructuredPost.latitude.is_(None))
-    return q.order_by(TgPost.date.desc()).offset(offset).limit(limit).all()  # type: ignore[no-any-return]
+    if after is not None:
+        q = q.filter(after_post(*after))
+    return (  # type: ignore[no-any-return]
+        q.order_by(TgPost.date.desc().nulls_last(), TgPost.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
@@ -1,10 +1,13 @@
 from collections import defaultdict
 from datetime import datetime
+from typing import Any
 
-from context_db.models import Article, ArticleEntityResolved, KBEntity
+from context_db.models import Article, ArticleEntityResolved, KBEntity, KBLocation
 from sqlalchemy import desc, func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
+from app.queries.news.article_regions_queries import article_regions
+from app.queries.news.stories_queries import REGION_COUNTRY_CODES
 from app.schemas.enums import FilterRegion, Interval
 from app.schemas.news import (
     EntityCount,
@@ -13,6 +16,31 @@ from app.schemas.news import (
 )
 
 
+def _mentions_in_range(
+    query: Query[Any],
+    region: FilterRegion | None,
+    from_date: datetime | None,
+    to_date: datetime | None,
+) -> tuple[Query[Any], Any]:
+    """
+    Restrict a query over ArticleEntityResolved to mentions in articles
+    published in the range, returning it with the published_at column to
+    bucket by. With a region, the region's article rows stand in for the
+    articles table, so the filter narrows the join instead of adding to it.
+    """
+    if not region:
+        query = query.join(Article, Article.id == ArticleEntityResolved.article_id)
+        query = query.filter(
+            Article.published_at >= from_date, Article.published_at < to_date
+        )
+        return query, Article.published_at
+    regions = article_regions(region, from_date, to_date)
+    query = query.join(
+        regions, regions.c.article_id == ArticleEntityResolved.article_id
+    )
+    return query, regions.c.published_at
+
+
 def query_top_entities(
     db: Session,
     entity_type: str,
@@ -21,21 +49,29 @@ def query_top_entities(
     to_date: datetime | None,
     limit: int | None,
 ) -> list[EntityCount]:
-
-    rows = (
+    rows, _ = _mentions_in_range(
         db.query(
             KBEntity.qid.label("qid"),
             KBEntity.name.label("name"),
             func.count(func.distinct(ArticleEntityResolved.article_id)).label("count"),
-        )
-        .join(ArticleEntityResolved, ArticleEntityResolved.qid == KBEntity.qid)
-        .join(Article, Article.id == ArticleEntityResolved.article_id)
-        .filter(KBEntity.entity_type == entity_type)
-        .filter(Article.published_at >= from_date, Article.published_at < to_date)
+        ).join(ArticleEntityResolved, ArticleEntityResolved.qid == KBEntity.qid),
+        region,
+        from_date,
+        to_date,
+    )
+    rows = (
+        rows.filter(KBEntity.entity_type == entity_type)
         .group_by(KBEntity.qid, KBEntity.name)
         .order_by(desc("count"), KBEntity.name)
     )
 
+    if region and entity_type == "location":
+        # Only count locations in the region itself, not every place its
+        # articles also mention
+        rows = rows.join(KBLocation, KBLocation.qid == KBEntity.qid).filter(
+            KBLocation.country_code.in_(REGION_COUNTRY_CODES[region])
+        )
+
     if limit:
         rows = rows.limit(limit)
 
@@ -65,21 +101,25 @@ def query_top_entities_with_history(
     if not top_qids:
         return []
 
+    mentions, published_at = _mentions_in_range(
+        db.query(KBEntity.qid.label("qid")).join(
+            ArticleEntityResolved, ArticleEntityResolved.qid == KBEntity.qid
+        ),
+        region,
+        from_date,
+        to_date,
+    )
     if interval == Interval.hourly:
-        time_bucket = func.date_trunc("hour", Article.published_at)
+        time_bucket = func.date_trunc("hour", published_at)
     else:
-        time_bucket = func.date_trunc("day", Article.published_at)
+        time_bucket = func.date_trunc("day", published_at)
 
     history_rows = (
-        db.query(
-            KBEntity.qid.label("qid"),
+        mentions.add_columns(
             time_bucket.label("bucket"),
             func.count(func.distinct(ArticleEntityResolved.article_id)).label("count"),
         )
-        .join(ArticleEntityResolved, ArticleEntityResolved.qid == KBEntity.qid)
-        .join(Article, Article.id == ArticleEntityResolved.article_id)
         .filter(KBEntity.qid.in_(top_qids))
-        .filter(Article.published_at >= from_date, Article.published_at < to_date)
         .group_by(KBEntity.qid, time_bucket)
         .order_by(time_bucket)
         .all()
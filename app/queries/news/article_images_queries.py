@@ -0,0 +1,71 @@
+from datetime import UTC, datetime, timedelta
+
+from context_db.models import Article
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import ArticleImage
+
+MAX_FETCH_ATTEMPTS = 3
+RETRY_AFTER = timedelta(hours=6)
+
+
+def query_articles_missing_images(
+    db: Session, since: datetime, limit: int
+) -> list[tuple[str, str]]:
+    """
+    Articles published since `since` that have no stored og:image yet: never
+    fetched, or failed fewer than MAX_FETCH_ATTEMPTS times and due a retry.
+    Newest first, so fresh articles are served images soonest.
+    """
+    retry_before = datetime.now(tz=UTC) - RETRY_AFTER
+    return (  # type: ignore[no-any-return]
+        db.query(Article.id, Article.url)
+        .outerjoin(ArticleImage, ArticleImage.article_id == Article.id)
+        .filter(Article.published_at >= since)
+        .filter(
+            or_(
+                ArticleImage.article_id.is_(None),
+                and_(
+                    ArticleImage.image_url.is_(None),
+                    ArticleImage.attempts < MAX_FETCH_ATTEMPTS,
+                    ArticleImage.fetched_at < retry_before,
+                ),
+            )
+        )
+        .order_by(Article.published_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def upsert_article_images(
+    db: Session, images: list[tuple[str, str, str | None]]
+) -> None:
+    """Store (article_id, url, image_url) results, counting failed attempts."""
+    if not images:
+        return
+    now = datetime.now(tz=UTC)
+    stmt = insert(ArticleImage).values(
+        [
+            {
+                "article_id": article_id,
+                "url": url,
+                "image_url": image_url,
+                "attempts": 1,
+                "fetched_at": now,
+            }
+            for article_id, url, image_url in images
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ArticleImage.article_id],
+        set_={
+            "url": stmt.excluded.url,
+            "image_url": stmt.excluded.image_url,
+            "attempts": ArticleImage.attempts + 1,
+            "fetched_at": stmt.excluded.fetched_at,
+        },
+    )
+    db.execute(stmt)
@@ -0,0 +1,105 @@
+from datetime import datetime
+from typing import Any
+
+from context_db.models import Article, ArticleEntityResolved, KBEntity, KBLocation
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Subquery,
+    delete,
+    insert,
+    or_,
+    select,
+    true,
+    union,
+)
+from sqlalchemy.orm import Session
+
+from app.models import ArticleRegion
+from app.queries.news.stories_queries import region_codes
+from app.queries.watermarks import unrefreshed_since
+from app.schemas.enums import FilterRegion
+
+
+def article_region_matches(*criteria: Any) -> Select[Any]:
+    """
+    Distinct (region, published_at, article_id) rows matching articles'
+    resolved locations against REGION_COUNTRY_CODES, for the articles
+    meeting `criteria`.
+    """
+    codes = region_codes()
+    return (
+        select(
+            codes.c.region,
+            Article.published_at,
+            Article.id.label("article_id"),
+        )
+        .select_from(Article)
+        .join(ArticleEntityResolved, ArticleEntityResolved.article_id == Article.id)
+        .join(KBEntity, KBEntity.qid == ArticleEntityResolved.qid)
+        .join(KBLocation, KBLocation.qid == KBEntity.qid)
+        .join(codes, codes.c.country_code == KBLocation.country_code)
+        .where(KBEntity.entity_type == "location", *criteria)
+        .distinct()
+    )
+
+
+def article_regions(
+    region: FilterRegion,
+    from_date: datetime | None,
+    to_date: datetime | None,
+) -> Subquery:
+    """
+    (region, published_at, article_id) for the region's articles in the
+    range. Read from api_article_regions, except articles ingested since the
+    refresh job's last pass, which are matched live; until the job has run
+    once that is every article, the same join the table replaces.
+    """
+    mapped = select(
+        ArticleRegion.region, ArticleRegion.published_at, ArticleRegion.article_id
+    ).where(
+        ArticleRegion.region == region.value,
+        ArticleRegion.published_at >= from_date,
+        ArticleRegion.published_at < to_date,
+    )
+    live = article_region_matches(
+        Article.published_at >= from_date,
+        Article.published_at < to_date,
+        Article.ingested_at >= unrefreshed_since(ArticleRegion.__tablename__),
+    )
+    live = live.where(live.selected_columns.region == region.value)
+    return union(mapped, live).subquery("article_regions")
+
+
+def refresh_article_regions(
+    db: Session, since: datetime | None, ingested_since: datetime | None = None
+) -> int:
+    """
+    Rebuild api_article_regions for articles with published_at >= since or
+    ingested_at >= ingested_since; since=None rebuilds every article. Returns
+    the number of rows written. The caller commits, so readers keep seeing
+    the previous mapping until the new one is complete.
+    """
+    stale: ColumnElement[bool]
+    if since is None:
+        stale = true()
+        db.execute(delete(ArticleRegion))
+    else:
+        stale = Article.published_at >= since
+        if ingested_since is not None:
+            stale = or_(stale, Article.ingested_at >= ingested_since)
+        db.execute(
+            delete(ArticleRegion).where(
+                or_(
+                    ArticleRegion.published_at >= since,
+                    ArticleRegion.article_id.in_(select(Article.id).where(stale)),
+                )
+            )
+        )
+
+    result = db.execute(
+        insert(ArticleRegion).from_select(
+            ["region", "published_at", "article_id"], article_region_matches(stale)
+        )
+    )
+    return result.rowcount  # type: ignore[attr-defined,no-any-return]
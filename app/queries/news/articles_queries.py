@@ -1,27 +1,78 @@
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from typing import Any
 
 from context_db.models import Article, ArticleEntityResolved, KBEntity, KBLocation
-from sqlalchemy import desc, func, literal_column
+from sqlalchemy import Select, and_, desc, func, literal_column, select
 from sqlalchemy.orm import Session
 
+from app.queries.news.article_regions_queries import article_regions
+from app.schemas.enums import FilterRegion
+
+
+def _articles_in_range(
+    stmt: Select[Any],
+    from_date: datetime,
+    to_date: datetime,
+    region: FilterRegion | None = None,
+) -> Select[Any]:
+    """Filter a select over Article to the range, newest first."""
+    if not region:
+        return stmt.where(
+            Article.published_at >= from_date, Article.published_at < to_date
+        ).order_by(desc(Article.published_at))
+    # One row per article after the UNION, so no DISTINCT here
+    regions = article_regions(region, from_date, to_date)
+    return stmt.join(
+        regions,
+        and_(
+            regions.c.article_id == Article.id,
+            regions.c.published_at == Article.published_at,
+        ),
+    ).order_by(desc(regions.c.published_at))
+
 
 def query_articles(
     db: Session,
     from_date: datetime,
     to_date: datetime,
+    region: FilterRegion | None = None,
     limit: int | None = None,
 ) -> list[Article]:
-    query = (
-        db.query(Article)
-        .filter(Article.published_at >= from_date, Article.published_at < to_date)
-        .order_by(desc(Article.published_at))
-    )
+    stmt = _articles_in_range(select(Article), from_date, to_date, region=region)
 
     if limit:
-        query = query.limit(limit)
+        stmt = stmt.limit(limit)
+
+    return list(db.execute(stmt).scalars().all())
 
-    return query.all()  # type: ignore[no-any-return]
+
+def stream_articles(
+    db: Session,
+    from_date: datetime,
+    to_date: datetime,
+    region: FilterRegion | None = None,
+    batch_size: int = 500,
+) -> Iterator[Sequence[Any]]:
+    """
+    Article rows (columns only, newest first) in batches of up to batch_size
+    read through a server-side cursor.
+    """
+    stmt = _articles_in_range(
+        select(
+            Article.id,
+            Article.source,
+            Article.title,
+            Article.summary,
+            Article.url,
+            Article.published_at,
+            Article.ingested_at,
+        ),
+        from_date,
+        to_date,
+        region=region,
+    ).execution_options(yield_per=batch_size)
+    yield from db.execute(stmt).partitions()
 
 
 def query_article_by_id(db: Session, article_id: str) -> Article | None:
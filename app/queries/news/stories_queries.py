@@ -11,9 +11,28 @@ from context_db.models import (
     StoryEntity,
     StoryTopic,
 )
-from sqlalchemy import func, literal_column, text
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Row,
+    Select,
+    String,
+    Subquery,
+    and_,
+    column,
+    func,
+    literal_column,
+    select,
+    table,
+    text,
+    true,
+    tuple_,
+    union,
+    values,
+)
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import Values
 
+from app.models import ArticleImage, StoryRegion
+from app.queries.watermarks import unrefreshed_since
 from app.schemas.enums import FilterRegion, FilterTopic
 
 # Mapping of ISO 3166-1 alpha-3 country codes to regions
@@ -264,6 +283,67 @@ REGION_COUNTRY_CODES: dict[FilterRegion, set[str]] = {
 }
 
 
+def region_codes() -> Values:
+    """REGION_COUNTRY_CODES as a (country_code, region) VALUES list to join on."""
+    return values(
+        column("country_code", String), column("region", String), name="region_codes"
+    ).data(
+        [
+            (code, region.value)
+            for region, codes in REGION_COUNTRY_CODES.items()
+            for code in codes
+        ]
+    )
+
+
+def story_region_matches(*criteria: Any) -> Select[Any]:
+    """
+    Distinct (region, story_period, story_id) rows matching stories' location
+    entities against REGION_COUNTRY_CODES, for the stories meeting `criteria`.
+    """
+    codes = region_codes()
+    return (
+        select(
+            codes.c.region,
+            Story.story_period,
+            Story.id.label("story_id"),
+        )
+        .select_from(Story)
+        .join(StoryEntity, StoryEntity.story_id == Story.id)
+        .join(KBEntity, KBEntity.qid == StoryEntity.qid)
+        .join(KBLocation, KBLocation.qid == KBEntity.qid)
+        .join(codes, codes.c.country_code == KBLocation.country_code)
+        .where(KBEntity.entity_type == "location", *criteria)
+        .distinct()
+    )
+
+
+def _story_regions(
+    from_date: datetime, to_date: datetime, region: FilterRegion | None = None
+) -> Subquery:
+    """
+    (region, story_period, story_id) for stories in the range. Read from
+    api_story_regions, except stories updated since the refresh job's last
+    pass, which are matched live; until the job has run once that is every
+    story, the same join the table replaces.
+    """
+    mapped = select(
+        StoryRegion.region, StoryRegion.story_period, StoryRegion.story_id
+    ).where(
+        StoryRegion.story_period >= from_date,
+        StoryRegion.story_period < to_date,
+    )
+    live = story_region_matches(
+        Story.story_period >= from_date,
+        Story.story_period < to_date,
+        Story.updated_at >= unrefreshed_since(StoryRegion.__tablename__),
+    )
+    if region:
+        mapped = mapped.where(StoryRegion.region == region.value)
+        live = live.where(live.selected_columns.region == region.value)
+    return union(mapped, live).subquery("story_regions")
+
+
 def query_stories_by_entity_qid(
     db: Session, qid: str, limit: int = 10, offset: int = 0
 ) -> list[Story]:
@@ -279,16 +359,14 @@ def query_stories_by_entity_qid(
     )  # type: ignore[no-any-return]
 
 
-def query_stories(
+def _filtered_stories(
     db: Session,
     from_date: datetime,
     to_date: datetime,
     region: FilterRegion | None = None,
     topic: FilterTopic | None = None,
-    limit: int | None = None,
-    offset: int | None = None,
     parent_only: bool = True,
-) -> list[Story]:
+) -> Query[Story]:
     query = db.query(Story).filter(
         Story.story_period >= from_date,
         Story.story_period < to_date,
@@ -298,24 +376,40 @@ def query_stories(
         query = query.filter(Story.parent_story_id.is_(None))
 
     if region:
-        country_codes = REGION_COUNTRY_CODES.get(region, set())
-        query = (
-            query.join(StoryEntity, StoryEntity.story_id == Story.id)
-            .join(KBEntity, KBEntity.qid == StoryEntity.qid)
-            .join(KBLocation, KBLocation.qid == KBEntity.qid)
-            .filter(KBEntity.entity_type == "location")
-            .filter(KBLocation.country_code.in_(country_codes))
-            .distinct()
+        # One row per (region, story) after the UNION, so no DISTINCT here
+        story_regions = _story_regions(from_date, to_date, region)
+        query = query.join(
+            story_regions,
+            and_(
+                story_regions.c.story_id == Story.id,
+                story_regions.c.story_period == Story.story_period,
+            ),
         )
 
     if topic:
-        query = (
-            query.join(StoryTopic, StoryTopic.story_id == Story.id)
-            .filter(StoryTopic.topic == topic.value)
-            .distinct()
+        query = query.filter(
+            select(StoryTopic.story_id)
+            .where(StoryTopic.story_id == Story.id)
+            .where(StoryTopic.topic == topic.value)
+            .exists()
         )
 
-    query = query.order_by(Story.story_period.desc(), Story.id.desc())
+    return query  # type: ignore[no-any-return]
+
+
+def query_stories(
+    db: Session,
+    from_date: datetime,
+    to_date: datetime,
+    region: FilterRegion | None = None,
+    topic: FilterTopic | None = None,
+    limit: int | None = None,
+    offset: int | None = None,
+    parent_only: bool = True,
+) -> list[Story]:
+    query = _filtered_stories(
+        db, from_date, to_date, region=region, topic=topic, parent_only=parent_only
+    ).order_by(Story.story_period.desc(), Story.id.desc())
 
     if offset:
         query = query.offset(offset)
@@ -323,64 +417,390 @@ def query_stories(
     if limit:
         query = query.limit(limit)
 
-    return query.all()  # type: ignore[no-any-return]
+    return query.all()
+
+
+def query_top_stories_by_region(
+    db: Session,
+    from_date: datetime,
+    to_date: datetime,
+    per_region: int = 3,
+) -> list[Row[Any]]:
+    """
+    The latest `per_region` parent stories in every region, ranked in one
+    round-trip. Returns (region, id, title) rows ordered by region and rank.
+    """
+    story_regions = _story_regions(from_date, to_date)
+    ranked = (
+        select(
+            story_regions.c.region,
+            Story.id,
+            Story.title,
+            func.row_number()
+            .over(
+                partition_by=story_regions.c.region,
+                order_by=(story_regions.c.story_period.desc(), Story.id.desc()),
+            )
+            .label("rank"),
+        )
+        .join(
+            Story,
+            and_(
+                Story.id == story_regions.c.story_id,
+                Story.story_period == story_regions.c.story_period,
+            ),
+        )
+        .where(Story.parent_story_id.is_(None))
+        .subquery("ranked")
+    )
+    stmt = (
+        select(ranked.c.region, ranked.c.id, ranked.c.title)
+        .where(ranked.c.rank <= per_region)
+        .order_by(ranked.c.region, ranked.c.rank)
+    )
+    return list(db.execute(stmt).all())
+
+
+def _json_object(**fields: Any) -> Any:
+    """json_build_object with inlined keys (asyncpg cannot type bound keys)."""
+    args: list[Any] = []
+    for key, value in fields.items():
+        args.extend([literal_column(f"'{key}'"), value])
+    return func.json_build_object(*args)
+
+
+def query_story_cards(
+    db: Session,
+    from_date: datetime,
+    to_date: datetime,
+    region: FilterRegion | None = None,
+    topic: FilterTopic | None = None,
+    limit: int = 25,
+    offset: int = 0,
+    after: tuple[datetime, str] | None = None,
+) -> list[Row[Any]]:
+    """
+    Fetch a page of parent stories with everything a StoryCard needs in a
+    single round-trip. Topics, locations, persons, article/source counts and
+    the card image are aggregated per story in LATERAL subqueries, so no
+    Python-side grouping is needed.
+
+    `after` is the (story_period, id) of the previous page's last story; the
+    page then seeks past it instead of skipping `offset` rows.
+    """
+    page_query = _filtered_stories(
+        db, from_date, to_date, region=region, topic=topic
+    ).with_entities(Story.id, Story.title, Story.story_period, Story.updated_at)
+    if after is not None:
+        page_query = page_query.filter(tuple_(Story.story_period, Story.id) < after)
+    page = (
+        page_query.order_by(Story.story_period.desc(), Story.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .subquery("page")
+    )
+
+    topics = (
+        select(func.array_agg(StoryTopic.topic).label("topics"))
+        .where(StoryTopic.story_id == page.c.id)
+        .lateral("card_topics")
+    )
+
+    locations = (
+        select(
+            func.json_agg(
+                _json_object(
+                    wikidata_qid=KBEntity.qid,
+                    name=KBEntity.name,
+                    location_type=KBLocation.location_type,
+                    country_code=KBLocation.country_code,
+                    latitude=func.ST_Y(
+                        literal_column("kb_locations.coordinates::geometry")
+                    ),
+                    longitude=func.ST_X(
+                        literal_column("kb_locations.coordinates::geometry")
+                    ),
+                )
+            ).label("locations")
+        )
+        .select_from(StoryEntity)
+        .join(KBEntity, KBEntity.qid == StoryEntity.qid)
+        .join(KBLocation, KBLocation.qid == KBEntity.qid)
+        .where(StoryEntity.story_id == page.c.id)
+        .where(KBEntity.entity_type == "location")
+        .lateral("card_locations")
+    )
+
+    persons = (
+        select(
+            func.json_agg(
+                _json_object(
+                    wikidata_qid=KBEntity.qid,
+                    name=KBEntity.name,
+                    description=KBEntity.description,
+                    nationalities=KBPerson.nationalities,
+                    image_url=KBEntity.image_url,
+                )
+            ).label("persons")
+        )
+        .select_from(StoryEntity)
+        .join(KBEntity, KBEntity.qid == StoryEntity.qid)
+        .join(KBPerson, KBPerson.qid == KBEntity.qid)
+        .where(StoryEntity.story_id == page.c.id)
+        .where(KBEntity.entity_type == "person")
+        .lateral("card_persons")
+    )
+
+    articles = (
+        select(
+            func.count(Article.id).label("article_count"),
+            func.count(func.distinct(Article.source)).label("sources_count"),
+        )
+        .select_from(ArticleStory)
+        .join(Article, Article.id == ArticleStory.article_id)
+        .where(ArticleStory.story_id == page.c.id)
+        .lateral("card_articles")
+    )
+
+    # First article, in publication order, with a stored og:image. Without
+    # one, the first article not yet backfilled is returned as the source
+    # page for a live fetch.
+    image = (
+        select(ArticleImage.image_url, Article.url.label("image_source_url"))
+        .select_from(ArticleStory)
+        .join(Article, Article.id == ArticleStory.article_id)
+        .outerjoin(ArticleImage, ArticleImage.article_id == Article.id)
+        .where(ArticleStory.story_id == page.c.id)
+        .order_by(
+            ArticleImage.image_url.is_(None),
+            ArticleImage.article_id.isnot(None),
+            Article.published_at,
+            Article.id,
+        )
+        .limit(1)
+        .lateral("card_image")
+    )
+
+    stmt = (
+        select(
+            page.c.id,
+            page.c.title,
+            page.c.story_period,
+            page.c.updated_at,
+            topics.c.topics,
+            locations.c.locations,
+            persons.c.persons,
+            articles.c.article_count,
+            articles.c.sources_count,
+            image.c.image_url,
+            image.c.image_source_url,
+        )
+        .select_from(page)
+        .join(topics, true())
+        .join(locations, true())
+        .join(persons, true())
+        .join(articles, true())
+        .outerjoin(image, true())
+        .order_by(page.c.story_period.desc(), page.c.id.desc())
+    )
+
+    return list(db.execute(stmt).all())
 
 
 def query_story_by_id(db: Session, story_id: str) -> Story | None:
     return db.query(Story).filter(Story.id == story_id).first()
 
 
-def query_related_stories(db: Session, story_id: str) -> list[Story]:
+_story_edges = table("story_edges", column("from_story_id"), column("to_story_id"))
+
+
+def query_related_story_ids(
+    db: Session, story_id: str, max_results: int = 50
+) -> list[str]:
     """
-    Traverse the story_edges graph using a recursive CTE
-    to find all transitively connected stories, not just direct neighbors.
-    story_edges is directional, so we seed from both directions.
+    Stories transitively connected to story_id through story_edges, in
+    either direction, nearest first. The recursive CTE carries only ids and
+    combines with UNION, so each story enters the frontier once and cycles
+    end the walk. Postgres evaluates it a level at a time and LIMIT stops the
+    expansion once max_results are found, so rows come back in the order the
+    walk reaches them. Each step looks up the frontier's edges from both ends
+    with the from_story_id and to_story_id indexes rather than scanning
+    story_edges.
     """
-    related_ids = [
+    return [
         row[0]
         for row in db.execute(
             text("""
-                WITH RECURSIVE related(id, depth) AS (
-                    SELECT to_story_id AS id, 1
-                    FROM story_edges
+                WITH RECURSIVE related(id) AS (
+                    SELECT to_story_id FROM story_edges
                     WHERE from_story_id = :story_id
                     UNION
-                    SELECT from_story_id AS id, 1
-                    FROM story_edges
+                    SELECT from_story_id FROM story_edges
                     WHERE to_story_id = :story_id
-                    UNION ALL
-                    SELECT se.to_story_id, r.depth + 1
-                    FROM story_edges se
-                    JOIN related r ON se.from_story_id = r.id
-                    WHERE r.depth < 10
+                    UNION
+                    SELECT n.id FROM related r
+                    CROSS JOIN LATERAL (
+                        SELECT to_story_id FROM story_edges
+                        WHERE from_story_id = r.id
+                        UNION ALL
+                        SELECT from_story_id FROM story_edges
+                        WHERE to_story_id = r.id
+                    ) AS n(id)
                 )
-                SELECT DISTINCT id FROM related WHERE id != :story_id
+                SELECT id FROM related WHERE id != :story_id LIMIT :max_results
             """),
-            {"story_id": story_id},
+            {"story_id": story_id, "max_results": max_results},
         ).fetchall()
     ]
 
-    if not related_ids:
-        return []
 
+def query_stories_by_ids(db: Session, story_ids: list[str]) -> list[Story]:
+    if not story_ids:
+        return []
     return (  # type: ignore[no-any-return]
         db.query(Story)
-        .filter(Story.id.in_(related_ids))
+        .filter(Story.id.in_(story_ids))
         .order_by(Story.story_period.desc())
         .all()
     )
 
 
+def query_stories_in_order(db: Session, story_ids: list[str]) -> list[Story]:
+    """query_stories_by_ids, kept in the order of story_ids."""
+    story_by_id = {story.id: story for story in query_stories_by_ids(db, story_ids)}
+    return [story_by_id[sid] for sid in story_ids if sid in story_by_id]
+
+
+def query_related_stories(
+    db: Session, story_id: str, max_results: int = 50
+) -> list[Story]:
+    related_ids = query_related_story_ids(db, story_id, max_results)
+    return query_stories_in_order(db, related_ids)
+
+
+def query_story_edges(
+    db: Session, updated_since: datetime | None = None
+) -> list[tuple[str, str]]:
+    """
+    (from_story_id, to_story_id) pairs; with updated_since, only edges
+    touching a story updated since then.
+    """
+    stmt = select(_story_edges.c.from_story_id, _story_edges.c.to_story_id)
+    if updated_since is not None:
+        stmt = stmt.where(
+            select(Story.id)
+            .where(
+                Story.id.in_(
+                    [_story_edges.c.from_story_id, _story_edges.c.to_story_id]
+                ),
+                Story.updated_at >= updated_since,
+            )
+            .exists()
+        )
+    rows = db.execute(stmt).fetchall()
+    return [(row[0], row[1]) for row in rows]
+
+
 def query_sub_stories(db: Session, parent_story_ids: list[str]) -> list[Story]:
     if not parent_story_ids:
         return []
     return db.query(Story).filter(Story.parent_story_id.in_(parent_story_ids)).all()  # type: ignore[no-any-return]
 
 
+def query_story_rollups(
+    db: Session, parent_story_ids: list[str], sub_story_ids: list[str]
+) -> list[Row[Any]]:
+    """
+    Article count, source count and locations of each parent story together
+    with its sub-stories, in one round-trip. Articles and locations shared
+    by several of them are counted once. Returns (id, article_count,
+    sources_count, locations) rows, one per parent story.
+    """
+    if not parent_story_ids:
+        return []
+    story_ids = [*parent_story_ids, *sub_story_ids]
+    # Sub-stories hang directly off a parent story
+    parent_id = func.coalesce(Story.parent_story_id, Story.id)
+
+    articles = (
+        select(
+            parent_id.label("id"),
+            func.count(func.distinct(Article.id)).label("article_count"),
+            func.count(func.distinct(Article.source)).label("sources_count"),
+        )
+        .select_from(Story)
+        .join(ArticleStory, ArticleStory.story_id == Story.id)
+        .join(Article, Article.id == ArticleStory.article_id)
+        .where(Story.id.in_(story_ids))
+        .group_by(parent_id)
+        .subquery("rollup_articles")
+    )
+
+    story_locations = (
+        select(
+            parent_id.label("id"),
+            KBEntity.qid,
+            KBEntity.name,
+            KBLocation.location_type,
+            KBLocation.country_code,
+            func.ST_Y(literal_column("kb_locations.coordinates::geometry")).label(
+                "latitude"
+            ),
+            func.ST_X(literal_column("kb_locations.coordinates::geometry")).label(
+                "longitude"
+            ),
+        )
+        .distinct()
+        .select_from(Story)
+        .join(StoryEntity, StoryEntity.story_id == Story.id)
+        .join(KBEntity, KBEntity.qid == StoryEntity.qid)
+        .join(KBLocation, KBLocation.qid == KBEntity.qid)
+        .where(Story.id.in_(story_ids))
+        .where(KBEntity.entity_type == "location")
+        .subquery("story_locations")
+    )
+    locations = (
+        select(
+            story_locations.c.id,
+            func.json_agg(
+                _json_object(
+                    wikidata_qid=story_locations.c.qid,
+                    name=story_locations.c.name,
+                    location_type=story_locations.c.location_type,
+                    country_code=story_locations.c.country_code,
+                    latitude=story_locations.c.latitude,
+                    longitude=story_locations.c.longitude,
+                )
+            ).label("locations"),
+        )
+        .group_by(story_locations.c.id)
+        .subquery("rollup_locations")
+    )
+
+    stmt = (
+        select(
+            Story.id,
+            func.coalesce(articles.c.article_count, 0).label("article_count"),
+            func.coalesce(articles.c.sources_count, 0).label("sources_count"),
+            locations.c.locations,
+        )
+        .outerjoin(articles, articles.c.id == Story.id)
+        .outerjoin(locations, locations.c.id == Story.id)
+        .where(Story.id.in_(parent_story_ids))
+    )
+    return list(db.execute(stmt).all())
+
+
 def query_story_articles(
     db: Session,
     story_ids: list[str],
-) -> list[tuple[str, str, str, str, str]]:
+) -> list[tuple[str, str, str, str, str, str | None, bool]]:
+    """
+    Query articles for a list of stories with their stored og:image.
+    Returns (story_id, article_id, title, source, url, image_url, backfilled)
+    rows; backfilled is False for articles the backfill job has not reached,
+    so a null image_url there is unknown rather than missing.
+    """
     if not story_ids:
         return []
     return (  # type: ignore[no-any-return]
@@ -390,8 +810,11 @@ def query_story_articles(
             Article.title,
             Article.source,
             Article.url,
+            ArticleImage.image_url,
+            ArticleImage.article_id.isnot(None),
         )
         .join(Article, Article.id == ArticleStory.article_id)
+        .outerjoin(ArticleImage, ArticleImage.article_id == Article.id)
         .filter(ArticleStory.story_id.in_(story_ids))
         .all()
     )
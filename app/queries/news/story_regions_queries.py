@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from context_db.models import Story
+from sqlalchemy import ColumnElement, delete, insert, or_, select, true
+from sqlalchemy.orm import Session
+
+from app.models import StoryRegion
+from app.queries.news.stories_queries import story_region_matches
+
+
+def refresh_story_regions(
+    db: Session, since: datetime | None, updated_since: datetime | None = None
+) -> int:
+    """
+    Rebuild api_story_regions for stories with story_period >= since or
+    updated_at >= updated_since; since=None rebuilds every story. Returns the
+    number of rows written. The caller commits, so readers keep seeing the
+    previous mapping until the new one is complete.
+    """
+    stale: ColumnElement[bool]
+    if since is None:
+        stale = true()
+        db.execute(delete(StoryRegion))
+    else:
+        stale = Story.story_period >= since
+        if updated_since is not None:
+            stale = or_(stale, Story.updated_at >= updated_since)
+        db.execute(
+            delete(StoryRegion).where(
+                or_(
+                    StoryRegion.story_period >= since,
+                    StoryRegion.story_id.in_(select(Story.id).where(stale)),
+                )
+            )
+        )
+
+    result = db.execute(
+        insert(StoryRegion).from_select(
+            ["region", "story_period", "story_id"], story_region_matches(stale)
+        )
+    )
+    return result.rowcount  # type: ignore[attr-defined,no-any-return]
@@ -0,0 +1,132 @@
+from collections.abc import Iterable
+from datetime import datetime
+
+from context_db.models import Story
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import StoryThread
+
+
+def query_thread_members(
+    db: Session, story_ids: Iterable[str]
+) -> list[tuple[str, str]]:
+    """(story_id, thread_id) for every story sharing a thread with story_ids."""
+    threads = select(StoryThread.thread_id).where(
+        StoryThread.story_id.in_(list(story_ids))
+    )
+    rows = db.execute(
+        select(StoryThread.story_id, StoryThread.thread_id).where(
+            StoryThread.thread_id.in_(threads)
+        )
+    ).all()
+    return [(row[0], row[1]) for row in rows]
+
+
+def replace_story_threads(
+    db: Session, thread_by_story: dict[str, str], clear: bool = False
+) -> int:
+    """
+    Write thread_by_story, replacing the rows of those stories (or the whole
+    table with clear=True). The caller commits, so readers keep seeing the
+    previous threads until the new ones are complete.
+    """
+    if clear:
+        db.execute(delete(StoryThread))
+    elif thread_by_story:
+        db.execute(
+            delete(StoryThread).where(StoryThread.story_id.in_(list(thread_by_story)))
+        )
+    if not thread_by_story:
+        return 0
+    db.execute(
+        insert(StoryThread),
+        [
+            {"story_id": story_id, "thread_id": thread_id}
+            for story_id, thread_id in thread_by_story.items()
+        ],
+    )
+    return len(thread_by_story)
+
+
+def label_unthreaded_stories(db: Session, updated_since: datetime | None = None) -> int:
+    """
+    Give stories without a thread row (optionally only those updated since
+    updated_since) a thread of their own, so readers can tell a story with no
+    related stories from one the job has not reached. Returns the number of
+    rows written.
+    """
+    unthreaded = select(Story.id, Story.id.label("thread_id")).where(
+        ~select(StoryThread.story_id).where(StoryThread.story_id == Story.id).exists()
+    )
+    if updated_since is not None:
+        unthreaded = unthreaded.where(Story.updated_at >= updated_since)
+    result = db.execute(
+        insert(StoryThread).from_select(["story_id", "thread_id"], unthreaded)
+    )
+    return result.rowcount  # type: ignore[attr-defined,no-any-return]
+
+
+def query_story_thread_id(db: Session, story_id: str) -> str | None:
+    return db.execute(
+        select(StoryThread.thread_id).where(StoryThread.story_id == story_id)
+    ).scalar()
+
+
+def query_thread_stories(
+    db: Session, thread_id: str, exclude_story_id: str | None = None, limit: int = 50
+) -> list[Story]:
+    """Stories in a thread, most recent story_period first."""
+    query = (
+        db.query(Story)
+        .join(StoryThread, StoryThread.story_id == Story.id)
+        .filter(StoryThread.thread_id == thread_id)
+    )
+    if exclude_story_id is not None:
+        query = query.filter(Story.id != exclude_story_id)
+    return query.order_by(Story.story_period.desc()).limit(limit).all()  # type: ignore[no-any-return]
+
+
+def query_story_thread_ids(db: Session, story_ids: list[str]) -> dict[str, str]:
+    """thread_id by story_id, for the labelled stories among story_ids."""
+    if not story_ids:
+        return {}
+    rows = db.execute(
+        select(StoryThread.story_id, StoryThread.thread_id).where(
+            StoryThread.story_id.in_(story_ids)
+        )
+    ).all()
+    return {row[0]: row[1] for row in rows}
+
+
+def query_threads_stories(
+    db: Session, thread_ids: list[str], limit_per_thread: int = 50
+) -> list[tuple[str, Story]]:
+    """
+    (thread_id, story) for the limit_per_thread most recent stories of each
+    thread, most recent story_period first within a thread.
+    """
+    if not thread_ids:
+        return []
+    ranked = (
+        select(
+            StoryThread.story_id,
+            StoryThread.thread_id,
+            func.row_number()
+            .over(
+                partition_by=StoryThread.thread_id,
+                order_by=Story.story_period.desc(),
+            )
+            .label("rank"),
+        )
+        .join(Story, Story.id == StoryThread.story_id)
+        .where(StoryThread.thread_id.in_(thread_ids))
+        .subquery()
+    )
+    rows = db.execute(
+        select(ranked.c.thread_id, Story)
+        .join(ranked, ranked.c.story_id == Story.id)
+        .where(ranked.c.rank <= limit_per_thread)
+        .order_by(ranked.c.thread_id, ranked.c.rank)
+    ).all()
+    return [(row[0], row[1]) for row in rows]
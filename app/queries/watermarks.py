@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import JobWatermark
+
+
+def try_lock_refresh(db: Session, table_name: str) -> bool:
+    """
+    Take the transaction-scoped advisory lock for refreshing `table_name`.
+    False when another process holds it, so overlapping passes skip instead
+    of deleting each other's rows.
+    """
+    locked = db.execute(
+        select(func.pg_try_advisory_xact_lock(func.hashtext(table_name)))
+    ).scalar()
+    return bool(locked)
+
+
+def query_watermark(db: Session, table_name: str) -> datetime | None:
+    return db.execute(
+        select(JobWatermark.refreshed_at).where(JobWatermark.table_name == table_name)
+    ).scalar()
+
+
+def set_watermark(db: Session, table_name: str, refreshed_at: datetime) -> None:
+    stmt = insert(JobWatermark).values(table_name=table_name, refreshed_at=refreshed_at)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[JobWatermark.table_name],
+            set_={"refreshed_at": stmt.excluded.refreshed_at},
+        )
+    )
+
+
+def unrefreshed_since(table_name: str) -> Any:
+    """
+    SQL expression for the watermark of `table_name`: rows changed at or
+    after it must be matched live. -infinity until the job has run once, so
+    everything is matched live rather than nothing found.
+    """
+    return func.coalesce(
+        select(JobWatermark.refreshed_at)
+        .where(JobWatermark.table_name == table_name)
+        .scalar_subquery(),
+        literal_column("'-infinity'::timestamp"),
+    )
@@ -0,0 +1,46 @@
+"""
+JSON response classes.
+
+ORJSONResponse is the app-wide default: FastAPI still validates route results
+against response_model, but the final encode goes through orjson rather than
+json.dumps. Hot endpoints whose services already build validated models can
+skip the validate-and-dump round trip altogether by returning
+model_response(...), which serialises the models once with pydantic-core.
+Payloads already in JSON-able form (including NumPy arrays) go out through
+json_response(...).
+"""
+
+from typing import Any
+
+import pydantic_core
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+__all__ = ["ModelJSONResponse", "ORJSONResponse", "json_response", "model_response"]
+
+
+class ModelJSONResponse(Response):
+    """Renders pydantic models, or lists of them, straight to JSON bytes."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+def model_response(content: Any, response: Response) -> ModelJSONResponse:
+    """
+    Wrap already-validated models in a ModelJSONResponse. Headers that
+    dependencies set on the injected `response` (Cache-Control,
+    Last-Modified) are carried over, as FastAPI does for regular returns.
+    """
+    result = ModelJSONResponse(content)
+    result.headers.raw.extend(response.headers.raw)
+    return result
+
+
+def json_response(content: Any, response: Response) -> ORJSONResponse:
+    """Like model_response, for plain data encoded with orjson."""
+    result = ORJSONResponse(content)
+    result.headers.raw.extend(response.headers.raw)
+    return result
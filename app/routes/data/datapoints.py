@@ -1,30 +1,74 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.db import get_db
-from app.schemas.data import TSSeriesSchema
-from app.schemas.enums import TSFilterPeriod
-from app.services.data.datapoints_service import get_datapoints
+from app.responses import json_response, model_response
+from app.schemas.data import TSColumnarSeriesSchema, TSSeriesSchema
+from app.schemas.enums import TSDatapointsFormat, TSFilterPeriod, TSResolution
+from app.services.data.datapoints_service import (
+    export_datapoints,
+    get_datapoints,
+    get_datapoints_columnar,
+)
 
 router = APIRouter(prefix="/datapoints", tags=["data"])
 
 
-@router.get("", response_model=list[TSSeriesSchema])
+@router.get("", response_model=list[TSSeriesSchema] | list[TSColumnarSeriesSchema])
 def get_datapoints_endpoint(
+    response: Response,
     indicator_id: list[str] = Query(..., min_length=1),
     entity_id: list[str] | None = Query(default=None),
     period: TSFilterPeriod = TSFilterPeriod.five_years,
     from_date: date | None = None,
     to_date: date | None = None,
+    resolution: TSResolution | None = None,
+    max_points: int | None = Query(None, ge=3, le=10_000),
+    format: TSDatapointsFormat = TSDatapointsFormat.rows,
     db: Session = Depends(get_db),
-) -> list[TSSeriesSchema]:
-    return get_datapoints(
+) -> Response:
+    if format == TSDatapointsFormat.columnar:
+        columns = get_datapoints_columnar(
+            db,
+            indicator_ids=indicator_id,
+            entity_ids=entity_id,
+            period=period,
+            from_date=from_date,
+            to_date=to_date,
+            resolution=resolution,
+            max_points=max_points,
+        )
+        return json_response(columns, response)
+
+    series = get_datapoints(
         db,
         indicator_ids=indicator_id,
         entity_ids=entity_id,
         period=period,
         from_date=from_date,
         to_date=to_date,
+        resolution=resolution,
+        max_points=max_points,
+    )
+    return model_response(series, response)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_datapoints_endpoint(
+    indicator_id: list[str] = Query(..., min_length=1),
+    entity_id: list[str] | None = Query(default=None),
+    period: TSFilterPeriod = TSFilterPeriod.five_years,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> StreamingResponse:
+    lines = export_datapoints(
+        indicator_ids=indicator_id,
+        entity_ids=entity_id,
+        period=period,
+        from_date=from_date,
+        to_date=to_date,
     )
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -1,9 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.http_cache import cache_control
 from app.routes.data import datapoints, entities, stories
 from app.routes.data.indicators import indicators_router, sources_router
 
-router = APIRouter(prefix="/data", tags=["data"])
+# Time series are appended by daily ingestion jobs
+router = APIRouter(
+    prefix="/data",
+    tags=["data"],
+    dependencies=[Depends(cache_control(s_maxage=300, stale_while_revalidate=3600))],
+)
 router.include_router(entities.router)
 router.include_router(sources_router)
 router.include_router(indicators_router)
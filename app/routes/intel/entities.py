@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_async_db, get_db
 from app.schemas.intel import (
     EntityCoverageStatsResponse,
     EntityHeatmapResponse,
@@ -34,7 +35,7 @@ async def get_entity_stories(
     qid: str,
     limit: int = 10,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> PaginatedStoryCards:
     return await get_stories_by_entity(db, qid, limit=limit, offset=offset)
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.db import get_db
@@ -14,8 +14,9 @@ router = APIRouter(prefix="/posts", tags=["intel"])
 def get_posts(
     from_date: datetime | None = None,
     to_date: datetime | None = None,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ) -> TgPostListSchema:
     return list_posts(
@@ -24,4 +25,5 @@ def get_posts(
         to_date=to_date,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
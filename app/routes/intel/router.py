@@ -1,8 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.http_cache import cache_control
 from app.routes.intel import aircraft, channels, entities, posts, structured_posts
 
-router = APIRouter(prefix="/intel", tags=["intel"])
+# Intel feeds are near real time, so shared caches only absorb bursts
+router = APIRouter(
+    prefix="/intel",
+    tags=["intel"],
+    dependencies=[Depends(cache_control(s_maxage=15, stale_while_revalidate=60))],
+)
 router.include_router(channels.router)
 router.include_router(posts.router)
 router.include_router(structured_posts.router)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.db import get_db
@@ -18,8 +18,9 @@ def get_structured_posts(
     min_priority: int | None = None,
     max_priority: int | None = None,
     has_coordinates: bool | None = None,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ) -> TgStructuredPostListSchema:
     return list_structured_posts(
@@ -32,4 +33,5 @@ def get_structured_posts(
         has_coordinates=has_coordinates,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
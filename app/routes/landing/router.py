@@ -1,6 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.http_cache import cache_control
 
 from . import top_stories
 
-router = APIRouter(prefix="/landing", tags=["landing"])
+router = APIRouter(
+    prefix="/landing",
+    tags=["landing"],
+    dependencies=[Depends(cache_control(s_maxage=60, stale_while_revalidate=600))],
+)
 router.include_router(top_stories.router)
@@ -1,7 +1,5 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter
 
-from app.db import get_db
 from app.schemas.enums import FilterPeriod
 from app.schemas.landing import RegionTopStories
 from app.services.landing.top_stories_service import (
@@ -13,7 +11,7 @@ router = APIRouter(prefix="/top-stories")
 
 @router.get("", response_model=list[RegionTopStories])
 async def top_stories(
-    db: Session = Depends(get_db),
     period: FilterPeriod = FilterPeriod.week,
 ) -> list[RegionTopStories]:
-    return await get_top_stories_by_region_service(db=db, period=period)
+    # Served from a response cache; no request-scoped session needed
+    return await get_top_stories_by_region_service(period=period)
@@ -1,11 +1,15 @@
 from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.db import get_db
 from app.schemas.enums import FilterPeriod, FilterRegion
 from app.schemas.news import NewsArticle
+from app.services.news.articles_service import (
+    export_articles as export_articles_service,
+)
 from app.services.news.articles_service import (
     get_article as get_article_service,
 )
@@ -35,6 +39,19 @@ def list_articles(
     )
 
 
+@router.get("/export", response_class=StreamingResponse)
+def export_articles(
+    period: FilterPeriod = FilterPeriod.today,
+    region: FilterRegion | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> StreamingResponse:
+    lines = export_articles_service(
+        period=period, region=region, from_date=from_date, to_date=to_date
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
 @router.get("/{article_id}", response_model=NewsArticle)
 def get_article(
     article_id: str,
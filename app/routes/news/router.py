@@ -1,8 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.http_cache import cache_control
 
 from . import analytics, articles, sources, stories
 
-router = APIRouter(prefix="/news", tags=["news"])
+router = APIRouter(
+    prefix="/news",
+    tags=["news"],
+    dependencies=[Depends(cache_control(s_maxage=60, stale_while_revalidate=300))],
+)
 router.include_router(stories.router)
 router.include_router(articles.router)
 router.include_router(analytics.router)
@@ -1,14 +1,20 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.db import get_async_db
+from app.http_cache import set_last_modified
+from app.responses import model_response
 from app.schemas.enums import FilterPeriod, FilterRegion, FilterTopic
 from app.schemas.news import (
     NewsStory,
     NewsStoryWithRelated,
     PaginatedStoryCards,
+    StoryThreadSchema,
+)
+from app.services.news.stories_service import (
+    get_stories as get_stories_service,
 )
 from app.services.news.stories_service import (
     get_story as get_story_service,
@@ -16,24 +22,31 @@ from app.services.news.stories_service import (
 from app.services.news.stories_service import (
     get_story_feed as get_story_feed_service,
 )
+from app.services.news.stories_service import (
+    get_story_thread as get_story_thread_service,
+)
 from app.services.news.stories_service import (
     list_stories as list_stories_service,
 )
 
 router = APIRouter(prefix="/stories")
 
+# Story pages a client can resolve in one /batch request
+STORY_BATCH_LIMIT = 50
+
 
 @router.get("", response_model=list[NewsStory])
 async def list_stories(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     period: FilterPeriod = FilterPeriod.today,
     region: FilterRegion | None = None,
     topic: FilterTopic | None = None,
     from_date: date | None = None,
     to_date: date | None = None,
     limit: int | None = Query(None, ge=1, le=100),
-) -> list[NewsStory]:
-    return await list_stories_service(
+) -> Response:
+    stories = await list_stories_service(
         db=db,
         period=period,
         region=region,
@@ -42,33 +55,69 @@ async def list_stories(
         to_date=to_date,
         limit=limit,
     )
+    return model_response(stories, response)
 
 
 @router.get("/news-feed", response_model=PaginatedStoryCards)
 async def get_story_feed(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     period: FilterPeriod = FilterPeriod.today,
     region: FilterRegion | None = None,
     topic: FilterTopic | None = None,
     limit: int = Query(25, ge=1, le=100),
     offset: int = Query(0, ge=0),
-) -> PaginatedStoryCards:
-    return await get_story_feed_service(
+    cursor: str | None = None,
+    include_children: bool = False,
+) -> Response:
+    feed = await get_story_feed_service(
         db=db,
         period=period,
         region=region,
         topic=topic,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        include_children=include_children,
     )
+    return model_response(feed, response)
+
+
+@router.get("/batch", response_model=list[NewsStoryWithRelated])
+async def get_stories(
+    response: Response,
+    ids: list[str] = Query(..., min_length=1, max_length=STORY_BATCH_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    stories = await get_stories_service(db=db, story_ids=ids)
+    if stories:
+        set_last_modified(response, max(story.updated_at for story in stories))
+    return model_response(stories, response)
 
 
 @router.get("/{story_id}", response_model=NewsStoryWithRelated)
 async def get_story(
     story_id: str,
-    db: Session = Depends(get_db),
-) -> NewsStoryWithRelated:
-    story = await get_story_service(db=db, story_id=story_id)
+    response: Response,
+    include_children: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    story = await get_story_service(
+        db=db, story_id=story_id, include_children=include_children
+    )
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
-    return story
+    set_last_modified(response, story.updated_at)
+    return model_response(story, response)
+
+
+@router.get("/{story_id}/thread", response_model=StoryThreadSchema)
+async def get_story_thread(
+    story_id: str,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+) -> StoryThreadSchema:
+    thread = await get_story_thread_service(db=db, story_id=story_id, limit=limit)
+    if not thread:
+        raise HTTPException(status_code=404, detail="Story not found")
+    return thread
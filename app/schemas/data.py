@@ -33,3 +33,10 @@ class TSSeriesSchema(BaseModel):
     indicator: TSIndicatorSchema
     entity: TSEntitySchema
     datapoints: list[TSDatapointSchema]
+
+
+class TSColumnarSeriesSchema(BaseModel):
+    indicator: TSIndicatorSchema
+    entity: TSEntitySchema
+    dates: list[date]
+    values: list[float | None]
@@ -48,3 +48,15 @@ class TSFilterPeriod(StrEnum):
     ten_years = "10y"
     twenty_years = "20y"
     all_time = "all"
+
+
+class TSDatapointsFormat(StrEnum):
+    rows = "rows"
+    columnar = "columnar"
+
+
+class TSResolution(StrEnum):
+    week = "week"
+    month = "month"
+    quarter = "quarter"
+    year = "year"
@@ -87,6 +87,7 @@ class TgPostSchema(BaseModel):
 class TgPostListSchema(BaseModel):
     items: list[TgPostSchema]
     has_more: bool
+    next_cursor: str | None = None
 
 
 class TgStructuredPostSchema(BaseModel):
@@ -106,3 +107,4 @@ class TgStructuredPostSchema(BaseModel):
 class TgStructuredPostListSchema(BaseModel):
     items: list[TgStructuredPostSchema]
     has_more: bool
+    next_cursor: str | None = None
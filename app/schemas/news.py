@@ -68,6 +68,7 @@ class PaginatedStoryCards(BaseModel):
     offset: int
     limit: int
     has_more: bool
+    next_cursor: str | None = None
 
 
 class NewsStoryArticle(BaseModel):
@@ -100,6 +101,11 @@ class RelatedStorySchema(BaseModel):
     updated_at: datetime
 
 
+class StoryThreadSchema(BaseModel):
+    thread_id: str | None = None
+    stories: list[RelatedStorySchema]
+
+
 class NewsStoryWithRelated(NewsStory):
     related_stories: list[RelatedStorySchema] = []
 
@@ -1,8 +1,20 @@
+import itertools
+import math
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import date
+from typing import Any
 
+import numpy as np
+import numpy.typing as npt
+import orjson
+from context_db.connection import get_session
 from sqlalchemy.orm import Session
 
-from app.queries.data.datapoints_queries import query_datapoints
+from app.queries.data.datapoints_queries import (
+    query_datapoint_columns,
+    stream_datapoint_columns,
+)
 from app.queries.data.entities_queries import query_entities_by_ids
 from app.queries.data.indicators_queries import query_indicators_by_ids
 from app.schemas.data import (
@@ -12,9 +24,20 @@ from app.schemas.data import (
     TSSeriesSchema,
     TSSourceSchema,
 )
-from app.schemas.enums import TSFilterPeriod
+from app.schemas.enums import TSFilterPeriod, TSResolution
+from app.services.utils.downsampling import lttb
 from app.services.utils.ts_date_utils import get_ts_date_range
 
+_EXPORT_BATCH_SIZE = 5000
+
+
+@dataclass
+class _Series:
+    indicator: TSIndicatorSchema
+    entity: TSEntitySchema
+    dates: npt.NDArray[np.datetime64]
+    values: npt.NDArray[np.float64]
+
 
 def get_datapoints(
     db: Session,
@@ -23,54 +46,190 @@ def get_datapoints(
     period: TSFilterPeriod = TSFilterPeriod.five_years,
     from_date: date | None = None,
     to_date: date | None = None,
+    resolution: TSResolution | None = None,
+    max_points: int | None = None,
 ) -> list[TSSeriesSchema]:
+    series = _load_series(
+        db,
+        indicator_ids,
+        entity_ids,
+        period,
+        from_date,
+        to_date,
+        resolution,
+        max_points,
+    )
+    # Values come from typed columns, so the schemas skip per-row validation
+    return [
+        TSSeriesSchema.model_construct(
+            indicator=s.indicator,
+            entity=s.entity,
+            datapoints=[
+                TSDatapointSchema.model_construct(
+                    date=day, value=None if math.isnan(value) else value
+                )
+                for day, value in zip(s.dates.tolist(), s.values.tolist(), strict=True)
+            ],
+        )
+        for s in series
+    ]
+
+
+def get_datapoints_columnar(
+    db: Session,
+    indicator_ids: list[str],
+    entity_ids: list[str] | None = None,
+    period: TSFilterPeriod = TSFilterPeriod.five_years,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    resolution: TSResolution | None = None,
+    max_points: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Same series as get_datapoints, each with parallel `dates` and `values`
+    arrays instead of one object per datapoint. Values stay NumPy float64
+    arrays (NaN for missing) for ORJSONResponse to encode natively.
+    """
+    series = _load_series(
+        db,
+        indicator_ids,
+        entity_ids,
+        period,
+        from_date,
+        to_date,
+        resolution,
+        max_points,
+    )
+    return [
+        {
+            "indicator": s.indicator.model_dump(),
+            "entity": s.entity.model_dump(),
+            "dates": np.datetime_as_string(s.dates).tolist(),
+            "values": s.values,
+        }
+        for s in series
+    ]
+
+
+def export_datapoints(
+    indicator_ids: list[str],
+    entity_ids: list[str] | None = None,
+    period: TSFilterPeriod = TSFilterPeriod.five_years,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> Iterator[bytes]:
+    """
+    NDJSON export, one {indicator_id, entity_id, date, value} object per line.
+    Rows are read in batches through a server-side cursor on a session of its
+    own, since the response is streamed after the route has returned.
+    """
     start, end = get_ts_date_range(period, from_date, to_date)
 
-    rows = query_datapoints(
+    def lines() -> Iterator[bytes]:
+        with get_session() as db:
+            for batch in stream_datapoint_columns(
+                db,
+                indicator_ids=indicator_ids,
+                entity_ids=entity_ids,
+                from_date=start,
+                to_date=end,
+                batch_size=_EXPORT_BATCH_SIZE,
+            ):
+                yield b"".join(
+                    orjson.dumps(
+                        {
+                            "indicator_id": indicator_id,
+                            "entity_id": entity_id,
+                            "date": day,
+                            "value": None if value is None else float(value),
+                        }
+                    )
+                    + b"\n"
+                    for indicator_id, entity_id, day, value in batch
+                )
+
+    return lines()
+
+
+def _load_series(
+    db: Session,
+    indicator_ids: list[str],
+    entity_ids: list[str] | None,
+    period: TSFilterPeriod,
+    from_date: date | None,
+    to_date: date | None,
+    resolution: TSResolution | None,
+    max_points: int | None,
+) -> list[_Series]:
+    start, end = get_ts_date_range(period, from_date, to_date)
+
+    rows = query_datapoint_columns(
         db,
         indicator_ids=indicator_ids,
         entity_ids=entity_ids,
         from_date=start,
         to_date=end,
+        resolution=resolution,
     )
     if not rows:
         return []
 
-    seen_entity_ids = list({r.entity_id for r in rows})
+    indicator_col, entity_col, date_col, value_col = zip(*rows, strict=True)
+    indicators = np.array(indicator_col, dtype=object)
+    entities = np.array(entity_col, dtype=object)
+    dates = np.array(date_col, dtype="datetime64[D]")
+    values = np.array(value_col, dtype=np.float64)
+
+    # Rows are sorted by (indicator, entity, date): split where the key changes
+    changes = np.flatnonzero(
+        (indicators[1:] != indicators[:-1]) | (entities[1:] != entities[:-1])
+    )
+    bounds = [0, *(changes + 1).tolist(), len(rows)]
+
     indicators_by_id = query_indicators_by_ids(db, indicator_ids)
-    entities_by_id = query_entities_by_ids(db, seen_entity_ids)
-
-    # Group datapoints by (indicator_id, entity_id)
-    series: dict[tuple[str, str], list[TSDatapointSchema]] = {}
-    for row in rows:
-        key = (row.indicator_id, row.entity_id)
-        series.setdefault(key, []).append(
-            TSDatapointSchema(date=row.date, value=row.value)
-        )
+    entities_by_id = query_entities_by_ids(db, list(set(entity_col)))
 
-    result: list[TSSeriesSchema] = []
-    for (indicator_id, entity_id), datapoints in series.items():
-        ind_src = indicators_by_id.get(indicator_id)
-        ent = entities_by_id.get(entity_id)
-        if not ind_src or not ent:
+    result: list[_Series] = []
+    for lo, hi in itertools.pairwise(bounds):
+        labels = _series_labels(
+            indicators_by_id.get(indicators[lo]), entities_by_id.get(entities[lo])
+        )
+        if not labels:
             continue
-        ind, src = ind_src
-        result.append(
-            TSSeriesSchema(
-                indicator=TSIndicatorSchema(
-                    id=ind.id,
-                    name=ind.name,
-                    unit=ind.unit,
-                    frequency=ind.frequency,
-                    source=TSSourceSchema(id=src.id, name=src.name, url=src.url),
-                ),
-                entity=TSEntitySchema(
-                    id=ent.id,
-                    name=ent.name,
-                    entity_type=ent.entity_type,
-                ),
-                datapoints=datapoints,
+        series_dates, series_values = dates[lo:hi], values[lo:hi]
+        if max_points is not None and hi - lo > max_points:
+            series_dates, series_values = _downsample(
+                series_dates, series_values, max_points
             )
-        )
+        result.append(_Series(*labels, series_dates, series_values))
 
     return result
+
+
+def _downsample(
+    dates: npt.NDArray[np.datetime64],
+    values: npt.NDArray[np.float64],
+    max_points: int,
+) -> tuple[npt.NDArray[np.datetime64], npt.NDArray[np.float64]]:
+    # Gaps can't be placed on the chart's y axis, so LTTB only sees real values
+    present = ~np.isnan(values)
+    dates, values = dates[present], values[present]
+    keep = lttb(dates.astype(np.float64), values, max_points)
+    return dates[keep], values[keep]
+
+
+def _series_labels(
+    ind_src: tuple[Any, Any] | None, ent: Any | None
+) -> tuple[TSIndicatorSchema, TSEntitySchema] | None:
+    if not ind_src or not ent:
+        return None
+    ind, src = ind_src
+    indicator = TSIndicatorSchema(
+        id=ind.id,
+        name=ind.name,
+        unit=ind.unit,
+        frequency=ind.frequency,
+        source=TSSourceSchema(id=src.id, name=src.name, url=src.url),
+    )
+    entity = TSEntitySchema(id=ent.id, name=ent.name, entity_type=ent.entity_type)
+    return indicator, entity
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.queries.intel.posts_queries import query_posts
 from app.schemas.intel import TgPostListSchema, TgPostSchema
+from app.services.utils.cursor import encode_cursor, parse_cursor_param
 
 
 def list_posts(
@@ -13,6 +14,7 @@ def list_posts(
     to_date: datetime | None = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> TgPostListSchema:
     rows = query_posts(
         db,
@@ -21,10 +23,15 @@ def list_posts(
         to_date=to_date,
         limit=limit + 1,
         offset=offset,
+        after=parse_cursor_param(cursor, int, nullable=True),
     )
     has_more = len(rows) > limit
-    items = [_to_schema(r) for r in rows[:limit]]
-    return TgPostListSchema(items=items, has_more=has_more)
+    rows = rows[:limit]
+    items = [_to_schema(r) for r in rows]
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+    return TgPostListSchema(items=items, has_more=has_more, next_cursor=next_cursor)
 
 
 def _to_schema(row: object) -> TgPostSchema:
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.queries.intel.structured_posts_queries import query_structured_posts
 from app.schemas.intel import TgStructuredPostListSchema, TgStructuredPostSchema
+from app.services.utils.cursor import encode_cursor, parse_cursor_param
 
 
 def list_structured_posts(
@@ -16,6 +17,7 @@ def list_structured_posts(
     has_coordinates: bool | None = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> TgStructuredPostListSchema:
     rows = query_structured_posts(
         db,
@@ -27,10 +29,18 @@ def list_structured_posts(
         has_coordinates=has_coordinates,
         limit=limit + 1,
         offset=offset,
+        after=parse_cursor_param(cursor, int, nullable=True),
     )
     has_more = len(rows) > limit
-    items = [_to_schema(sp, post) for sp, post in rows[:limit]]
-    return TgStructuredPostListSchema(items=items, has_more=has_more)
+    rows = rows[:limit]
+    items = [_to_schema(sp, post) for sp, post in rows]
+    next_cursor = None
+    if has_more:
+        last_post = rows[-1][1]
+        next_cursor = encode_cursor(last_post.date, last_post.id)
+    return TgStructuredPostListSchema(
+        items=items, has_more=has_more, next_cursor=next_cursor
+    )
 
 
 def _to_schema(sp: object, post: object) -> TgStructuredPostSchema:
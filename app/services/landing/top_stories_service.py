@@ -1,39 +1,74 @@
+from datetime import datetime
+from functools import partial
 from typing import Any
 
+from context_db.connection import get_session
 from sqlalchemy.orm import Session
 
 from app.queries.news.stories_queries import (
-    query_stories,
     query_story_locations,
+    query_top_stories_by_region,
 )
 from app.schemas.enums import FilterPeriod, FilterRegion
 from app.schemas.landing import LandingStory, RegionTopStories
 from app.schemas.news import ArticleLocationSchema
+from app.services.utils.cache_backends import build_cache
 from app.services.utils.date_utils import get_date_range
+from app.services.utils.db_executor import run_db
+from app.services.utils.swr_cache import StaleWhileRevalidateCache
 
+# Seconds before a cached landing page is refreshed in the background. Rolling
+# windows move constantly; whole-day windows only change as stories land.
+_CACHE_TTL_BY_PERIOD: dict[FilterPeriod, float] = {
+    FilterPeriod.last_24_hours: 60,
+    FilterPeriod.today: 60,
+    FilterPeriod.week: 300,
+    FilterPeriod.month: 900,
+}
 
-async def get_top_stories_by_region(
-    db: Session,
-    period: FilterPeriod,
-) -> list[RegionTopStories]:
-    start, end = get_date_range(period, None, None)
+# Local copies expire well within the shortest TTL, so a worker serves the
+# result another worker just refreshed instead of recomputing it itself
+_cache = StaleWhileRevalidateCache(
+    build_cache("landing_top_stories", max_entries=16, local_ttl=5)
+)
 
-    # Query top 3 stories per region
-    stories_by_region: dict[FilterRegion, list[Any]] = {}
-    all_story_ids: list[str] = []
 
-    for region in FilterRegion:
-        stories = query_stories(
-            db, start, end, region=region, limit=3, parent_only=True
-        )
-        stories_by_region[region] = stories
-        all_story_ids.extend(story.id for story in stories)
+def _load_top_stories(
+    db: Session, start: datetime, end: datetime
+) -> tuple[dict[FilterRegion, list[Any]], dict[str, list[Any]]]:
+    # Top 3 stories for every region in a single ranked query
+    stories_by_region: dict[FilterRegion, list[Any]] = {
+        region: [] for region in FilterRegion
+    }
+    rows = query_top_stories_by_region(db, start, end, per_region=3)
+    for row in rows:
+        stories_by_region[FilterRegion(row.region)].append(row)
 
-    if not all_story_ids:
-        return []
+    if not rows:
+        return stories_by_region, {}
 
     # Batch fetch locations for all stories at once
-    locations_by_story = query_story_locations(db, all_story_ids)
+    story_ids = list({row.id for row in rows})
+    return stories_by_region, query_story_locations(db, story_ids)
+
+
+def _load_top_stories_with_session(
+    start: datetime, end: datetime
+) -> tuple[dict[FilterRegion, list[Any]], dict[str, list[Any]]]:
+    # Refreshes can outlive the request that triggered them, so they use
+    # their own session rather than the request's
+    with get_session() as db:
+        return _load_top_stories(db, start, end)
+
+
+async def _compute_top_stories(period: FilterPeriod) -> list[dict[str, Any]]:
+    start, end = get_date_range(period, None, None)
+
+    stories_by_region, locations_by_story = await run_db(
+        _load_top_stories_with_session, start, end
+    )
+    if not any(stories_by_region.values()):
+        return []
 
     # Assemble response grouped by region
     result: list[RegionTopStories] = []
@@ -52,4 +87,14 @@ async def get_top_stories_by_region(
             )
         result.append(RegionTopStories(region=region.value, stories=region_stories))
 
-    return result
+    # Cached as JSON so every worker on the host can share it
+    return [region.model_dump(mode="json") for region in result]
+
+
+async def get_top_stories_by_region(period: FilterPeriod) -> list[RegionTopStories]:
+    data = await _cache.get(
+        period.value,
+        _CACHE_TTL_BY_PERIOD[period],
+        partial(_compute_top_stories, period),
+    )
+    return [RegionTopStories.model_validate(region) for region in data]
@@ -1,16 +1,22 @@
+from collections.abc import Iterator
 from datetime import date
 
+import pydantic_core
+from context_db.connection import get_session
 from sqlalchemy.orm import Session
 
 from app.queries.news.articles_queries import (
     query_article_by_id,
     query_article_locations,
     query_articles,
+    stream_articles,
 )
 from app.schemas.enums import FilterPeriod, FilterRegion
 from app.schemas.news import ArticleLocationSchema, NewsArticle
 from app.services.utils.date_utils import get_date_range
 
+_EXPORT_BATCH_SIZE = 500
+
 
 def list_articles(
     db: Session,
@@ -22,7 +28,7 @@ def list_articles(
 ) -> list[NewsArticle]:
     start, end = get_date_range(period, from_date, to_date)
 
-    articles_db = query_articles(db, start, end, limit=limit)
+    articles_db = query_articles(db, start, end, region=region, limit=limit)
 
     article_ids = [article.id for article in articles_db]
     locations_by_article = query_article_locations(db, article_ids)
@@ -37,7 +43,7 @@ def list_articles(
             published_at=article.published_at,
             ingested_at=article.ingested_at,
             locations=[
-                ArticleLocationSchema(**loc)
+                ArticleLocationSchema.model_construct(**loc)
                 for loc in locations_by_article.get(article.id, [])
             ],
         )
@@ -61,7 +67,51 @@ def get_article(db: Session, article_id: str) -> NewsArticle | None:
         published_at=article.published_at,
         ingested_at=article.ingested_at,
         locations=[
-            ArticleLocationSchema(**loc)
+            ArticleLocationSchema.model_construct(**loc)
             for loc in locations_by_article.get(article_id, [])
         ],
     )
+
+
+def export_articles(
+    period: FilterPeriod,
+    region: FilterRegion | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> Iterator[bytes]:
+    """
+    NDJSON export of every article in the range, one NewsArticle per line.
+    Articles are read in batches through a server-side cursor on a session of
+    its own, and locations are loaded per batch.
+    """
+    start, end = get_date_range(period, from_date, to_date)
+
+    def lines() -> Iterator[bytes]:
+        with get_session() as db:
+            for batch in stream_articles(
+                db, start, end, region=region, batch_size=_EXPORT_BATCH_SIZE
+            ):
+                locations_by_article = query_article_locations(
+                    db, [article.id for article in batch]
+                )
+                yield b"".join(
+                    pydantic_core.to_json(
+                        NewsArticle.model_construct(
+                            id=article.id,
+                            source=article.source,
+                            title=article.title,
+                            summary=article.summary,
+                            url=article.url,
+                            published_at=article.published_at,
+                            ingested_at=article.ingested_at,
+                            locations=[
+                                ArticleLocationSchema.model_construct(**loc)
+                                for loc in locations_by_article.get(article.id, [])
+                            ],
+                        )
+                    )
+                    + b"\n"
+                    for article in batch
+                )
+
+    return lines()
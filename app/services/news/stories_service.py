@@ -1,16 +1,34 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
 from datetime import date
+from typing import Any
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.queries.aio import run_query, run_query_isolated
 from app.queries.news.stories_queries import (
     query_related_stories,
     query_stories,
     query_stories_by_entity_qid,
+    query_stories_by_ids,
+    query_stories_in_order,
     query_story_articles,
     query_story_by_id,
+    query_story_cards,
     query_story_locations,
     query_story_persons,
+    query_story_rollups,
     query_story_topics,
+    query_sub_stories,
+)
+from app.queries.news.story_threads_queries import (
+    query_story_thread_id,
+    query_story_thread_ids,
+    query_thread_stories,
+    query_threads_stories,
 )
 from app.schemas.enums import FilterPeriod, FilterRegion, FilterTopic
 from app.schemas.news import (
@@ -22,13 +40,116 @@ from app.schemas.news import (
     RelatedStorySchema,
     StoryCard,
     StoryPersonSchema,
+    StoryThreadSchema,
 )
+from app.services.news.story_graph import StoryGraphIndex
+from app.services.utils.cursor import encode_cursor, parse_cursor_param
 from app.services.utils.date_utils import get_date_range
 from app.services.utils.image_fetcher import fetch_og_images
 
+# Seconds to wait for live og:image fetches of articles the backfill job has
+# not reached yet. Unresolved images are served as null and keep loading in
+# the background; 0 serves stored images only.
+FEED_IMAGE_BUDGET = float(os.environ.get("FEED_IMAGE_BUDGET_SECONDS", "0.3"))
+STORY_IMAGE_BUDGET = float(os.environ.get("STORY_IMAGE_BUDGET_SECONDS", "1.5"))
+
+# Related stories shown on a story page. STORY_GRAPH_INDEX=1 walks an
+# in-memory copy of story_edges instead of running the recursive query.
+RELATED_STORIES_LIMIT = int(os.environ.get("RELATED_STORIES_LIMIT", "50"))
+RELATED_STORIES_MAX_DEPTH = 10
+_story_graph = StoryGraphIndex() if os.environ.get("STORY_GRAPH_INDEX") == "1" else None
+
+logger = logging.getLogger(__name__)
+
+ArticleRow = tuple[str, str, str, str, str, str | None]
+
+
+@dataclass
+class StoryEnrichment:
+    article_rows: list[ArticleRow]
+    locations_by_story: dict[str, list[Any]]
+    persons_by_story: dict[str, list[Any]]
+    topics_by_story: dict[str, list[str]]
+
+
+async def _no_persons() -> dict[str, list[Any]]:
+    return {}
+
+
+async def _live_images(urls: list[str], budget: float) -> dict[str, str | None]:
+    if not urls or budget <= 0:
+        return {}
+    return await fetch_og_images(list(dict.fromkeys(urls)), budget=budget)
+
+
+async def _load_articles(story_ids: list[str], image_budget: float) -> list[ArticleRow]:
+    """
+    Load article rows with their stored og:image, fetching the images of
+    articles the backfill job has not reached yet live for at most
+    image_budget seconds. Backfilled articles without an image stay null.
+    """
+    rows = await run_query_isolated(query_story_articles, story_ids)
+    live = await _live_images([row[4] for row in rows if not row[6]], image_budget)
+    return [
+        (story_id, article_id, title, source, url, image_url or live.get(url))
+        for story_id, article_id, title, source, url, image_url, _ in rows
+    ]
+
+
+async def _enrich_stories(
+    story_ids: list[str], image_budget: float, include_persons: bool = True
+) -> StoryEnrichment:
+    """
+    Fan out the per-story lookups concurrently. Each lookup runs on its own
+    pooled connection, so latency tracks the slowest one instead of the sum
+    of the round-trips.
+    """
+    article_rows, locations, persons, topics = await asyncio.gather(
+        _load_articles(story_ids, image_budget),
+        run_query_isolated(query_story_locations, story_ids),
+        run_query_isolated(query_story_persons, story_ids)
+        if include_persons
+        else _no_persons(),
+        run_query_isolated(query_story_topics, story_ids),
+    )
+    return StoryEnrichment(
+        article_rows=article_rows,
+        locations_by_story=locations,
+        persons_by_story=persons,
+        topics_by_story=topics,
+    )
+
+
+def _roll_up_sub_stories(enrichment: StoryEnrichment, story_id: str) -> StoryEnrichment:
+    """
+    Fold the enrichment of a story and its sub-stories into story_id,
+    keeping the first of any article, location or person they share.
+    """
+    article_rows: list[ArticleRow] = []
+    seen: set[str] = set()
+    for _, article_id, title, source, url, image_url in enrichment.article_rows:
+        if article_id not in seen:
+            seen.add(article_id)
+            article_rows.append((story_id, article_id, title, source, url, image_url))
+
+    def by_qid(items_by_story: dict[str, list[Any]]) -> dict[str, list[Any]]:
+        items: dict[str, Any] = {}
+        for story_items in items_by_story.values():
+            for item in story_items:
+                items.setdefault(item["wikidata_qid"], item)
+        return {story_id: list(items.values())}
+
+    topics = [t for ts in enrichment.topics_by_story.values() for t in ts]
+    return StoryEnrichment(
+        article_rows=article_rows,
+        locations_by_story=by_qid(enrichment.locations_by_story),
+        persons_by_story=by_qid(enrichment.persons_by_story),
+        topics_by_story={story_id: list(dict.fromkeys(topics))},
+    )
+
 
 async def list_stories(
-    db: Session,
+    db: AsyncSession,
     period: FilterPeriod,
     region: FilterRegion | None = None,
     topic: FilterTopic | None = None,
@@ -38,8 +159,9 @@ async def list_stories(
 ) -> list[NewsStory]:
     start, end = get_date_range(period, from_date, to_date)
 
-    stories_db = query_stories(
+    stories_db = await run_query(
         db,
+        query_stories,
         start,
         end,
         region=region,
@@ -52,23 +174,17 @@ async def list_stories(
 
     story_ids = [story.id for story in stories_db]
 
-    article_rows = query_story_articles(db, story_ids)
-    locations_by_story = query_story_locations(db, story_ids)
-    persons_by_story = query_story_persons(db, story_ids)
-    topics_by_story = query_story_topics(db, story_ids)
-
-    article_urls = list({row[4] for row in article_rows})
-    url_to_image = await fetch_og_images(article_urls)
+    enrichment = await _enrich_stories(story_ids, FEED_IMAGE_BUDGET)
 
     articles_by_story: dict[str, list[NewsStoryArticle]] = {}
-    for story_id, article_id, title, source, url in article_rows:
+    for story_id, article_id, title, source, url, image_url in enrichment.article_rows:
         articles_by_story.setdefault(story_id, []).append(
-            NewsStoryArticle(
+            NewsStoryArticle.model_construct(
                 article_id=article_id,
                 headline=title,
                 source=source,
                 url=url,
-                image_url=url_to_image.get(url),
+                image_url=image_url,
             )
         )
 
@@ -80,14 +196,14 @@ async def list_stories(
                 title=story.title,
                 summary=story.summary,
                 key_points=story.key_points or [],
-                topics=topics_by_story.get(story.id, []),
+                topics=enrichment.topics_by_story.get(story.id, []),
                 locations=[
-                    ArticleLocationSchema(**loc)
-                    for loc in locations_by_story.get(story.id, [])
+                    ArticleLocationSchema.model_construct(**loc)
+                    for loc in enrichment.locations_by_story.get(story.id, [])
                 ],
                 persons=[
-                    StoryPersonSchema(**person)
-                    for person in persons_by_story.get(story.id, [])
+                    StoryPersonSchema.model_construct(**person)
+                    for person in enrichment.persons_by_story.get(story.id, [])
                 ],
                 story_period=story.story_period,
                 created_at=story.created_at,
@@ -99,56 +215,118 @@ async def list_stories(
     return stories
 
 
-async def get_story(db: Session, story_id: str) -> NewsStoryWithRelated | None:
-    story = query_story_by_id(db, story_id)
-    if not story:
-        return None
+def _load_related_stories(db: Session, story_id: str) -> list[Any]:
+    try:
+        thread_id = query_story_thread_id(db, story_id)
+        if thread_id is not None:
+            return query_thread_stories(
+                db, thread_id, exclude_story_id=story_id, limit=RELATED_STORIES_LIMIT
+            )
+        # No row: the thread job has not reached this story yet. Stories
+        # without edges have a thread of their own, so they return [] above.
+        return _walk_related_stories(db, story_id)
+    except Exception:
+        # The story page still renders without its related stories
+        logger.exception("Loading related stories for %s failed", story_id)
+        return []
+
 
-    article_rows = query_story_articles(db, [story_id])
-    locations_by_story = query_story_locations(db, [story_id])
-    persons_by_story = query_story_persons(db, [story_id])
-    topics_by_story = query_story_topics(db, [story_id])
+def _walk_related_stories(db: Session, story_id: str) -> list[Any]:
+    related_ids = (
+        None
+        if _story_graph is None
+        else _story_graph.related(
+            db, story_id, RELATED_STORIES_MAX_DEPTH, RELATED_STORIES_LIMIT
+        )
+    )
+    if related_ids is None:
+        # No index, or its first load is still running in another request
+        return query_related_stories(db, story_id, RELATED_STORIES_LIMIT)
+    return query_stories_in_order(db, related_ids)
+
+
+def _load_related_stories_batch(
+    db: Session, story_ids: list[str]
+) -> dict[str, list[Any]]:
+    """
+    Related stories for several stories: one lookup for their threads and one
+    for the members of all of them. Only stories the thread job has not
+    labelled yet fall back to a graph walk of their own.
+    """
     try:
-        related_stories_db = query_related_stories(db, story_id)
+        thread_by_story = query_story_thread_ids(db, story_ids)
+        # One extra per thread, as each story is dropped from its own list
+        members_by_thread: dict[str, list[Any]] = {}
+        for member_thread_id, story in query_threads_stories(
+            db,
+            list(set(thread_by_story.values())),
+            limit_per_thread=RELATED_STORIES_LIMIT + 1,
+        ):
+            members_by_thread.setdefault(member_thread_id, []).append(story)
+
+        related: dict[str, list[Any]] = {}
+        for story_id in story_ids:
+            thread_id = thread_by_story.get(story_id)
+            if thread_id is None:
+                related[story_id] = _walk_related_stories(db, story_id)
+                continue
+            others = [
+                story
+                for story in members_by_thread.get(thread_id, [])
+                if story.id != story_id
+            ]
+            related[story_id] = others[:RELATED_STORIES_LIMIT]
+        return related
     except Exception:
-        related_stories_db = []
+        logger.exception("Loading related stories for %s failed", story_ids)
+        return {}
 
-    article_urls = list({row[4] for row in article_rows})
-    url_to_image = await fetch_og_images(article_urls)
+
+async def get_story(
+    db: AsyncSession, story_id: str, include_children: bool = False
+) -> NewsStoryWithRelated | None:
+    story = await run_query(db, query_story_by_id, story_id)
+    if not story:
+        return None
+
+    story_ids = [story_id]
+    if include_children:
+        sub_stories = await run_query(db, query_sub_stories, [story_id])
+        story_ids.extend(sub_story.id for sub_story in sub_stories)
+
+    enrichment, related_stories_db = await asyncio.gather(
+        _enrich_stories(story_ids, STORY_IMAGE_BUDGET),
+        run_query_isolated(_load_related_stories, story_id),
+    )
+    if len(story_ids) > 1:
+        enrichment = _roll_up_sub_stories(enrichment, story_id)
 
     articles = [
-        NewsStoryArticle(
+        NewsStoryArticle.model_construct(
             article_id=article_id,
             headline=title,
             source=source,
             url=url,
-            image_url=url_to_image.get(url),
+            image_url=image_url,
         )
-        for _, article_id, title, source, url in article_rows
+        for _, article_id, title, source, url, image_url in enrichment.article_rows
     ]
 
-    related_stories = [
-        RelatedStorySchema(
-            story_id=related_story.id,
-            title=related_story.title,
-            summary=related_story.summary,
-            story_period=related_story.story_period,
-            updated_at=related_story.updated_at,
-        )
-        for related_story in related_stories_db
-    ]
+    related_stories = [_related_story(related) for related in related_stories_db]
 
     return NewsStoryWithRelated(
         story_id=story.id,
         title=story.title,
         summary=story.summary,
         key_points=story.key_points or [],
-        topics=topics_by_story.get(story_id, []),
+        topics=enrichment.topics_by_story.get(story_id, []),
         locations=[
-            ArticleLocationSchema(**loc) for loc in locations_by_story.get(story_id, [])
+            ArticleLocationSchema.model_construct(**loc)
+            for loc in enrichment.locations_by_story.get(story_id, [])
         ],
         persons=[
-            StoryPersonSchema(**person) for person in persons_by_story.get(story_id, [])
+            StoryPersonSchema.model_construct(**person)
+            for person in enrichment.persons_by_story.get(story_id, [])
         ],
         story_period=story.story_period,
         created_at=story.created_at,
@@ -158,95 +336,202 @@ async def get_story(db: Session, story_id: str) -> NewsStoryWithRelated | None:
     )
 
 
+async def get_stories(
+    db: AsyncSession, story_ids: list[str]
+) -> list[NewsStoryWithRelated]:
+    """
+    Story details for several stories at once, in the order requested and
+    skipping unknown ids. Every lookup takes the whole id list, so the number
+    of round-trips does not grow with the number of stories.
+    """
+    story_ids = list(dict.fromkeys(story_ids))
+    stories_db = await run_query(db, query_stories_by_ids, story_ids)
+    if not stories_db:
+        return []
+
+    story_by_id = {story.id: story for story in stories_db}
+    found_ids = [story_id for story_id in story_ids if story_id in story_by_id]
+
+    enrichment, related_by_story = await asyncio.gather(
+        _enrich_stories(found_ids, STORY_IMAGE_BUDGET),
+        run_query_isolated(_load_related_stories_batch, found_ids),
+    )
+
+    articles_by_story: dict[str, list[NewsStoryArticle]] = {}
+    for story_id, article_id, title, source, url, image_url in enrichment.article_rows:
+        articles_by_story.setdefault(story_id, []).append(
+            NewsStoryArticle.model_construct(
+                article_id=article_id,
+                headline=title,
+                source=source,
+                url=url,
+                image_url=image_url,
+            )
+        )
+
+    return [
+        NewsStoryWithRelated(
+            story_id=story.id,
+            title=story.title,
+            summary=story.summary,
+            key_points=story.key_points or [],
+            topics=enrichment.topics_by_story.get(story.id, []),
+            locations=[
+                ArticleLocationSchema.model_construct(**loc)
+                for loc in enrichment.locations_by_story.get(story.id, [])
+            ],
+            persons=[
+                StoryPersonSchema.model_construct(**person)
+                for person in enrichment.persons_by_story.get(story.id, [])
+            ],
+            story_period=story.story_period,
+            created_at=story.created_at,
+            updated_at=story.updated_at,
+            articles=articles_by_story.get(story.id, []),
+            related_stories=[
+                _related_story(related)
+                for related in related_by_story.get(story.id, [])
+            ],
+        )
+        for story in (story_by_id[story_id] for story_id in found_ids)
+    ]
+
+
+async def get_story_thread(
+    db: AsyncSession, story_id: str, limit: int = 100
+) -> StoryThreadSchema | None:
+    thread_id = await run_query(db, query_story_thread_id, story_id)
+    if thread_id is not None:
+        stories = await run_query(db, query_thread_stories, thread_id, limit=limit)
+    else:
+        # Stories without edges form a thread of their own
+        story = await run_query(db, query_story_by_id, story_id)
+        if not story:
+            return None
+        stories = [story]
+    return StoryThreadSchema(
+        thread_id=thread_id, stories=[_related_story(s) for s in stories]
+    )
+
+
+def _related_story(story: Any) -> RelatedStorySchema:
+    return RelatedStorySchema(
+        story_id=story.id,
+        title=story.title,
+        summary=story.summary,
+        story_period=story.story_period,
+        updated_at=story.updated_at,
+    )
+
+
+async def _load_sub_story_rollups(
+    db: AsyncSession, story_ids: list[str]
+) -> dict[str, Any]:
+    """
+    Article, source and location totals of the stories among story_ids that
+    have sub-stories, including those sub-stories. Two round-trips however
+    many stories there are: one for the sub-stories, one for the totals.
+    """
+    sub_stories = await run_query(db, query_sub_stories, story_ids)
+    if not sub_stories:
+        return {}
+    parent_ids = list(dict.fromkeys(s.parent_story_id for s in sub_stories))
+    rows = await run_query(
+        db, query_story_rollups, parent_ids, [s.id for s in sub_stories]
+    )
+    return {row.id: row for row in rows}
+
+
 async def get_story_feed(
-    db: Session,
+    db: AsyncSession,
     period: FilterPeriod,
     region: FilterRegion | None = None,
     topic: FilterTopic | None = None,
     limit: int = 25,
     offset: int = 0,
+    cursor: str | None = None,
+    include_children: bool = False,
 ) -> PaginatedStoryCards:
     start, end = get_date_range(period, None, None)
 
+    after = parse_cursor_param(cursor)
+
     # Fetch one extra to determine has_more
-    stories_db = query_stories(
+    card_rows = await run_query(
         db,
+        query_story_cards,
         start,
         end,
         region=region,
         topic=topic,
         limit=limit + 1,
         offset=offset,
-        parent_only=True,
+        after=after,
     )
 
-    has_more = len(stories_db) > limit
-    stories_db = stories_db[:limit]
+    has_more = len(card_rows) > limit
+    card_rows = card_rows[:limit]
 
-    if not stories_db:
+    if not card_rows:
         return PaginatedStoryCards(
             stories=[], offset=offset, limit=limit, has_more=False
         )
 
-    story_ids = [story.id for story in stories_db]
-
-    article_rows = query_story_articles(db, story_ids)
-    locations_by_story = query_story_locations(db, story_ids)
-    persons_by_story = query_story_persons(db, story_ids)
-    topics_by_story = query_story_topics(db, story_ids)
-
-    # Get first image URL per story for the card
-    article_urls = list({row[4] for row in article_rows})
-    url_to_image = await fetch_og_images(article_urls)
-
-    # Calculate counts and get first image per story
-    article_counts: dict[str, int] = {}
-    sources_by_story: dict[str, set[str]] = {}
-    image_by_story: dict[str, str | None] = {}
+    rollups = (
+        await _load_sub_story_rollups(db, [row.id for row in card_rows])
+        if include_children
+        else {}
+    )
 
-    for story_id, _, _, source, url in article_rows:
-        article_counts[story_id] = article_counts.get(story_id, 0) + 1
-        sources_by_story.setdefault(story_id, set()).add(source)
-        if not image_by_story.get(story_id):
-            img = url_to_image.get(url)
-            if img:
-                image_by_story[story_id] = img
+    live = await _live_images(
+        [
+            row.image_source_url
+            for row in card_rows
+            if not row.image_url and row.image_source_url
+        ],
+        FEED_IMAGE_BUDGET,
+    )
 
     cards: list[StoryCard] = []
-    for story in stories_db:
+    for row in card_rows:
+        totals = rollups.get(row.id, row)
         cards.append(
             StoryCard(
-                story_id=story.id,
-                title=story.title,
-                topics=topics_by_story.get(story.id, []),
+                story_id=row.id,
+                title=row.title,
+                topics=row.topics or [],
                 locations=[
-                    ArticleLocationSchema(**loc)
-                    for loc in locations_by_story.get(story.id, [])
+                    ArticleLocationSchema.model_construct(**loc)
+                    for loc in totals.locations or []
                 ],
                 persons=[
-                    StoryPersonSchema(**person)
-                    for person in persons_by_story.get(story.id, [])
+                    StoryPersonSchema.model_construct(**person)
+                    for person in row.persons or []
                 ],
-                article_count=article_counts.get(story.id, 0),
-                sources_count=len(sources_by_story.get(story.id, set())),
-                story_period=story.story_period.isoformat(),
-                updated_at=story.updated_at.isoformat(),
-                image_url=image_by_story.get(story.id),
+                article_count=totals.article_count,
+                sources_count=totals.sources_count,
+                story_period=row.story_period.isoformat(),
+                updated_at=row.updated_at.isoformat(),
+                image_url=row.image_url or live.get(row.image_source_url),
             )
         )
 
+    last = card_rows[-1]
     return PaginatedStoryCards(
         stories=cards,
         offset=offset,
         limit=limit,
         has_more=has_more,
+        next_cursor=encode_cursor(last.story_period, last.id) if has_more else None,
     )
 
 
 async def get_stories_by_entity(
-    db: Session, qid: str, limit: int = 10, offset: int = 0
+    db: AsyncSession, qid: str, limit: int = 10, offset: int = 0
 ) -> PaginatedStoryCards:
-    stories_db = query_stories_by_entity_qid(db, qid, limit=limit + 1, offset=offset)
+    stories_db = await run_query(
+        db, query_stories_by_entity_qid, qid, limit=limit + 1, offset=offset
+    )
 
     has_more = len(stories_db) > limit
     stories_db = stories_db[:limit]
@@ -257,32 +542,28 @@ async def get_stories_by_entity(
         )
 
     story_ids = [s.id for s in stories_db]
-    article_rows = query_story_articles(db, story_ids)
-    locations_by_story = query_story_locations(db, story_ids)
-    topics_by_story = query_story_topics(db, story_ids)
+    enrichment = await _enrich_stories(
+        story_ids, FEED_IMAGE_BUDGET, include_persons=False
+    )
 
     article_counts: dict[str, int] = {}
     sources_by_story: dict[str, set[str]] = {}
     image_by_story: dict[str, str | None] = {}
 
-    article_urls = list({row[4] for row in article_rows})
-    url_to_image = await fetch_og_images(article_urls)
-
-    for story_id, _, _, source, url in article_rows:
+    for story_id, _, _, source, _, image_url in enrichment.article_rows:
         article_counts[story_id] = article_counts.get(story_id, 0) + 1
         sources_by_story.setdefault(story_id, set()).add(source)
-        if not image_by_story.get(story_id):
-            img = url_to_image.get(url)
-            if img:
-                image_by_story[story_id] = img
+        if image_url and not image_by_story.get(story_id):
+            image_by_story[story_id] = image_url
 
     cards = [
         StoryCard(
             story_id=s.id,
             title=s.title,
-            topics=topics_by_story.get(s.id, []),
+            topics=enrichment.topics_by_story.get(s.id, []),
             locations=[
-                ArticleLocationSchema(**loc) for loc in locations_by_story.get(s.id, [])
+                ArticleLocationSchema.model_construct(**loc)
+                for loc in enrichment.locations_by_story.get(s.id, [])
             ],
             persons=[],
             article_count=article_counts.get(s.id, 0),
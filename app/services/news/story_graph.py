@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.queries.news.stories_queries import query_story_edges
+
+logger = logging.getLogger(__name__)
+
+
+class StoryGraphIndex:
+    """
+    In-memory undirected adjacency index of story_edges for related-story
+    lookups. The first lookup loads every edge. After that, edges touching
+    stories updated since the last load are merged in every refresh_interval
+    seconds, and the whole index is rebuilt every rebuild_interval seconds
+    to drop removed edges.
+    """
+
+    def __init__(
+        self, refresh_interval: float = 60.0, rebuild_interval: float = 3600.0
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self._adjacency: dict[str, set[str]] = {}
+        self._loaded_at: datetime | None = None
+        self._refreshed_at = 0.0
+        self._built_at = 0.0
+        # Guards the published index; loads happen outside it under _load_lock,
+        # which is only ever tried without blocking
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def related(
+        self, db: Session, story_id: str, max_depth: int, max_results: int
+    ) -> list[str] | None:
+        """
+        Breadth-first walk from story_id, nearest stories first. None while
+        another caller is still loading the index for the first time; the
+        caller then queries the graph instead.
+        """
+        adjacency = self._current(db)
+        if adjacency is None:
+            return None
+        visited = {story_id}
+        result: list[str] = []
+        frontier = deque([(story_id, 0)])
+        while frontier and len(result) < max_results:
+            current, depth = frontier.popleft()
+            if depth == max_depth:
+                continue
+            for neighbour in adjacency.get(current, ()):
+                if neighbour in visited:
+                    continue
+                visited.add(neighbour)
+                result.append(neighbour)
+                if len(result) == max_results:
+                    break
+                frontier.append((neighbour, depth + 1))
+        return result
+
+    def _current(self, db: Session) -> dict[str, set[str]] | None:
+        """
+        The adjacency to walk, loading or refreshing it first when due. A
+        published adjacency is never mutated, so walks read it without the
+        lock. Nothing here waits on another caller's load: lookups can run as
+        greenlets on the event loop thread (AsyncSession.run_sync), where
+        blocking would stall the very load being waited on. While one caller
+        loads, the others walk the previous copy, or get None before the
+        first load has finished.
+        """
+        with self._lock:
+            due = self._due(time.monotonic())
+        if due and self._load_lock.acquire(blocking=False):
+            try:
+                now = time.monotonic()
+                with self._lock:
+                    due = self._due(now)
+                if due == "rebuild":
+                    self._rebuild(db, now)
+                elif due == "refresh":
+                    self._refresh(db, now)
+            finally:
+                self._load_lock.release()
+        with self._lock:
+            return None if self._loaded_at is None else self._adjacency
+
+    def _due(self, now: float) -> str | None:
+        if self._loaded_at is None or now - self._built_at >= self.rebuild_interval:
+            return "rebuild"
+        if now - self._refreshed_at >= self.refresh_interval:
+            return "refresh"
+        return None
+
+    def _rebuild(self, db: Session, now: float) -> None:
+        loaded_at = datetime.now()
+        adjacency: dict[str, set[str]] = {}
+        for a, b in query_story_edges(db):
+            adjacency.setdefault(a, set()).add(b)
+            adjacency.setdefault(b, set()).add(a)
+        with self._lock:
+            self._adjacency = adjacency
+            self._loaded_at = loaded_at
+            self._built_at = self._refreshed_at = now
+        logger.info("Loaded story graph with %d stories", len(adjacency))
+
+    def _refresh(self, db: Session, now: float) -> None:
+        assert self._loaded_at is not None
+        loaded_at = datetime.now()
+        # Overlap the window so edges committed during the last load aren't missed
+        since = self._loaded_at - timedelta(seconds=self.refresh_interval)
+        edges = query_story_edges(db, updated_since=since)
+        # Copy the index and each set touched, since walks may be reading it
+        adjacency = dict(self._adjacency)
+        copied: set[str] = set()
+        for a, b in edges:
+            for story, neighbour in ((a, b), (b, a)):
+                if story not in copied:
+                    adjacency[story] = set(adjacency.get(story, ()))
+                    copied.add(story)
+                adjacency[story].add(neighbour)
+        with self._lock:
+            self._adjacency = adjacency
+            self._loaded_at = loaded_at
+            self._refreshed_at = now
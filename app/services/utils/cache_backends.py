@@ -0,0 +1,237 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+# Returned by CacheBackend.get on a miss, so a cached None stays distinguishable
+MISSING: Any = object()
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Any: ...
+
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    # For callers on the event loop: backends doing I/O run it off the loop
+    async def get_async(self, key: str) -> Any: ...
+
+    async def set_async(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryCache:
+    """Thread-safe in-process cache with per-entry TTL and LRU eviction."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_async(self, key: str) -> Any:
+        return self.get(key)
+
+    async def set_async(self, key: str, value: Any, ttl: float) -> None:
+        self.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    Cache in a local SQLite file, shared by every worker process on the host
+    and kept across worker restarts, but only as long as the file is. Values
+    must be JSON-serialisable. The async methods run the queries in a worker
+    thread, as the file lock can block for up to `timeout`.
+    """
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 100_000) -> None:
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        with self._lock, self._conn:
+            # WAL lets readers in other workers proceed while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_entries_expires "
+                "ON cache_entries (namespace, expires_at)"
+            )
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            return MISSING
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), time.time() + ttl),
+            )
+            self._writes += 1
+            if self._writes % 500 == 0:
+                self._evict()
+
+    async def get_async(self, key: str) -> Any:
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: Any, ttl: float) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            )
+
+    def _evict(self) -> None:
+        """Drop expired rows, then the soonest-expiring rows above the cap."""
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+            (self.namespace, time.time()),
+        )
+        self._conn.execute(
+            """
+            DELETE FROM cache_entries
+            WHERE namespace = ? AND key IN (
+                SELECT key FROM cache_entries
+                WHERE namespace = ?
+                ORDER BY expires_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.namespace, self.namespace, self.max_entries),
+        )
+
+
+class TieredCache:
+    """
+    In-process cache in front of a shared backend. Reads hit memory first and
+    fall back to the shared tier; writes go to both. Local copies are kept for
+    at most local_ttl seconds, so values another worker writes to the shared
+    tier are picked up within that time.
+    """
+
+    def __init__(
+        self, local: CacheBackend, shared: CacheBackend, local_ttl: float = 60.0
+    ) -> None:
+        self.local = local
+        self.shared = shared
+        self.local_ttl = local_ttl
+
+    def get(self, key: str) -> Any:
+        value = self.local.get(key)
+        if value is not MISSING:
+            return value
+        value = self.shared.get(key)
+        if value is not MISSING:
+            self.local.set(key, value, self.local_ttl)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.local.set(key, value, min(ttl, self.local_ttl))
+        self.shared.set(key, value, ttl)
+
+    async def get_async(self, key: str) -> Any:
+        value = await self.local.get_async(key)
+        if value is not MISSING:
+            return value
+        value = await self.shared.get_async(key)
+        if value is not MISSING:
+            self.local.set(key, value, self.local_ttl)
+        return value
+
+    async def set_async(self, key: str, value: Any, ttl: float) -> None:
+        await self.local.set_async(key, value, min(ttl, self.local_ttl))
+        await self.shared.set_async(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.shared.clear()
+
+
+def build_cache(
+    namespace: str, max_entries: int, local_ttl: float = 60.0
+) -> CacheBackend:
+    """
+    Build the cache for a namespace from CACHE_BACKEND: `memory` keeps entries
+    per process; `sqlite` (default) adds a tier at CACHE_DB_PATH shared by the
+    workers on the host. The default path is inside the container, so it lasts
+    until the container is replaced; point it at a mounted volume to keep the
+    cache across deploys.
+    """
+    backend = os.environ.get("CACHE_BACKEND", "sqlite")
+    local = MemoryCache(max_entries=max_entries)
+    if backend == "memory":
+        return local
+    if backend != "sqlite":
+        raise ValueError(f"Unsupported cache backend: {backend}")
+    path = os.environ.get("CACHE_DB_PATH", "/tmp/context-api-cache.sqlite3")
+    return TieredCache(
+        local, SQLiteCache(path, namespace, max_entries=max_entries), local_ttl
+    )
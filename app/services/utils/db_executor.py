@@ -0,0 +1,27 @@
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Sized to the SQLAlchemy connection pool: threads beyond that would only
+# queue on pool checkout while holding a worker.
+DB_THREADPOOL_SIZE = int(os.environ.get("DB_THREADPOOL_SIZE", "10"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=DB_THREADPOOL_SIZE, thread_name_prefix="db-worker"
+)
+
+
+async def run_db(fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """
+    Run blocking database work on the bounded DB thread pool.
+    Keeps synchronous Session calls off the event loop so a slow query
+    only occupies a worker thread instead of stalling every request.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(fn, *args, **kwargs))
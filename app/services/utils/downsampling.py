@@ -0,0 +1,38 @@
+import numpy as np
+import numpy.typing as npt
+
+
+def lttb(
+    x: npt.NDArray[np.float64], y: npt.NDArray[np.float64], threshold: int
+) -> npt.NDArray[np.intp]:
+    """
+    Largest-Triangle-Three-Buckets: indices of at most `threshold` points
+    that keep the visual shape of the (x, y) series. x must be sorted and y
+    free of NaN. The first and last points are always kept.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Interior points split into threshold - 2 buckets of near-equal size
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # The next bucket's mean stands in for the not-yet-chosen next point
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[next_lo:next_hi].mean()
+        next_y = y[next_lo:next_hi].mean()
+
+        px, py = x[previous], y[previous]
+        areas = np.abs(
+            (px - next_x) * (y[lo:hi] - py) - (px - x[lo:hi]) * (next_y - py)
+        )
+        previous = lo + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
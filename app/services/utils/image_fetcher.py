@@ -1,49 +1,162 @@
 import asyncio
+import os
 import re
-import time
+from urllib.parse import urlsplit
 
 import httpx
 
-_cache: dict[str, tuple[str | None, float]] = {}
-_CACHE_TTL = 3600  # 1 hour
+from app.services.utils.cache_backends import MISSING, build_cache
 
+_CACHE_TTL = 24 * 3600  # og:image tags rarely change once published
+_NEGATIVE_CACHE_TTL = 600  # retry failed fetches after 10 minutes
+_CACHE_MAX_ENTRIES = 50_000
 
-async def fetch_og_image(url: str, client: httpx.AsyncClient) -> str | None:
-    """Fetch the og:image meta tag from a URL."""
-    now = time.time()
-    if url in _cache:
-        cached_value, cached_at = _cache[url]
-        if now - cached_at < _CACHE_TTL:
-            return cached_value
+_MAX_CONCURRENCY = int(os.environ.get("OG_IMAGE_MAX_CONCURRENCY", "20"))
+_MAX_PER_HOST = int(os.environ.get("OG_IMAGE_MAX_PER_HOST", "4"))
+_MAX_HEAD_BYTES = 256 * 1024  # og:image lives in <head>; stop reading past this
+_TIMEOUT = httpx.Timeout(5.0, connect=3.0)
+
+_OG_IMAGE_PATTERNS = (
+    re.compile(
+        r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']',
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:image["\']',
+        re.IGNORECASE,
+    ),
+)
+_HEAD_END = b"</head>"
+
+_cache = build_cache("og_images", max_entries=_CACHE_MAX_ENTRIES)
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=_MAX_CONCURRENCY,
+            max_keepalive_connections=_MAX_CONCURRENCY,
+        ),
+    )
+
+
+class _FetcherState:
+    """
+    Client, limits and in-flight fetches for one event loop. httpx and
+    asyncio primitives are tied to the loop that created them, so a new loop
+    (a job's asyncio.run, a test) gets fresh state.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.client = _new_client()
+        self.semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+        self.host_semaphores: dict[str, asyncio.Semaphore] = {}
+        self.inflight: dict[str, asyncio.Task[str | None]] = {}
+
+    def host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).hostname or ""
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(_MAX_PER_HOST)
+        return self.host_semaphores[host]
+
+
+_state: _FetcherState | None = None
+
+
+def _get_state() -> _FetcherState:
+    global _state
+    loop = asyncio.get_running_loop()
+    if _state is None or _state.loop is not loop:
+        _state = _FetcherState(loop)
+    return _state
 
+
+async def close_client() -> None:
+    """Close the shared client; called on application shutdown."""
+    global _state
+    if _state is not None:
+        state, _state = _state, None
+        await state.client.aclose()
+
+
+def _parse_og_image(html: str) -> str | None:
+    for pattern in _OG_IMAGE_PATTERNS:
+        match = pattern.search(html)
+        if match:
+            return match.group(1)
+    return None
+
+
+async def _read_head(response: httpx.Response) -> str:
+    """Read the body up to </head> or _MAX_HEAD_BYTES, whichever comes first."""
+    body = bytearray()
+    async for chunk in response.aiter_bytes():
+        # Overlap the previous chunk so a tag split across chunks still matches
+        search_from = max(0, len(body) - len(_HEAD_END))
+        body.extend(chunk)
+        end = body[search_from:].lower().find(_HEAD_END)
+        if end != -1:
+            del body[search_from + end :]
+            break
+        if len(body) >= _MAX_HEAD_BYTES:
+            del body[_MAX_HEAD_BYTES:]
+            break
+    return body.decode(response.encoding or "utf-8", errors="replace")
+
+
+async def _fetch_uncached(url: str, state: _FetcherState) -> str | None:
     try:
-        response = await client.get(url, timeout=5.0, follow_redirects=True)
-        response.raise_for_status()
-        html = response.text
-
-        match = re.search(
-            r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']',
-            html,
-            re.IGNORECASE,
-        )
-        if not match:
-            match = re.search(
-                r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:image["\']',
-                html,
-                re.IGNORECASE,
-            )
-
-        image_url = match.group(1) if match else None
-        _cache[url] = (image_url, now)
+        async with state.semaphore, state.host_semaphore(url):
+            async with state.client.stream("GET", url) as response:
+                response.raise_for_status()
+                head = await _read_head(response)
+        image_url = _parse_og_image(head)
+        await _cache.set_async(url, image_url, _CACHE_TTL)
         return image_url
     except Exception:
-        _cache[url] = (None, now)
+        await _cache.set_async(url, None, _NEGATIVE_CACHE_TTL)
         return None
 
 
-async def fetch_og_images(urls: list[str]) -> dict[str, str | None]:
-    """Fetch og:image for multiple URLs in parallel."""
-    async with httpx.AsyncClient() as client:
-        tasks = [fetch_og_image(url, client) for url in urls]
-        results = await asyncio.gather(*tasks)
-    return dict(zip(urls, results, strict=False))
+async def fetch_og_image(url: str) -> str | None:
+    """Fetch the og:image meta tag from a URL."""
+    cached = await _cache.get_async(url)
+    if cached is not MISSING:
+        return cached  # type: ignore[no-any-return]
+
+    # Concurrent callers for the same URL share one fetch
+    state = _get_state()
+    task = state.inflight.get(url)
+    if task is None:
+        task = asyncio.create_task(_fetch_uncached(url, state))
+        state.inflight[url] = task
+        task.add_done_callback(lambda _: state.inflight.pop(url, None))
+    # Shielded so one caller giving up doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
+async def fetch_og_images(
+    urls: list[str], budget: float | None = None
+) -> dict[str, str | None]:
+    """
+    Fetch og:image for multiple URLs in parallel. With a budget in seconds,
+    return once it runs out: URLs still pending map to None, and their
+    fetches keep running in the background to warm the cache.
+    """
+    if budget is None:
+        results = await asyncio.gather(*(fetch_og_image(url) for url in urls))
+        return dict(zip(urls, results, strict=False))
+
+    if not urls:
+        return {}
+    tasks = {url: asyncio.create_task(fetch_og_image(url)) for url in urls}
+    _, pending = await asyncio.wait(tasks.values(), timeout=budget)
+    for task in pending:
+        # Only the waiter is cancelled; the shared fetch behind it is shielded
+        task.cancel()
+    return {
+        url: None if task in pending else task.result() for url, task in tasks.items()
+    }
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.services.utils.cache_backends import MISSING, CacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+class StaleWhileRevalidateCache:
+    """
+    Caches computed values in a CacheBackend. Once a value is older than its
+    ttl it is still served, for up to max_stale more seconds, while a single
+    background task per key recomputes it. Only a cold miss waits on the
+    computation, and concurrent misses share one. Values must be
+    JSON-serialisable when the backend has a shared tier.
+    """
+
+    def __init__(self, backend: CacheBackend, max_stale: float = 3600.0) -> None:
+        self.backend = backend
+        self.max_stale = max_stale
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+
+    async def get(
+        self, key: str, ttl: float, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        entry = await self.backend.get_async(key)
+        if entry is not MISSING:
+            if time.time() - entry["computed_at"] >= ttl:
+                self._refresh(key, ttl, compute)
+            return entry["value"]
+        return await asyncio.shield(self._refresh(key, ttl, compute))
+
+    def _refresh(
+        self, key: str, ttl: float, compute: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task[Any]:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute_and_store(key, ttl, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        return task
+
+    async def _compute_and_store(
+        self, key: str, ttl: float, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = await compute()
+        await self.backend.set_async(
+            key, {"computed_at": time.time(), "value": value}, ttl + self.max_stale
+        )
+        return value
+
+    def _on_done(self, key: str, task: asyncio.Task[Any]) -> None:
+        self._inflight.pop(key, None)
+        # A failed background refresh keeps serving the stale value
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Refreshing %s failed", key, exc_info=task.exception())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Compare request latency under mixed load with DB work inline vs on run_db.
+
+Simulates a uvicorn worker serving a mix of slow story-feed requests and fast
+story-detail requests. Each request performs blocking "DB" work (time.sleep
+standing in for synchronous Session round-trips) followed by a short awaited
+image-fetch phase that stays on the event loop.
+
+Usage:
+    poetry run python scripts/benchmarks/db_offload.py --requests 400
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.services.utils.db_executor import run_db
+
+
+def _blocking_db_phase(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def _request(seconds: float, offload: bool) -> float:
+    started = time.perf_counter()
+    if offload:
+        await run_db(_blocking_db_phase, seconds)
+    else:
+        _blocking_db_phase(seconds)
+    await asyncio.sleep(0.005)  # og:image fetch stays on the loop
+    return time.perf_counter() - started
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run(
+    total: int, slow_ratio: float, slow_s: float, fast_s: float, offload: bool
+) -> dict[str, list[float]]:
+    rng = random.Random(42)
+    kinds = ["slow" if rng.random() < slow_ratio else "fast" for _ in range(total)]
+
+    async def _one(kind: str) -> tuple[str, float]:
+        # Stagger arrivals so requests overlap like real traffic
+        await asyncio.sleep(rng.random() * 0.5)
+        latency = await _request(slow_s if kind == "slow" else fast_s, offload)
+        return kind, latency
+
+    results = await asyncio.gather(*(_one(kind) for kind in kinds))
+    latencies: dict[str, list[float]] = {"slow": [], "fast": []}
+    for kind, latency in results:
+        latencies[kind].append(latency)
+    return latencies
+
+
+def _report(label: str, latencies: dict[str, list[float]]) -> None:
+    print(f"\n{label}")
+    for kind, values in latencies.items():
+        if not values:
+            continue
+        print(
+            f"  {kind:<5} n={len(values):<4} "
+            f"p50={statistics.median(values) * 1000:8.1f}ms "
+            f"p99={_percentile(values, 99) * 1000:8.1f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--slow-ratio", type=float, default=0.1)
+    parser.add_argument("--slow-ms", type=float, default=150.0)
+    parser.add_argument("--fast-ms", type=float, default=3.0)
+    args = parser.parse_args()
+
+    for label, offload in (("before: DB inline", False), ("after: run_db", True)):
+        latencies = asyncio.run(
+            _run(
+                args.requests,
+                args.slow_ratio,
+                args.slow_ms / 1000,
+                args.fast_ms / 1000,
+                offload,
+            )
+        )
+        _report(label, latencies)
+
+
+if __name__ == "__main__":
+    main()
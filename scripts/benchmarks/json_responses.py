@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Compare JSON encoding paths for representative response payloads.
+
+Times, per payload, the three ways a route result can become response bytes:
+
+- stock:  FastAPI validates against response_model, dumps to JSON-able Python,
+          then encodes with json.dumps (JSONResponse)
+- orjson: the same validate-and-dump step, encoded with orjson (ORJSONResponse,
+          the app default)
+- direct: model_response(), one pydantic-core pass over the built models
+
+Payloads are a 100-card PaginatedStoryCards with nested locations and persons,
+and a list[TSSeriesSchema] of 20 series with 120 monthly datapoints each.
+
+Usage:
+    poetry run python scripts/benchmarks/json_responses.py --repeat 200
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from datetime import date
+from functools import partial
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.responses import ModelJSONResponse, ORJSONResponse
+from app.schemas.data import (
+    TSDatapointSchema,
+    TSEntitySchema,
+    TSIndicatorSchema,
+    TSSeriesSchema,
+    TSSourceSchema,
+)
+from app.schemas.news import (
+    ArticleLocationSchema,
+    PaginatedStoryCards,
+    StoryCard,
+    StoryPersonSchema,
+)
+
+
+def _story_feed(cards: int) -> PaginatedStoryCards:
+    return PaginatedStoryCards(
+        stories=[
+            StoryCard(
+                story_id=f"story-{i}",
+                title=f"Story headline number {i} about events somewhere",
+                topics=["politics", "economy", "conflict"],
+                locations=[
+                    ArticleLocationSchema(
+                        wikidata_qid=f"Q{i}{j}",
+                        name=f"Location {j}",
+                        location_type="city",
+                        country_code="GB",
+                        latitude=51.5 + j,
+                        longitude=-0.12 - j,
+                    )
+                    for j in range(4)
+                ],
+                persons=[
+                    StoryPersonSchema(
+                        wikidata_qid=f"Q9{i}{j}",
+                        name=f"Person {j}",
+                        description="Politician",
+                        nationalities=["United Kingdom"],
+                        image_url=f"https://img.example.com/{i}/{j}.jpg",
+                    )
+                    for j in range(3)
+                ],
+                article_count=12,
+                sources_count=7,
+                story_period="2025-01-01T00:00:00",
+                updated_at="2025-01-01T12:00:00",
+                image_url=f"https://img.example.com/{i}.jpg",
+            )
+            for i in range(cards)
+        ],
+        offset=0,
+        limit=cards,
+        has_more=True,
+        next_cursor="eyJhIjoxfQ",
+    )
+
+
+def _series(count: int, points: int) -> list[TSSeriesSchema]:
+    source = TSSourceSchema(id=1, name="worldbank", display_name="World Bank")
+    return [
+        TSSeriesSchema(
+            indicator=TSIndicatorSchema(
+                id=f"indicator-{i}",
+                name=f"Indicator {i}",
+                unit="USD",
+                frequency="monthly",
+                source=source,
+            ),
+            entity=TSEntitySchema(
+                id="GBR", name="United Kingdom", entity_type="country"
+            ),
+            datapoints=[
+                TSDatapointSchema(
+                    date=date(2015 + n // 12, n % 12 + 1, 1), value=n * 1.25
+                )
+                for n in range(points)
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+def _stock(adapter: TypeAdapter[Any], payload: Any) -> bytes:
+    value = adapter.validate_python(payload, from_attributes=True)
+    return JSONResponse(adapter.dump_python(value, mode="json")).body
+
+
+def _orjson(adapter: TypeAdapter[Any], payload: Any) -> bytes:
+    value = adapter.validate_python(payload, from_attributes=True)
+    return ORJSONResponse(adapter.dump_python(value, mode="json")).body
+
+
+def _direct(adapter: TypeAdapter[Any], payload: Any) -> bytes:
+    return ModelJSONResponse(payload).body
+
+
+def _time(fn: Callable[[], bytes], repeat: int) -> list[float]:
+    fn()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--series", type=int, default=20)
+    parser.add_argument("--points", type=int, default=120)
+    args = parser.parse_args()
+
+    payloads: list[tuple[str, TypeAdapter[Any], Any]] = [
+        (
+            f"PaginatedStoryCards ({args.cards} cards)",
+            TypeAdapter(PaginatedStoryCards),
+            _story_feed(args.cards),
+        ),
+        (
+            f"list[TSSeriesSchema] ({args.series}x{args.points} points)",
+            TypeAdapter(list[TSSeriesSchema]),
+            _series(args.series, args.points),
+        ),
+    ]
+
+    for label, adapter, payload in payloads:
+        size = len(_direct(adapter, payload))
+        print(f"\n{label}, {size / 1024:.0f} KiB")
+        for name, encode in (
+            ("stock", _stock),
+            ("orjson", _orjson),
+            ("direct", _direct),
+        ):
+            timings = _time(partial(encode, adapter, payload), args.repeat)
+            print(
+                f"  {name:<6} p50={statistics.median(timings) * 1000:7.2f}ms "
+                f"min={min(timings) * 1000:7.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
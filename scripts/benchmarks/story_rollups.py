@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Count database round-trips per news-feed page with sub-story rollups.
+
+Runs against the database in DATABASE_URL and counts the statements each
+page sends, for:
+
+- parents:   the feed as before, parent stories only
+- batched:   include_children=True, sub-stories and their totals fetched for
+             the whole page at once
+- per-story: the same totals looked up one parent story at a time, for scale
+
+The batched mode should stay at a fixed number of round-trips whatever the
+page size, while per-story grows with it. Live og:image fetches are disabled
+so only database time is measured.
+
+Usage:
+    poetry run python scripts/benchmarks/story_rollups.py --repeat 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+os.environ["FEED_IMAGE_BUDGET_SECONDS"] = "0"
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.db import async_engine, async_session_factory  # noqa: E402
+from app.queries.aio import run_query  # noqa: E402
+from app.queries.news.stories_queries import (  # noqa: E402
+    query_story_cards,
+    query_story_rollups,
+    query_sub_stories,
+)
+from app.schemas.enums import FilterPeriod  # noqa: E402
+from app.services.news.stories_service import get_story_feed  # noqa: E402
+from app.services.utils.date_utils import get_date_range  # noqa: E402
+
+_statements = 0
+
+
+def _count_statement(*_: Any) -> None:
+    global _statements
+    _statements += 1
+
+
+async def _parents(db: AsyncSession, period: FilterPeriod, limit: int) -> None:
+    await get_story_feed(db, period, limit=limit)
+
+
+async def _batched(db: AsyncSession, period: FilterPeriod, limit: int) -> None:
+    await get_story_feed(db, period, limit=limit, include_children=True)
+
+
+async def _per_story(db: AsyncSession, period: FilterPeriod, limit: int) -> None:
+    start, end = get_date_range(period, None, None)
+    cards = await run_query(db, query_story_cards, start, end, limit=limit)
+    for card in cards:
+        sub_stories = await run_query(db, query_sub_stories, [card.id])
+        if sub_stories:
+            await run_query(
+                db, query_story_rollups, [card.id], [s.id for s in sub_stories]
+            )
+
+
+async def _measure(
+    page: Callable[[AsyncSession, FilterPeriod, int], Awaitable[None]],
+    period: FilterPeriod,
+    limit: int,
+    repeat: int,
+) -> tuple[int, list[float]]:
+    global _statements
+    timings: list[float] = []
+    statements = 0
+    for _ in range(repeat):
+        async with async_session_factory() as db:
+            _statements = 0
+            started = time.perf_counter()
+            await page(db, period, limit)
+            timings.append(time.perf_counter() - started)
+            statements = _statements
+    return statements, timings
+
+
+async def _run(period: FilterPeriod, limits: list[int], repeat: int) -> None:
+    modes = (("parents", _parents), ("batched", _batched), ("per-story", _per_story))
+    print(f"{'limit':>5}  {'mode':<9}  {'round-trips':>11}  {'p50':>9}")
+    for limit in limits:
+        for label, page in modes:
+            statements, timings = await _measure(page, period, limit, repeat)
+            print(
+                f"{limit:>5}  {label:<9}  {statements:>11}  "
+                f"{statistics.median(timings) * 1000:7.1f}ms"
+            )
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--period", type=FilterPeriod, default=FilterPeriod.week, help="Feed period"
+    )
+    parser.add_argument("--limits", type=int, nargs="+", default=[10, 25, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _count_statement)
+    asyncio.run(_run(args.period, args.limits, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
+from datetime import datetime
 from unittest.mock import MagicMock, patch
 
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from app.queries.news.analytics_queries import query_top_entities
 from app.schemas.enums import FilterPeriod, FilterRegion, Interval
 from app.services.news.analytics_service import (
     get_top_locations,
@@ -53,3 +58,26 @@ class TestGetTopOrganizations:
             MagicMock(), FilterPeriod.today, region=FilterRegion.europe
         )
         assert mock_query.call_args.kwargs["region"] == FilterRegion.europe
+
+
+class TestQueryTopEntities:
+    def _sql(self, entity_type, region):
+        with patch.object(Query, "all", autospec=True, return_value=[]) as mock_all:
+            query_top_entities(
+                Session(),
+                entity_type,
+                region,
+                datetime(2025, 7, 1),
+                datetime(2025, 7, 8),
+                10,
+            )
+        query = mock_all.call_args.args[0]
+        return str(query.statement.compile(dialect=postgresql.dialect()))
+
+    def test_counts_only_locations_in_the_region(self):
+        sql = self._sql("location", FilterRegion.europe)
+        assert "kb_locations.country_code IN" in sql
+
+    def test_other_entity_types_not_filtered_by_location(self):
+        sql = self._sql("person", FilterRegion.europe)
+        assert "kb_locations.country_code IN" not in sql
@@ -1,9 +1,14 @@
+import json
 from datetime import datetime
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
-from app.schemas.enums import FilterPeriod
-from app.services.news.articles_service import get_article, list_articles
+from app.schemas.enums import FilterPeriod, FilterRegion
+from app.services.news.articles_service import (
+    export_articles,
+    get_article,
+    list_articles,
+)
 
 
 def _make_article(
@@ -70,6 +75,12 @@ class TestListArticles:
         assert len(result) == 1
         assert result[0].locations == []
 
+    @patch(f"{QUERIES}.query_article_locations", return_value={})
+    @patch(f"{QUERIES}.query_articles", return_value=[])
+    def test_passes_region_filter(self, mock_articles, _):
+        list_articles(MagicMock(), FilterPeriod.today, region=FilterRegion.europe)
+        assert mock_articles.call_args.kwargs["region"] == FilterRegion.europe
+
 
 class TestGetArticle:
     @patch(f"{QUERIES}.query_article_by_id", return_value=None)
@@ -87,3 +98,46 @@ class TestGetArticle:
         assert result is not None
         assert result.id == "art1"
         assert result.source == "BBC"
+
+
+class TestExportArticles:
+    @patch(f"{QUERIES}.get_session")
+    @patch(f"{QUERIES}.query_article_locations")
+    @patch(f"{QUERIES}.stream_articles")
+    def test_streams_articles_with_locations_per_batch(
+        self, mock_stream, mock_locations, mock_session
+    ):
+        mock_stream.return_value = iter(
+            [[_make_article(id="a1"), _make_article(id="a2")], [_make_article(id="a3")]]
+        )
+        mock_locations.side_effect = lambda db, ids: {
+            "a1": [
+                {
+                    "wikidata_qid": "Q84",
+                    "name": "London",
+                    "location_type": "city",
+                    "country_code": "GBR",
+                    "latitude": 51.5,
+                    "longitude": -0.12,
+                }
+            ]
+        }
+
+        chunks = list(export_articles(FilterPeriod.today))
+
+        assert len(chunks) == 2
+        assert [call.args[1] for call in mock_locations.call_args_list] == [
+            ["a1", "a2"],
+            ["a3"],
+        ]
+        lines = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        assert [line["id"] for line in lines] == ["a1", "a2", "a3"]
+        assert lines[0]["locations"][0]["name"] == "London"
+        assert lines[0]["published_at"] == "2025-07-15T10:00:00"
+
+    @patch(f"{QUERIES}.get_session")
+    @patch(f"{QUERIES}.query_article_locations", return_value={})
+    @patch(f"{QUERIES}.stream_articles", return_value=iter([]))
+    def test_passes_region_filter(self, mock_stream, mock_locations, mock_session):
+        list(export_articles(FilterPeriod.today, region=FilterRegion.asia))
+        assert mock_stream.call_args.kwargs["region"] == FilterRegion.asia
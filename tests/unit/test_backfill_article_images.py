@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.jobs.backfill_article_images import backfill_once
+
+JOB = "app.jobs.backfill_article_images"
+SINCE = datetime(2025, 7, 15)
+
+
+@contextmanager
+def _session(db):
+    yield db
+
+
+class TestBackfillOnce:
+    @patch(f"{JOB}.upsert_article_images")
+    @patch(f"{JOB}.fetch_og_images")
+    @patch(f"{JOB}.query_articles_missing_images", return_value=[])
+    @pytest.mark.asyncio
+    async def test_nothing_pending(self, mock_query, mock_fetch, mock_upsert):
+        db = MagicMock()
+        with patch(f"{JOB}.get_session", return_value=_session(db)):
+            assert await backfill_once(SINCE, batch_size=10) == 0
+
+        mock_fetch.assert_not_called()
+        mock_upsert.assert_not_called()
+        db.commit.assert_not_called()
+
+    @patch(f"{JOB}.upsert_article_images")
+    @patch(f"{JOB}.fetch_og_images")
+    @patch(f"{JOB}.query_articles_missing_images")
+    @pytest.mark.asyncio
+    async def test_stores_hits_and_misses(self, mock_query, mock_fetch, mock_upsert):
+        db = MagicMock()
+        mock_query.return_value = [("a1", "https://a.com/1"), ("a2", "https://b.com/2")]
+        mock_fetch.return_value = {
+            "https://a.com/1": "https://img.com/1.jpg",
+            "https://b.com/2": None,
+        }
+
+        with patch(f"{JOB}.get_session", return_value=_session(db)):
+            assert await backfill_once(SINCE, batch_size=10) == 2
+
+        mock_query.assert_called_once_with(db, SINCE, limit=10)
+        mock_upsert.assert_called_once_with(
+            db,
+            [
+                ("a1", "https://a.com/1", "https://img.com/1.jpg"),
+                ("a2", "https://b.com/2", None),
+            ],
+        )
+        db.commit.assert_called_once()
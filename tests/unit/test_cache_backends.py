@@ -0,0 +1,134 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services.utils.cache_backends import (
+    MISSING,
+    MemoryCache,
+    SQLiteCache,
+    TieredCache,
+    build_cache,
+)
+
+CLOCK = "app.services.utils.cache_backends.time.time"
+
+
+class TestMemoryCache:
+    def test_miss_returns_sentinel(self):
+        assert MemoryCache().get("absent") is MISSING
+
+    def test_cached_none_is_a_hit(self):
+        cache = MemoryCache()
+        cache.set("url", None, ttl=60)
+        assert cache.get("url") is None
+
+    def test_entry_expires_after_ttl(self):
+        cache = MemoryCache()
+        cache.set("url", "value", ttl=60)
+        with patch(CLOCK, return_value=time.time() + 61):
+            assert cache.get("url") is MISSING
+
+    def test_evicts_least_recently_used(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3, ttl=60)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is MISSING
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+
+class TestSQLiteCache:
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        SQLiteCache(path, "images").set("url", "https://img.com/a.jpg", ttl=60)
+
+        assert SQLiteCache(path, "images").get("url") == "https://img.com/a.jpg"
+
+    def test_namespaces_are_isolated(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        SQLiteCache(path, "images").set("key", "a", ttl=60)
+
+        assert SQLiteCache(path, "other").get("key") is MISSING
+
+    def test_entry_expires_after_ttl(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), "images")
+        cache.set("url", None, ttl=60)
+        assert cache.get("url") is None
+        with patch(CLOCK, return_value=time.time() + 61):
+            assert cache.get("url") is MISSING
+
+    def test_evicts_above_max_entries(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), "images", max_entries=3)
+        for i in range(5):
+            cache.set(f"k{i}", i, ttl=60 + i)
+        cache._evict()
+
+        remaining = [
+            k for k in (f"k{i}" for i in range(5)) if cache.get(k) is not MISSING
+        ]
+        assert remaining == ["k2", "k3", "k4"]
+
+    async def test_async_access_runs_off_the_event_loop(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), "images")
+
+        with patch(
+            "app.services.utils.cache_backends.asyncio.to_thread",
+            wraps=asyncio.to_thread,
+        ) as mock_to_thread:
+            await cache.set_async("url", "value", ttl=60)
+            assert await cache.get_async("url") == "value"
+
+        assert mock_to_thread.call_count == 2
+
+
+class TestTieredCache:
+    def test_shared_hit_populates_local(self, tmp_path):
+        shared = SQLiteCache(str(tmp_path / "cache.sqlite3"), "images")
+        shared.set("url", "value", ttl=60)
+        local = MemoryCache()
+
+        assert TieredCache(local, shared).get("url") == "value"
+        assert local.get("url") == "value"
+
+    def test_set_writes_both_tiers(self, tmp_path):
+        shared = SQLiteCache(str(tmp_path / "cache.sqlite3"), "images")
+        local = MemoryCache()
+        TieredCache(local, shared).set("url", "value", ttl=60)
+
+        assert local.get("url") == "value"
+        assert shared.get("url") == "value"
+
+    def test_local_copy_expires_before_shared_entry(self, tmp_path):
+        shared = SQLiteCache(str(tmp_path / "cache.sqlite3"), "landing")
+        ours = TieredCache(MemoryCache(), shared, local_ttl=5)
+        theirs = TieredCache(MemoryCache(), shared, local_ttl=5)
+        ours.set("today", "v1", ttl=3600)
+
+        # Another worker refreshes the entry in the shared tier
+        theirs.set("today", "v2", ttl=3600)
+
+        assert ours.get("today") == "v1"
+        with patch(CLOCK, return_value=time.time() + 6):
+            assert ours.get("today") == "v2"
+
+
+class TestBuildCache:
+    def test_memory_backend(self, monkeypatch):
+        monkeypatch.setenv("CACHE_BACKEND", "memory")
+        assert isinstance(build_cache("images", max_entries=10), MemoryCache)
+
+    def test_sqlite_backend(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+        monkeypatch.setenv("CACHE_DB_PATH", str(tmp_path / "cache.sqlite3"))
+        assert isinstance(build_cache("images", max_entries=10), TieredCache)
+
+    def test_unknown_backend_raises(self, monkeypatch):
+        monkeypatch.setenv("CACHE_BACKEND", "redis")
+        with pytest.raises(ValueError, match="Unsupported cache backend"):
+            build_cache("images", max_entries=10)
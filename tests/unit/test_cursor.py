@@ -0,0 +1,42 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from app.services.utils.cursor import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    def test_round_trip_string_id(self):
+        position = (datetime(2025, 7, 15, 12, 30), "story1")
+        assert decode_cursor(encode_cursor(*position)) == position
+
+    def test_round_trip_int_id_and_timezone(self):
+        position = (datetime(2025, 7, 15, 12, 30, tzinfo=UTC), 42)
+        assert decode_cursor(encode_cursor(*position), int) == position
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(datetime(2025, 7, 15), "a/b+c?")
+        assert cursor.replace("-", "").replace("_", "").isalnum()
+
+    @pytest.mark.parametrize(
+        "cursor",
+        ["not-a-cursor", "", "e30", encode_cursor(datetime(2025, 1, 1), 1)[:-4]],
+    )
+    def test_malformed_cursor_raises_value_error(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    @pytest.mark.parametrize("id", [{"$gt": ""}, ["a"], None, 1.5, True])
+    def test_non_string_id_raises_value_error(self, id):
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(datetime(2025, 1, 1), id))
+
+    def test_id_must_match_id_type(self):
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(datetime(2025, 1, 1), "42"), int)
+
+    def test_null_sort_value_only_decodes_when_nullable(self):
+        cursor = encode_cursor(None, 7)
+        assert decode_cursor(cursor, int, nullable=True) == (None, 7)
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, int)
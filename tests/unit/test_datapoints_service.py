@@ -0,0 +1,192 @@
+import json
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pydantic_core
+
+from app.responses import ORJSONResponse
+from app.schemas.enums import TSResolution
+from app.services.data.datapoints_service import (
+    export_datapoints,
+    get_datapoints,
+    get_datapoints_columnar,
+)
+
+QUERIES = "app.services.data.datapoints_service"
+
+
+def _row(indicator_id, entity_id, day, value):
+    return (indicator_id, entity_id, day, value)
+
+
+def _indicators(db, ids):
+    source = SimpleNamespace(id=1, name="wb", url=None)
+    return {
+        i: (SimpleNamespace(id=i, name=i.upper(), unit="%", frequency="A"), source)
+        for i in ids
+    }
+
+
+def _entities(db, ids):
+    return {e: SimpleNamespace(id=e, name=e, entity_type="country") for e in ids}
+
+
+class TestGetDatapoints:
+    @patch(f"{QUERIES}.query_datapoint_columns", return_value=[])
+    def test_returns_empty_list_without_rows(self, mock_columns):
+        assert get_datapoints(MagicMock(), ["gdp"]) == []
+
+    @patch(f"{QUERIES}.query_entities_by_ids", side_effect=_entities)
+    @patch(f"{QUERIES}.query_indicators_by_ids", side_effect=_indicators)
+    @patch(f"{QUERIES}.query_datapoint_columns")
+    def test_groups_rows_into_series(
+        self, mock_columns, mock_indicators, mock_entities
+    ):
+        mock_columns.return_value = [
+            _row("gdp", "GBR", date(2023, 1, 1), Decimal("1.5")),
+            _row("gdp", "GBR", date(2024, 1, 1), None),
+            _row("gdp", "FRA", date(2024, 1, 1), Decimal("2")),
+        ]
+
+        result = get_datapoints(MagicMock(), ["gdp"])
+
+        assert [(s.indicator.id, s.entity.id) for s in result] == [
+            ("gdp", "GBR"),
+            ("gdp", "FRA"),
+        ]
+        assert [(p.date, p.value) for p in result[0].datapoints] == [
+            (date(2023, 1, 1), 1.5),
+            (date(2024, 1, 1), None),
+        ]
+
+    @patch(f"{QUERIES}.query_entities_by_ids", side_effect=_entities)
+    @patch(f"{QUERIES}.query_indicators_by_ids", side_effect=_indicators)
+    @patch(f"{QUERIES}.query_datapoint_columns")
+    def test_decimal_values_serialise_as_numbers(
+        self, mock_columns, mock_indicators, mock_entities
+    ):
+        mock_columns.return_value = [
+            _row("gdp", "GBR", date(2024, 1, 1), Decimal("2.25"))
+        ]
+
+        result = get_datapoints(MagicMock(), ["gdp"])
+
+        body = json.loads(pydantic_core.to_json(result))
+        assert body[0]["datapoints"] == [{"date": "2024-01-01", "value": 2.25}]
+
+    @patch(f"{QUERIES}.query_entities_by_ids", side_effect=_entities)
+    @patch(f"{QUERIES}.query_indicators_by_ids", side_effect=_indicators)
+    @patch(f"{QUERIES}.query_datapoint_columns")
+    def test_max_points_downsamples_each_series(
+        self, mock_columns, mock_indicators, mock_entities
+    ):
+        days = [date(2000 + n // 12, n % 12 + 1, 1) for n in range(240)]
+        mock_columns.return_value = [
+            _row("gdp", "GBR", day, float(n)) for n, day in enumerate(days)
+        ] + [_row("gdp", "FRA", days[0], 1.0)]
+
+        result = get_datapoints(MagicMock(), ["gdp"], max_points=50)
+
+        gbr, fra = result
+        assert len(gbr.datapoints) == 50
+        assert gbr.datapoints[0].date == days[0]
+        assert gbr.datapoints[-1].date == days[-1]
+        assert len(fra.datapoints) == 1
+
+    @patch(f"{QUERIES}.query_datapoint_columns", return_value=[])
+    def test_passes_resolution_to_query(self, mock_columns):
+        get_datapoints(MagicMock(), ["gdp"], resolution=TSResolution.year)
+
+        assert mock_columns.call_args.kwargs["resolution"] == TSResolution.year
+
+
+class TestGetDatapointsColumnar:
+    @patch(f"{QUERIES}.query_datapoint_columns", return_value=[])
+    def test_returns_empty_list_without_rows(self, mock_columns):
+        assert get_datapoints_columnar(MagicMock(), ["gdp"]) == []
+
+    @patch(f"{QUERIES}.query_entities_by_ids", side_effect=_entities)
+    @patch(f"{QUERIES}.query_indicators_by_ids", side_effect=_indicators)
+    @patch(f"{QUERIES}.query_datapoint_columns")
+    def test_splits_sorted_rows_into_parallel_arrays(
+        self, mock_columns, mock_indicators, mock_entities
+    ):
+        mock_columns.return_value = [
+            ("cpi", "GBR", date(2024, 1, 1), Decimal("3")),
+            ("gdp", "FRA", date(2023, 1, 1), Decimal("1.5")),
+            ("gdp", "FRA", date(2024, 1, 1), None),
+            ("gdp", "GBR", date(2024, 1, 1), Decimal("2")),
+        ]
+
+        result = get_datapoints_columnar(MagicMock(), ["gdp", "cpi"])
+        body = json.loads(ORJSONResponse(result).body)
+
+        assert [(s["indicator"]["id"], s["entity"]["id"]) for s in body] == [
+            ("cpi", "GBR"),
+            ("gdp", "FRA"),
+            ("gdp", "GBR"),
+        ]
+        assert body[1]["dates"] == ["2023-01-01", "2024-01-01"]
+        assert body[1]["values"] == [1.5, None]
+        assert body[2]["values"] == [2.0]
+
+    @patch(f"{QUERIES}.query_entities_by_ids", return_value={})
+    @patch(f"{QUERIES}.query_indicators_by_ids", side_effect=_indicators)
+    @patch(f"{QUERIES}.query_datapoint_columns")
+    def test_skips_series_with_unknown_entity(
+        self, mock_columns, mock_indicators, mock_entities
+    ):
+        mock_columns.return_value = [("gdp", "XXX", date(2024, 1, 1), 1.0)]
+
+        assert get_datapoints_columnar(MagicMock(), ["gdp"]) == []
+
+
+class TestExportDatapoints:
+    @patch(f"{QUERIES}.get_session")
+    @patch(f"{QUERIES}.stream_datapoint_columns")
+    def test_yields_one_ndjson_chunk_per_batch(self, mock_stream, mock_session):
+        mock_stream.return_value = iter(
+            [
+                [_row("gdp", "GBR", date(2023, 1, 1), Decimal("1.5"))],
+                [
+                    _row("gdp", "GBR", date(2024, 1, 1), None),
+                    _row("gdp", "FRA", date(2024, 1, 1), 2.0),
+                ],
+            ]
+        )
+
+        chunks = list(export_datapoints(["gdp"]))
+
+        assert len(chunks) == 2
+        lines = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        assert lines == [
+            {
+                "indicator_id": "gdp",
+                "entity_id": "GBR",
+                "date": "2023-01-01",
+                "value": 1.5,
+            },
+            {
+                "indicator_id": "gdp",
+                "entity_id": "GBR",
+                "date": "2024-01-01",
+                "value": None,
+            },
+            {
+                "indicator_id": "gdp",
+                "entity_id": "FRA",
+                "date": "2024-01-01",
+                "value": 2.0,
+            },
+        ]
+
+    @patch(f"{QUERIES}.get_session")
+    @patch(f"{QUERIES}.stream_datapoint_columns", return_value=iter([]))
+    def test_session_is_opened_lazily_and_closed(self, mock_stream, mock_session):
+        lines = export_datapoints(["gdp"])
+        mock_session.assert_not_called()
+
+        assert list(lines) == []
+        mock_session.return_value.__exit__.assert_called_once()
@@ -0,0 +1,26 @@
+import threading
+
+import pytest
+
+from app.services.utils.db_executor import run_db
+
+
+class TestRunDb:
+    @pytest.mark.asyncio
+    async def test_returns_function_result(self):
+        result = await run_db(lambda a, b=0: a + b, 1, b=2)
+        assert result == 3
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop_thread(self):
+        loop_thread = threading.get_ident()
+        worker_thread = await run_db(threading.get_ident)
+        assert worker_thread != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_propagates_exceptions(self):
+        def boom():
+            raise ValueError("db error")
+
+        with pytest.raises(ValueError, match="db error"):
+            await run_db(boom)
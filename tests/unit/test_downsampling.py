@@ -0,0 +1,32 @@
+import numpy as np
+
+from app.services.utils.downsampling import lttb
+
+
+class TestLttb:
+    def test_short_series_is_kept_whole(self):
+        x = np.arange(10, dtype=np.float64)
+
+        assert lttb(x, x, 20).tolist() == list(range(10))
+
+    def test_returns_threshold_sorted_indices_with_endpoints(self):
+        x = np.arange(1000, dtype=np.float64)
+        y = np.sin(x / 50)
+
+        keep = lttb(x, y, 100)
+
+        assert len(keep) == 100
+        assert keep[0] == 0
+        assert keep[-1] == 999
+        assert np.all(np.diff(keep) > 0)
+
+    def test_keeps_spikes(self):
+        x = np.arange(500, dtype=np.float64)
+        y = np.zeros(500)
+        y[123] = 100.0
+        y[321] = -50.0
+
+        keep = lttb(x, y, 20)
+
+        assert 123 in keep
+        assert 321 in keep
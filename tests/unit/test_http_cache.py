@@ -0,0 +1,109 @@
+from datetime import datetime
+
+from fastapi import Depends, FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.http_cache import ETagMiddleware, cache_control, set_last_modified
+
+app = FastAPI()
+app.add_middleware(ETagMiddleware)
+state = {"value": "first"}
+
+
+@app.get("/cached", dependencies=[Depends(cache_control(s_maxage=60))])
+def cached() -> dict[str, str]:
+    return {"value": state["value"]}
+
+
+@app.get("/dated", dependencies=[Depends(cache_control())])
+def dated(response: Response) -> dict[str, str]:
+    set_last_modified(response, datetime(2025, 7, 15, 13, 0))
+    return {"value": "dated"}
+
+
+@app.get("/uncached")
+def uncached() -> dict[str, str]:
+    return {"value": "live"}
+
+
+@app.get("/stream", dependencies=[Depends(cache_control())])
+def stream() -> StreamingResponse:
+    return StreamingResponse(iter([b"a", b"b"]), media_type="text/plain")
+
+
+client = TestClient(app)
+
+
+class TestCacheControl:
+    def test_sets_public_cache_control(self):
+        response = client.get("/cached")
+        assert response.headers["cache-control"] == (
+            "public, max-age=0, s-maxage=60, stale-while-revalidate=300"
+        )
+
+    def test_routes_without_dependency_are_untouched(self):
+        response = client.get("/uncached")
+        assert "cache-control" not in response.headers
+        assert "etag" not in response.headers
+
+
+class TestETagMiddleware:
+    def setup_method(self):
+        state["value"] = "first"
+
+    def test_adds_strong_etag(self):
+        response = client.get("/cached")
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert response.json() == {"value": "first"}
+
+    def test_matching_if_none_match_returns_304(self):
+        etag = client.get("/cached").headers["etag"]
+
+        response = client.get("/cached", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert "cache-control" in response.headers
+        assert "content-length" not in response.headers
+
+    def test_changed_body_gets_new_etag(self):
+        etag = client.get("/cached").headers["etag"]
+        state["value"] = "second"
+
+        response = client.get("/cached", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json() == {"value": "second"}
+
+    def test_weak_and_listed_validators_match(self):
+        etag = client.get("/cached").headers["etag"]
+
+        response = client.get(
+            "/cached", headers={"If-None-Match": f'"other", W/{etag}'}
+        )
+
+        assert response.status_code == 304
+
+    def test_last_modified_and_if_modified_since(self):
+        response = client.get("/dated")
+        assert response.headers["last-modified"] == "Tue, 15 Jul 2025 13:00:00 GMT"
+
+        not_modified = client.get(
+            "/dated", headers={"If-Modified-Since": "Tue, 15 Jul 2025 14:00:00 GMT"}
+        )
+        modified = client.get(
+            "/dated", headers={"If-Modified-Since": "Tue, 15 Jul 2025 12:00:00 GMT"}
+        )
+
+        assert not_modified.status_code == 304
+        assert modified.status_code == 200
+
+    def test_streamed_responses_pass_through(self):
+        # Responses returned directly don't pick up dependency headers
+        response = client.get("/stream")
+        assert response.text == "ab"
+        assert "etag" not in response.headers
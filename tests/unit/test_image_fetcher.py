@@ -1,156 +1,284 @@
+import asyncio
 import time
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import patch
 
 import httpx
 import pytest
 
+from app.services.utils import image_fetcher
+from app.services.utils.cache_backends import MISSING, MemoryCache
 from app.services.utils.image_fetcher import (
-    _cache,
+    _CACHE_TTL,
+    _MAX_HEAD_BYTES,
+    _NEGATIVE_CACHE_TTL,
     fetch_og_image,
     fetch_og_images,
 )
 
 
 @pytest.fixture(autouse=True)
-def clear_cache():
-    _cache.clear()
-    yield
-    _cache.clear()
+def cache():
+    memory_cache = MemoryCache()
+    with patch.object(image_fetcher, "_cache", memory_cache):
+        yield memory_cache
+
+
+@pytest.fixture
+def serve():
+    """Route the shared client through a handler; returns the request log."""
+    requests: list[str] = []
+
+    def install(handler):
+        async def recording(request):
+            requests.append(str(request.url))
+            result = handler(request)
+            if asyncio.iscoroutine(result):
+                result = await result
+            return result
+
+        def new_client():
+            return httpx.AsyncClient(transport=httpx.MockTransport(recording))
+
+        patcher = patch.object(image_fetcher, "_new_client", new_client)
+        patcher.start()
+        return requests
+
+    with patch.object(image_fetcher, "_state", None):
+        yield install
+        patch.stopall()
+
+
+def _html(body: str):
+    return lambda request: httpx.Response(200, text=body)
 
 
 class TestFetchOgImage:
     @pytest.mark.asyncio
-    async def test_extracts_og_image_property_first(self):
-        html = '<html><head><meta property="og:image" content="https://img.com/photo.jpg"></head></html>'
-        client = AsyncMock(spec=httpx.AsyncClient)
-        response = MagicMock()
-        response.text = html
-        response.raise_for_status = MagicMock()
-        client.get.return_value = response
+    async def test_extracts_og_image_property_first(self, serve):
+        serve(
+            _html(
+                '<html><head><meta property="og:image" '
+                'content="https://img.com/photo.jpg"></head></html>'
+            )
+        )
 
-        result = await fetch_og_image("https://example.com/article", client)
+        result = await fetch_og_image("https://example.com/article")
         assert result == "https://img.com/photo.jpg"
 
     @pytest.mark.asyncio
-    async def test_extracts_og_image_content_first_order(self):
-        html = (
-            '<html><head><meta content="https://img.com/alt.jpg"'
-            ' property="og:image"></head></html>'
+    async def test_extracts_og_image_content_first_order(self, serve):
+        serve(
+            _html(
+                '<html><head><meta content="https://img.com/alt.jpg"'
+                ' property="og:image"></head></html>'
+            )
         )
-        client = AsyncMock(spec=httpx.AsyncClient)
-        response = MagicMock()
-        response.text = html
-        response.raise_for_status = MagicMock()
-        client.get.return_value = response
 
-        result = await fetch_og_image("https://example.com/article", client)
+        result = await fetch_og_image("https://example.com/article")
         assert result == "https://img.com/alt.jpg"
 
     @pytest.mark.asyncio
-    async def test_returns_none_when_no_og_image(self):
-        html = "<html><head><title>No image</title></head></html>"
-        client = AsyncMock(spec=httpx.AsyncClient)
-        response = MagicMock()
-        response.text = html
-        response.raise_for_status = MagicMock()
-        client.get.return_value = response
+    async def test_returns_none_when_no_og_image(self, serve):
+        serve(_html("<html><head><title>No image</title></head></html>"))
+
+        result = await fetch_og_image("https://example.com/article")
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_returns_none_on_http_error(self, serve):
+        serve(lambda request: httpx.Response(404))
 
-        result = await fetch_og_image("https://example.com/article", client)
+        result = await fetch_og_image("https://example.com/missing")
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_returns_none_on_http_error(self):
-        client = AsyncMock(spec=httpx.AsyncClient)
-        client.get.side_effect = httpx.HTTPStatusError(
-            "404", request=MagicMock(), response=MagicMock()
+    async def test_returns_none_on_connection_error(self, serve):
+        def refuse(request):
+            raise httpx.ConnectError("connection refused")
+
+        serve(refuse)
+
+        result = await fetch_og_image("https://example.com/down")
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_ignores_og_image_after_head(self, serve):
+        serve(
+            _html(
+                "<html><head><title>t</title></head><body>"
+                '<meta property="og:image" content="https://img.com/body.jpg">'
+                "</body></html>"
+            )
         )
 
-        result = await fetch_og_image("https://example.com/missing", client)
+        result = await fetch_og_image("https://example.com/article")
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_returns_none_on_connection_error(self):
-        client = AsyncMock(spec=httpx.AsyncClient)
-        client.get.side_effect = httpx.ConnectError("connection refused")
+    async def test_stops_streaming_at_head_end(self, serve):
+        chunks_sent = 0
+
+        async def body():
+            nonlocal chunks_sent
+            chunks_sent += 1
+            yield b'<head><meta property="og:image" content="https://img.com/s.jpg">'
+            chunks_sent += 1
+            yield b"</he"
+            chunks_sent += 1
+            yield b"ad><body>"
+            for _ in range(100):
+                chunks_sent += 1
+                yield b"x" * 1024
+
+        serve(lambda request: httpx.Response(200, content=body()))
+
+        result = await fetch_og_image("https://example.com/streamed")
+        assert result == "https://img.com/s.jpg"
+        assert chunks_sent == 3
+
+    @pytest.mark.asyncio
+    async def test_stops_streaming_at_byte_cap(self, serve):
+        chunks_sent = 0
+
+        async def body():
+            nonlocal chunks_sent
+            while True:
+                chunks_sent += 1
+                yield b"x" * 64 * 1024
+
+        serve(lambda request: httpx.Response(200, content=body()))
 
-        result = await fetch_og_image("https://example.com/down", client)
+        result = await fetch_og_image("https://example.com/huge")
         assert result is None
+        assert chunks_sent == _MAX_HEAD_BYTES // (64 * 1024)
 
     @pytest.mark.asyncio
-    async def test_uses_cache_on_second_call(self):
-        html = '<meta property="og:image" content="https://img.com/cached.jpg">'
-        client = AsyncMock(spec=httpx.AsyncClient)
-        response = MagicMock()
-        response.text = html
-        response.raise_for_status = MagicMock()
-        client.get.return_value = response
+    async def test_uses_cache_on_second_call(self, serve):
+        requests = serve(
+            _html('<meta property="og:image" content="https://img.com/cached.jpg">')
+        )
 
         url = "https://example.com/cached"
-        await fetch_og_image(url, client)
-        assert client.get.call_count == 1
+        await fetch_og_image(url)
+        assert len(requests) == 1
 
-        result = await fetch_og_image(url, client)
+        result = await fetch_og_image(url)
         assert result == "https://img.com/cached.jpg"
-        assert client.get.call_count == 1  # not called again
+        assert len(requests) == 1  # not called again
 
     @pytest.mark.asyncio
-    async def test_cache_expires_after_ttl(self):
-        html = '<meta property="og:image" content="https://img.com/old.jpg">'
-        client = AsyncMock(spec=httpx.AsyncClient)
-        response = MagicMock()
-        response.text = html
-        response.raise_for_status = MagicMock()
-        client.get.return_value = response
+    async def test_cache_expires_after_ttl(self, serve):
+        requests = serve(
+            _html('<meta property="og:image" content="https://img.com/old.jpg">')
+        )
 
         url = "https://example.com/expiry"
-        await fetch_og_image(url, client)
-
-        # Expire the cache entry
-        _cache[url] = (_cache[url][0], time.time() - 3601)
+        await fetch_og_image(url)
 
-        await fetch_og_image(url, client)
-        assert client.get.call_count == 2
+        # Jump past the positive TTL
+        later = time.time() + _CACHE_TTL + 1
+        with patch("app.services.utils.cache_backends.time.time", return_value=later):
+            await fetch_og_image(url)
+        assert len(requests) == 2
 
     @pytest.mark.asyncio
-    async def test_caches_none_on_error(self):
-        client = AsyncMock(spec=httpx.AsyncClient)
-        client.get.side_effect = Exception("boom")
+    async def test_caches_none_on_error(self, serve, cache):
+        serve(lambda request: httpx.Response(500))
 
         url = "https://example.com/error"
-        await fetch_og_image(url, client)
-        assert url in _cache
-        assert _cache[url][0] is None
+        await fetch_og_image(url)
+        assert cache.get(url) is None
+
+    @pytest.mark.asyncio
+    async def test_failures_use_shorter_negative_ttl(self, serve, cache):
+        serve(lambda request: httpx.Response(503))
+
+        url = "https://example.com/flaky"
+        await fetch_og_image(url)
+
+        later = time.time() + _NEGATIVE_CACHE_TTL + 1
+        with patch("app.services.utils.cache_backends.time.time", return_value=later):
+            assert cache.get(url) is MISSING
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_fetch(self, serve):
+        async def slow(request):
+            await asyncio.sleep(0.02)
+            return httpx.Response(
+                200, text='<meta property="og:image" content="https://img.com/c.jpg">'
+            )
+
+        requests = serve(slow)
+
+        url = "https://example.com/popular"
+        results = await asyncio.gather(*(fetch_og_image(url) for _ in range(5)))
+
+        assert results == ["https://img.com/c.jpg"] * 5
+        assert len(requests) == 1
 
 
 class TestFetchOgImages:
     @pytest.mark.asyncio
-    async def test_fetches_multiple_urls(self):
-        html_a = '<meta property="og:image" content="https://img.com/a.jpg">'
-        html_b = '<meta property="og:image" content="https://img.com/b.jpg">'
+    async def test_fetches_multiple_urls(self, serve):
+        pages = {
+            "https://a.com/": '<meta property="og:image" content="https://img.com/a.jpg">',
+            "https://b.com/": '<meta property="og:image" content="https://img.com/b.jpg">',
+        }
+        serve(lambda request: httpx.Response(200, text=pages[str(request.url)]))
+
+        result = await fetch_og_images(["https://a.com/", "https://b.com/"])
 
-        responses = {
-            "https://a.com": html_a,
-            "https://b.com": html_b,
+        assert result == {
+            "https://a.com/": "https://img.com/a.jpg",
+            "https://b.com/": "https://img.com/b.jpg",
         }
 
-        async def mock_get(url, **kwargs):
-            resp = MagicMock()
-            resp.text = responses[url]
-            resp.raise_for_status = MagicMock()
-            return resp
+    @pytest.mark.asyncio
+    async def test_limits_concurrent_requests_per_host(self, serve):
+        active = peak = 0
+
+        async def track(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, text="<head></head>")
 
-        with patch("app.services.utils.image_fetcher.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.get = mock_get
-            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+        serve(track)
 
-            result = await fetch_og_images(["https://a.com", "https://b.com"])
+        with patch.object(image_fetcher, "_MAX_PER_HOST", 2):
+            await fetch_og_images([f"https://one-host.com/{i}" for i in range(8)])
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_budget_returns_resolved_and_keeps_fetching_the_rest(
+        self, serve, cache
+    ):
+        async def handler(request):
+            if request.url.host == "slow.com":
+                await asyncio.sleep(0.1)
+            return httpx.Response(
+                200,
+                text=f'<meta property="og:image" content="https://img.com/{request.url.host}.jpg">',
+            )
+
+        serve(handler)
+
+        result = await fetch_og_images(
+            ["https://fast.com/", "https://slow.com/"], budget=0.03
+        )
 
         assert result == {
-            "https://a.com": "https://img.com/a.jpg",
-            "https://b.com": "https://img.com/b.jpg",
+            "https://fast.com/": "https://img.com/fast.com.jpg",
+            "https://slow.com/": None,
         }
+        assert cache.get("https://slow.com/") is MISSING
+
+        # The slow fetch finishes in the background and warms the cache
+        await asyncio.sleep(0.15)
+        assert cache.get("https://slow.com/") == "https://img.com/slow.com.jpg"
 
     @pytest.mark.asyncio
     async def test_empty_urls_returns_empty_dict(self):
@@ -0,0 +1,15 @@
+from unittest.mock import MagicMock, patch
+
+from app.models import Base, create_tables
+
+
+class TestCreateTables:
+    def test_creates_missing_tables_under_advisory_lock(self):
+        engine = MagicMock()
+        conn = engine.begin.return_value.__enter__.return_value
+
+        with patch.object(Base.metadata, "create_all") as mock_create_all:
+            create_tables(engine)
+
+        assert "pg_advisory_xact_lock" in str(conn.execute.call_args.args[0])
+        mock_create_all.assert_called_once_with(conn, checkfirst=True)
@@ -0,0 +1,143 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from app.queries.intel.posts_queries import query_posts
+from app.services.intel.posts_service import list_posts
+from app.services.intel.structured_posts_service import list_structured_posts
+from app.services.utils.cursor import decode_cursor, encode_cursor
+
+POSTS = "app.services.intel.posts_service"
+STRUCTURED = "app.services.intel.structured_posts_service"
+
+
+def _make_post(id=1, date=datetime(2025, 7, 15, 12, 0)):
+    return SimpleNamespace(
+        id=id,
+        channel_id=10,
+        message_id=id,
+        text="text",
+        date=date,
+        edit_date=None,
+        has_media=False,
+        media_type=None,
+        collected_at=datetime(2025, 7, 15, 12, 5),
+    )
+
+
+def _make_structured(post):
+    return SimpleNamespace(
+        post_id=post.id,
+        label="strike",
+        priority=1,
+        latitude=None,
+        longitude=None,
+        location_name=None,
+        story_id=None,
+    )
+
+
+class TestListPosts:
+    @patch(f"{POSTS}.query_posts")
+    def test_next_cursor_points_at_last_returned_post(self, mock_query):
+        mock_query.return_value = [_make_post(id=i) for i in (5, 4, 3)]
+
+        result = list_posts(MagicMock(), limit=2)
+
+        assert [item.id for item in result.items] == [5, 4]
+        assert result.has_more is True
+        assert decode_cursor(result.next_cursor, int) == (
+            datetime(2025, 7, 15, 12, 0),
+            4,
+        )
+        assert mock_query.call_args.kwargs["limit"] == 3
+
+    @patch(f"{POSTS}.query_posts")
+    def test_no_cursor_on_last_page(self, mock_query):
+        mock_query.return_value = [_make_post(id=1)]
+
+        result = list_posts(MagicMock(), limit=2)
+
+        assert result.has_more is False
+        assert result.next_cursor is None
+
+    @patch(f"{POSTS}.query_posts", return_value=[])
+    def test_cursor_decoded_into_seek_position(self, mock_query):
+        position = (datetime(2025, 7, 15, 12, 0), 4)
+
+        list_posts(MagicMock(), cursor=encode_cursor(*position))
+
+        assert mock_query.call_args.kwargs["after"] == position
+
+    def test_invalid_cursor_raises_400(self):
+        with pytest.raises(HTTPException) as exc_info:
+            list_posts(MagicMock(), cursor="garbage")
+        assert exc_info.value.status_code == 400
+
+    def test_cursor_with_non_integer_id_raises_400(self):
+        cursor = encode_cursor(datetime(2025, 7, 15), "4")
+        with pytest.raises(HTTPException) as exc_info:
+            list_posts(MagicMock(), cursor=cursor)
+        assert exc_info.value.status_code == 400
+
+    @patch(f"{POSTS}.query_posts")
+    def test_next_cursor_after_undated_post(self, mock_query):
+        mock_query.return_value = [_make_post(id=i, date=None) for i in (7, 6)]
+
+        result = list_posts(MagicMock(), limit=1)
+
+        assert decode_cursor(result.next_cursor, int, nullable=True) == (None, 7)
+
+    @patch(f"{POSTS}.query_posts", return_value=[])
+    def test_undated_cursor_decoded_into_seek_position(self, mock_query):
+        list_posts(MagicMock(), cursor=encode_cursor(None, 7))
+
+        assert mock_query.call_args.kwargs["after"] == (None, 7)
+
+    def _sql(self, **kwargs):
+        with patch.object(Query, "all", autospec=True, return_value=[]) as mock_all:
+            query_posts(Session(), **kwargs)
+        query = mock_all.call_args.args[0]
+        return str(query.statement.compile(dialect=postgresql.dialect()))
+
+    def test_undated_posts_are_listed_last(self):
+        sql = self._sql()
+        assert "tg_posts.date IS NOT NULL" not in sql
+        assert "ORDER BY tg_posts.date DESC NULLS LAST, tg_posts.id DESC" in sql
+
+    def test_seek_past_dated_post_reaches_undated_ones(self):
+        sql = self._sql(after=(datetime(2025, 7, 15), 4))
+        assert "tg_posts.date IS NULL" in sql
+
+    def test_seek_past_undated_post_stays_among_undated_ones(self):
+        sql = self._sql(after=(None, 4))
+        assert "tg_posts.date IS NULL AND tg_posts.id <" in sql
+        assert "tg_posts.date <" not in sql
+
+
+class TestListStructuredPosts:
+    @patch(f"{STRUCTURED}.query_structured_posts")
+    def test_next_cursor_uses_source_post_position(self, mock_query):
+        posts = [_make_post(id=i) for i in (9, 8)]
+        mock_query.return_value = [(_make_structured(p), p) for p in posts]
+
+        result = list_structured_posts(MagicMock(), limit=1)
+
+        assert [item.post_id for item in result.items] == [9]
+        assert decode_cursor(result.next_cursor, int) == (
+            datetime(2025, 7, 15, 12, 0),
+            9,
+        )
+
+    @patch(f"{STRUCTURED}.query_structured_posts", return_value=[])
+    def test_cursor_decoded_into_seek_position(self, mock_query):
+        position = (datetime(2025, 7, 15, 12, 0), 9)
+
+        list_structured_posts(MagicMock(), cursor=encode_cursor(*position))
+
+        assert mock_query.call_args.kwargs["after"] == position
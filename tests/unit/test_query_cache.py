@@ -0,0 +1,113 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.queries.cache import cached_query, query_cache_stats
+from app.schemas.enums import FilterRegion
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Source(_Base):
+    __tablename__ = "test_query_cache_sources"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([_Source(id=1, name="b"), _Source(id=2, name="a")])
+        db.commit()
+        yield db
+
+
+def _later(seconds):
+    return patch(
+        "app.services.utils.cache_backends.time.time",
+        return_value=time.time() + seconds,
+    )
+
+
+class TestCachedQuery:
+    def test_repeated_call_is_served_from_cache(self):
+        calls = []
+
+        @cached_query(ttl=60)
+        def query(db, source_id, frequency=None):
+            calls.append((source_id, frequency))
+            return [source_id]
+
+        assert query(MagicMock(), 1) == [1]
+        assert query(MagicMock(), source_id=1, frequency=None) == [1]
+        assert query(MagicMock(), 2) == [2]
+        assert calls == [(1, None), (2, None)]
+        assert query.stats.hits == 1
+        assert query.stats.misses == 2
+
+    def test_list_and_enum_arguments_are_keyed_by_value(self):
+        calls = []
+
+        @cached_query(ttl=60)
+        def query(db, ids, region):
+            calls.append(1)
+            return len(ids)
+
+        query(MagicMock(), ["a", "b"], FilterRegion.europe)
+        query(MagicMock(), ["a", "b"], FilterRegion.europe)
+        query(MagicMock(), ["a", "c"], FilterRegion.europe)
+        assert len(calls) == 2
+
+    def test_entries_expire_after_ttl(self):
+        calls = []
+
+        @cached_query(ttl=60)
+        def query(db):
+            calls.append(1)
+            return len(calls)
+
+        query(MagicMock())
+        with _later(61):
+            assert query(MagicMock()) == 2
+
+    def test_orm_results_are_cached_as_read_only_snapshots(self, session):
+        @cached_query(ttl=60)
+        def query_sources(db):
+            return db.query(_Source).order_by(_Source.name).all()
+
+        rows = query_sources(session)
+        assert not any(isinstance(row, _Source) for row in rows)
+
+        session.close()
+        cached = query_sources(MagicMock())
+        assert [(s.id, s.name) for s in cached] == [(2, "a"), (1, "b")]
+        with pytest.raises(AttributeError):
+            cached[0].name = "c"
+
+    def test_result_rows_are_cached_as_tuples(self, session):
+        @cached_query(ttl=60)
+        def query_pairs(db):
+            return db.query(_Source, _Source.name).order_by(_Source.id).first()
+
+        source, name = query_pairs(session)
+        assert (source.id, name) == (1, "b")
+        assert query_pairs(MagicMock()) == (source, "b")
+
+    def test_stats_are_registered_by_qualified_name(self):
+        @cached_query(ttl=30)
+        def query(db):
+            return None
+
+        query(MagicMock())
+        stats = query_cache_stats()
+        info = stats[f"{query.__module__}.{query.__qualname__}"]
+        assert info["misses"] == 1
+        assert info["ttl"] == 30
@@ -0,0 +1,35 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from app.jobs.refresh_story_regions import refresh_once
+
+JOB = "app.jobs.refresh_story_regions"
+SINCE = datetime(2025, 7, 15)
+
+
+def _pass(**kwargs):
+    with patch(f"{JOB}.refresh_with_watermark") as mock_pass:
+        refresh_once(SINCE, **kwargs)
+    return mock_pass
+
+
+class TestRefreshOnce:
+    @patch(f"{JOB}.refresh_story_regions", return_value=12)
+    def test_refreshes_window_and_stories_updated_since_last_pass(self, mock_refresh):
+        mock_pass = _pass()
+        table_name, refresh = mock_pass.call_args.args
+        db, updated_since = MagicMock(), datetime(2025, 7, 18, 11, 55)
+
+        assert table_name == "api_story_regions"
+        assert refresh(db, updated_since) == 12
+        mock_refresh.assert_called_once_with(db, SINCE, updated_since=updated_since)
+
+    @patch(f"{JOB}.refresh_story_regions", return_value=40)
+    def test_full_pass_maps_every_story(self, mock_refresh):
+        mock_pass = _pass(full=True)
+        _, refresh = mock_pass.call_args.args
+        db = MagicMock()
+
+        assert mock_pass.call_args.kwargs == {"full": True}
+        assert refresh(db, None) == 40
+        mock_refresh.assert_called_once_with(db, None)
@@ -0,0 +1,133 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from app.jobs.refresh_story_threads import rebuild_threads, refresh_once, update_threads
+from app.services.utils.union_find import UnionFind
+
+JOB = "app.jobs.refresh_story_threads"
+
+
+def _written(mock_replace):
+    return mock_replace.call_args.args[1]
+
+
+class TestUnionFind:
+    def test_groups_connected_items(self):
+        sets = UnionFind(["z"])
+        sets.union("a", "b")
+        sets.union("c", "d")
+        sets.union("b", "d")
+
+        groups = sorted(sorted(c) for c in sets.components())
+
+        assert groups == [["a", "b", "c", "d"], ["z"]]
+
+
+class TestRebuildThreads:
+    @patch(f"{JOB}.label_unthreaded_stories", return_value=2)
+    @patch(f"{JOB}.replace_story_threads", return_value=5)
+    @patch(f"{JOB}.query_story_edges")
+    def test_labels_components_with_smallest_story_id(
+        self, mock_edges, mock_replace, mock_label
+    ):
+        mock_edges.return_value = [("s3", "s2"), ("s2", "s5"), ("s9", "s8")]
+
+        assert rebuild_threads(MagicMock()) == 7
+
+        assert _written(mock_replace) == {
+            "s2": "s2",
+            "s3": "s2",
+            "s5": "s2",
+            "s8": "s8",
+            "s9": "s8",
+        }
+        assert mock_replace.call_args.kwargs["clear"] is True
+        # Stories without edges get their own thread once the rest are written
+        mock_label.assert_called_once()
+
+
+class TestUpdateThreads:
+    @patch(f"{JOB}.label_unthreaded_stories", return_value=4)
+    @patch(f"{JOB}.replace_story_threads", return_value=0)
+    @patch(f"{JOB}.query_thread_members")
+    @patch(f"{JOB}.query_story_edges", return_value=[])
+    def test_no_new_edges_only_labels_new_stories(
+        self, mock_edges, mock_members, mock_replace, mock_label
+    ):
+        db = MagicMock()
+        since = datetime(2025, 7, 15)
+
+        assert update_threads(db, since) == 4
+
+        mock_replace.assert_not_called()
+        mock_label.assert_called_once_with(db, updated_since=since)
+
+    @patch(f"{JOB}.label_unthreaded_stories", return_value=0)
+    @patch(f"{JOB}.replace_story_threads", return_value=5)
+    @patch(f"{JOB}.query_thread_members")
+    @patch(f"{JOB}.query_story_edges")
+    def test_new_edge_merges_existing_threads(
+        self, mock_edges, mock_members, mock_replace, mock_label
+    ):
+        # Threads {a, b} and {c, d} exist; a new edge b -> d joins them
+        mock_edges.return_value = [("b", "d"), ("d", "new")]
+        mock_members.return_value = [
+            ("a", "a"),
+            ("b", "a"),
+            ("c", "c"),
+            ("d", "c"),
+        ]
+
+        update_threads(MagicMock(), datetime(2025, 7, 15))
+
+        assert set(mock_members.call_args.args[1]) == {"b", "d", "new"}
+        assert _written(mock_replace) == {
+            "a": "a",
+            "b": "a",
+            "c": "a",
+            "d": "a",
+            "new": "a",
+        }
+        assert mock_replace.call_args.kwargs.get("clear", False) is False
+
+
+@patch(f"{JOB}.update_threads", return_value=3)
+@patch(f"{JOB}.rebuild_threads", return_value=7)
+class TestRefreshOnce:
+    def _refresh(self, since, updated_since):
+        """Run refresh_once's own step as the shared pass would call it."""
+        with patch(f"{JOB}.refresh_with_watermark") as mock_pass:
+            refresh_once(since)
+        table_name, refresh = mock_pass.call_args.args
+        assert table_name == "api_story_threads"
+        assert mock_pass.call_args.kwargs == {"full": since is None}
+        db = MagicMock()
+        return db, refresh(db, updated_since)
+
+    def test_rebuilds_without_since(self, mock_rebuild, mock_update):
+        _, written = self._refresh(None, None)
+
+        assert written == 7
+        mock_update.assert_not_called()
+
+    def test_rebuilds_on_first_pass(self, mock_rebuild, mock_update):
+        _, written = self._refresh(datetime(2025, 7, 15), None)
+
+        assert written == 7
+        mock_update.assert_not_called()
+
+    def test_updates_incrementally_with_since(self, mock_rebuild, mock_update):
+        since = datetime(2025, 7, 15, 12, 0)
+
+        db, written = self._refresh(since, datetime(2025, 7, 15, 12, 55))
+
+        assert written == 3
+        mock_update.assert_called_once_with(db, since)
+        mock_rebuild.assert_not_called()
+
+    def test_catches_up_from_the_previous_pass(self, mock_rebuild, mock_update):
+        updated_since = datetime(2025, 7, 13, 23, 55)
+
+        db, _ = self._refresh(datetime(2025, 7, 15), updated_since)
+
+        mock_update.assert_called_once_with(db, updated_since)
@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.jobs.watermark import refresh_with_watermark
+
+JOB = "app.jobs.watermark"
+LAST_PASS = datetime(2025, 7, 18, 12, 0)
+
+
+@contextmanager
+def _session(db):
+    yield db
+
+
+@patch(f"{JOB}.set_watermark")
+@patch(f"{JOB}.query_watermark", return_value=LAST_PASS)
+@patch(f"{JOB}.try_lock_refresh", return_value=True)
+class TestRefreshWithWatermark:
+    def _run(self, refresh, full=False):
+        db = MagicMock()
+        with patch(f"{JOB}.get_session", return_value=_session(db)):
+            written = refresh_with_watermark("api_rows", refresh, full=full)
+        return db, written
+
+    def test_refreshes_rows_changed_since_last_pass(
+        self, mock_lock, mock_watermark, mock_set_watermark
+    ):
+        refresh = MagicMock(return_value=12)
+
+        db, written = self._run(refresh)
+
+        assert written == 12
+        refresh.assert_called_once_with(db, LAST_PASS - timedelta(minutes=5))
+        assert mock_set_watermark.call_args.args[:2] == (db, "api_rows")
+        db.commit.assert_called_once()
+
+    def test_first_pass_is_full(self, mock_lock, mock_watermark, mock_set_watermark):
+        mock_watermark.return_value = None
+        refresh = MagicMock(return_value=40)
+
+        db, _ = self._run(refresh)
+
+        refresh.assert_called_once_with(db, None)
+        mock_set_watermark.assert_called_once()
+
+    def test_full_pass_ignores_watermark(
+        self, mock_lock, mock_watermark, mock_set_watermark
+    ):
+        refresh = MagicMock(return_value=40)
+
+        db, _ = self._run(refresh, full=True)
+
+        refresh.assert_called_once_with(db, None)
+        mock_watermark.assert_not_called()
+
+    def test_skips_while_another_pass_holds_the_lock(
+        self, mock_lock, mock_watermark, mock_set_watermark
+    ):
+        mock_lock.return_value = False
+        refresh = MagicMock()
+
+        db, written = self._run(refresh)
+
+        assert written == 0
+        refresh.assert_not_called()
+        mock_set_watermark.assert_not_called()
+        db.commit.assert_not_called()
@@ -0,0 +1,54 @@
+import json
+from datetime import date, datetime
+
+from fastapi import Response
+
+from app.responses import ModelJSONResponse, model_response
+from app.schemas.data import (
+    TSDatapointSchema,
+    TSEntitySchema,
+    TSIndicatorSchema,
+    TSSeriesSchema,
+    TSSourceSchema,
+)
+from app.schemas.news import NewsStoryArticle
+
+
+def _series():
+    return TSSeriesSchema(
+        indicator=TSIndicatorSchema(
+            id="gdp", name="GDP", source=TSSourceSchema(id=1, name="wb")
+        ),
+        entity=TSEntitySchema(id="GBR", name="United Kingdom", entity_type="country"),
+        datapoints=[TSDatapointSchema(date=date(2024, 1, 1), value=1.5)],
+    )
+
+
+class TestModelJSONResponse:
+    def test_renders_list_of_models_like_model_dump(self):
+        series = [_series(), _series()]
+
+        response = ModelJSONResponse(series)
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == [s.model_dump(mode="json") for s in series]
+
+    def test_renders_datetimes_as_iso_strings(self):
+        body = ModelJSONResponse({"at": datetime(2024, 5, 1, 12, 30)}).body
+        assert json.loads(body) == {"at": "2024-05-01T12:30:00"}
+
+
+class TestModelResponse:
+    def test_keeps_headers_set_by_dependencies(self):
+        # FastAPI's injected response carries no Content-Length of its own
+        injected = Response()
+        del injected.headers["content-length"]
+        injected.headers["Cache-Control"] = "public, s-maxage=60"
+        article = NewsStoryArticle(
+            article_id="a1", headline="h", source="bbc", url="https://x"
+        )
+
+        response = model_response(article, injected)
+
+        assert response.headers["cache-control"] == "public, s-maxage=60"
+        assert json.loads(response.body)["article_id"] == "a1"
@@ -0,0 +1,24 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from app.jobs.scheduler import _run_every, start_refresh_jobs
+
+SCHEDULER = "app.jobs.scheduler"
+
+
+class TestRunEvery:
+    async def test_keeps_running_after_a_failed_pass(self):
+        refresh = MagicMock(side_effect=[RuntimeError("db down"), 3, 4])
+
+        task = asyncio.create_task(_run_every("test", refresh, 0))
+        while refresh.call_count < 3:
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+        assert refresh.call_count >= 3
+
+
+class TestStartRefreshJobs:
+    async def test_disabled_with_zero_interval(self):
+        with patch(f"{SCHEDULER}.REFRESH_JOBS_INTERVAL", 0):
+            assert start_refresh_jobs() == []
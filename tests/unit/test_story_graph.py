@@ -0,0 +1,119 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+from app.services.news.story_graph import StoryGraphIndex
+
+QUERIES = "app.services.news.story_graph"
+
+# a -> b -> c -> d, with a cycle b <-> e and x -> a pointing inwards
+EDGES = [("a", "b"), ("b", "c"), ("c", "d"), ("b", "e"), ("e", "b"), ("x", "a")]
+
+
+def _clock(value):
+    return patch(f"{QUERIES}.time.monotonic", return_value=value)
+
+
+class TestStoryGraphIndex:
+    @patch(f"{QUERIES}.query_story_edges", return_value=EDGES)
+    def test_walks_edges_in_both_directions_nearest_first(self, mock_edges):
+        index = StoryGraphIndex()
+
+        related = index.related(MagicMock(), "a", max_depth=10, max_results=50)
+
+        assert related[:2] in (["b", "x"], ["x", "b"])
+        assert sorted(related) == ["b", "c", "d", "e", "x"]
+
+    @patch(f"{QUERIES}.query_story_edges", return_value=EDGES)
+    def test_respects_depth_and_result_caps(self, mock_edges):
+        index = StoryGraphIndex()
+
+        assert sorted(index.related(MagicMock(), "a", 1, 50)) == ["b", "x"]
+        assert len(index.related(MagicMock(), "a", 10, 3)) == 3
+
+    @patch(f"{QUERIES}.query_story_edges", return_value=EDGES)
+    def test_loads_edges_once_between_refreshes(self, mock_edges):
+        index = StoryGraphIndex(refresh_interval=60)
+
+        with _clock(1000.0):
+            index.related(MagicMock(), "a", 10, 50)
+            index.related(MagicMock(), "c", 10, 50)
+
+        mock_edges.assert_called_once()
+
+    @patch(f"{QUERIES}.query_story_edges")
+    def test_refresh_merges_recently_updated_edges(self, mock_edges):
+        mock_edges.side_effect = [EDGES, [("d", "new")]]
+        index = StoryGraphIndex(refresh_interval=60, rebuild_interval=3600)
+
+        with _clock(1000.0):
+            index.related(MagicMock(), "a", 10, 50)
+        with _clock(1061.0):
+            related = index.related(MagicMock(), "a", 10, 50)
+
+        assert "new" in related
+        assert mock_edges.call_args.kwargs["updated_since"] is not None
+
+    @patch(f"{QUERIES}.query_story_edges")
+    def test_rebuild_drops_removed_edges(self, mock_edges):
+        mock_edges.side_effect = [EDGES, [("a", "b")]]
+        index = StoryGraphIndex(refresh_interval=60, rebuild_interval=3600)
+
+        with _clock(1000.0):
+            index.related(MagicMock(), "a", 10, 50)
+        with _clock(4601.0):
+            related = index.related(MagicMock(), "a", 10, 50)
+
+        assert related == ["b"]
+
+    @patch(f"{QUERIES}.query_story_edges")
+    def test_lookups_use_previous_graph_while_rebuilding(self, mock_edges):
+        loading, release = threading.Event(), threading.Event()
+
+        def edges(db):
+            if mock_edges.call_count == 1:
+                return EDGES
+            loading.set()
+            release.wait(5)
+            return [("a", "b")]
+
+        mock_edges.side_effect = edges
+        index = StoryGraphIndex(refresh_interval=60, rebuild_interval=3600)
+        with _clock(1000.0):
+            index.related(MagicMock(), "a", 10, 50)
+
+        with _clock(4601.0):
+            rebuild = threading.Thread(
+                target=index.related, args=(MagicMock(), "a", 10, 50)
+            )
+            rebuild.start()
+            loading.wait(5)
+            related = index.related(MagicMock(), "a", 10, 50)
+            release.set()
+            rebuild.join(5)
+
+            assert sorted(related) == ["b", "c", "d", "e", "x"]
+            assert index.related(MagicMock(), "a", 10, 50) == ["b"]
+
+    @patch(f"{QUERIES}.query_story_edges")
+    def test_lookups_never_wait_for_the_first_load(self, mock_edges):
+        loading, release = threading.Event(), threading.Event()
+
+        def edges(db):
+            loading.set()
+            release.wait(5)
+            return EDGES
+
+        mock_edges.side_effect = edges
+        index = StoryGraphIndex()
+
+        first_load = threading.Thread(
+            target=index.related, args=(MagicMock(), "a", 10, 50)
+        )
+        first_load.start()
+        loading.wait(5)
+        assert index.related(MagicMock(), "a", 10, 50) is None
+        release.set()
+        first_load.join(5)
+
+        related = index.related(MagicMock(), "a", 10, 50)
+        assert sorted(related) == ["b", "c", "d", "e", "x"]
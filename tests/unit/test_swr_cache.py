@@ -0,0 +1,86 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services.utils.cache_backends import MemoryCache
+from app.services.utils.swr_cache import StaleWhileRevalidateCache
+
+
+def _counter(delay=0.0, fail=False):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("db down")
+        return len(calls)
+
+    return compute, calls
+
+
+def _later(seconds):
+    return patch(
+        "app.services.utils.swr_cache.time.time", return_value=time.time() + seconds
+    )
+
+
+class TestStaleWhileRevalidateCache:
+    @pytest.mark.asyncio
+    async def test_fresh_value_is_not_recomputed(self):
+        cache = StaleWhileRevalidateCache(MemoryCache())
+        compute, calls = _counter()
+
+        assert await cache.get("k", 60, compute) == 1
+        assert await cache.get("k", 60, compute) == 1
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_computation(self):
+        cache = StaleWhileRevalidateCache(MemoryCache())
+        compute, calls = _counter(delay=0.02)
+
+        results = await asyncio.gather(*(cache.get("k", 60, compute) for _ in range(5)))
+
+        assert results == [1] * 5
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_one_refresh_runs(self):
+        cache = StaleWhileRevalidateCache(MemoryCache())
+        compute, calls = _counter(delay=0.02)
+        await cache.get("k", 60, compute)
+
+        with _later(61):
+            stale = await asyncio.gather(
+                *(cache.get("k", 60, compute) for _ in range(5))
+            )
+        assert stale == [1] * 5
+
+        await asyncio.sleep(0.05)
+        assert len(calls) == 2
+        assert await cache.get("k", 60, compute) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(self):
+        cache = StaleWhileRevalidateCache(MemoryCache())
+        ok, _ = _counter()
+        await cache.get("k", 60, ok)
+
+        failing, calls = _counter(fail=True)
+        with _later(61):
+            assert await cache.get("k", 60, failing) == 1
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert await cache.get("k", 60, ok) == 1
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_miss_propagates_errors(self):
+        cache = StaleWhileRevalidateCache(MemoryCache())
+        failing, _ = _counter(fail=True)
+
+        with pytest.raises(RuntimeError):
+            await cache.get("k", 60, failing)
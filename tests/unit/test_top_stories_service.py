@@ -1,66 +1,83 @@
+from contextlib import contextmanager
 from datetime import datetime
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
-from app.schemas.enums import FilterPeriod, FilterRegion
+from app.queries.news.stories_queries import query_top_stories_by_region
+from app.schemas.enums import FilterPeriod
+from app.services.landing import top_stories_service
 from app.services.landing.top_stories_service import get_top_stories_by_region
+from app.services.utils.cache_backends import MemoryCache
+from app.services.utils.swr_cache import StaleWhileRevalidateCache
 
 QUERIES = "app.services.landing.top_stories_service"
 
 
-def _make_story(id="story1", title="Test Story"):
-    return SimpleNamespace(
-        id=id,
-        title=title,
-        summary="A summary",
-        key_points=["point1"],
-        story_period=datetime(2025, 7, 15, 12, 0),
-        created_at=datetime(2025, 7, 15, 12, 0),
-        updated_at=datetime(2025, 7, 15, 13, 0),
-    )
+@contextmanager
+def _session():
+    yield MagicMock()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    cache = StaleWhileRevalidateCache(MemoryCache())
+    with (
+        patch.object(top_stories_service, "_cache", cache),
+        patch(f"{QUERIES}.get_session", new=_session),
+    ):
+        yield cache
+
+
+def _make_row(region="europe", id="story1", title="Test Story"):
+    return SimpleNamespace(region=region, id=id, title=title)
 
 
 class TestGetTopStoriesByRegion:
     @pytest.mark.asyncio
     @patch(f"{QUERIES}.query_story_locations", return_value={})
-    @patch(f"{QUERIES}.query_stories", return_value=[])
+    @patch(f"{QUERIES}.query_top_stories_by_region", return_value=[])
     async def test_returns_all_regions_even_when_empty(self, *_):
-        result = await get_top_stories_by_region(MagicMock(), FilterPeriod.today)
+        result = await get_top_stories_by_region(FilterPeriod.today)
         # When all regions return no stories, result is empty
         assert result == []
 
     @pytest.mark.asyncio
     @patch(f"{QUERIES}.query_story_locations", return_value={})
-    @patch(f"{QUERIES}.query_stories")
-    async def test_returns_stories_grouped_by_region(self, mock_stories, _):
-        story = _make_story()
-
-        def side_effect(db, start, end, region=None, limit=None, parent_only=True):
-            if region == FilterRegion.europe:
-                return [story]
-            return []
-
-        mock_stories.side_effect = side_effect
+    @patch(f"{QUERIES}.query_top_stories_by_region")
+    async def test_returns_stories_grouped_by_region(self, mock_top, _):
+        mock_top.return_value = [
+            _make_row(region="europe", id="story1"),
+            _make_row(region="europe", id="story2"),
+            _make_row(region="asia", id="story3"),
+        ]
 
-        result = await get_top_stories_by_region(MagicMock(), FilterPeriod.today)
-
-        region_names = [r.region for r in result]
-        assert "europe" in region_names
+        result = await get_top_stories_by_region(FilterPeriod.today)
 
+        # Every region is present, in FilterRegion order, with its own stories
         europe = next(r for r in result if r.region == "europe")
-        assert len(europe.stories) == 1
-        assert europe.stories[0].story_id == "story1"
+        assert [s.story_id for s in europe.stories] == ["story1", "story2"]
+        asia = next(r for r in result if r.region == "asia")
+        assert [s.story_id for s in asia.stories] == ["story3"]
+        assert all(
+            r.stories == [] for r in result if r.region not in {"europe", "asia"}
+        )
+
+        # One ranked query covers every region
+        mock_top.assert_called_once()
+        assert mock_top.call_args.kwargs["per_region"] == 3
 
     @pytest.mark.asyncio
     @patch(f"{QUERIES}.query_story_locations")
-    @patch(f"{QUERIES}.query_stories")
-    async def test_batch_fetches_locations(self, mock_stories, mock_locations):
-        story = _make_story()
-        mock_stories.side_effect = lambda *a, region=None, **kw: (
-            [story] if region == FilterRegion.asia else []
-        )
+    @patch(f"{QUERIES}.query_top_stories_by_region")
+    async def test_batch_fetches_locations(self, mock_top, mock_locations):
+        # The same story can rank in more than one region
+        mock_top.return_value = [
+            _make_row(region="asia"),
+            _make_row(region="oceania"),
+        ]
         mock_locations.return_value = {
             "story1": [
                 {
@@ -74,11 +91,45 @@ class TestGetTopStoriesByRegion:
             ]
         }
 
-        result = await get_top_stories_by_region(MagicMock(), FilterPeriod.today)
+        result = await get_top_stories_by_region(FilterPeriod.today)
 
         asia = next(r for r in result if r.region == "asia")
         assert len(asia.stories[0].locations) == 1
         assert asia.stories[0].locations[0].name == "Tokyo"
 
-        # Locations queried in a single batch call
+        # Locations queried in a single batch call, once per story
         mock_locations.assert_called_once()
+        assert mock_locations.call_args.args[1] == ["story1"]
+
+    @pytest.mark.asyncio
+    @patch(f"{QUERIES}.query_story_locations", return_value={})
+    @patch(f"{QUERIES}.query_top_stories_by_region")
+    async def test_repeat_requests_served_from_cache(self, mock_top, _):
+        mock_top.return_value = [_make_row()]
+
+        first = await get_top_stories_by_region(FilterPeriod.week)
+        second = await get_top_stories_by_region(FilterPeriod.week)
+
+        assert first == second
+        mock_top.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch(f"{QUERIES}.query_story_locations", return_value={})
+    @patch(f"{QUERIES}.query_top_stories_by_region", return_value=[])
+    async def test_cache_keyed_by_period(self, mock_top, _):
+        await get_top_stories_by_region(FilterPeriod.today)
+        await get_top_stories_by_region(FilterPeriod.month)
+
+        assert mock_top.call_count == 2
+
+
+class TestQueryTopStoriesByRegion:
+    def test_matches_stories_the_region_job_has_not_mapped_live(self):
+        db = MagicMock()
+
+        query_top_stories_by_region(db, datetime(2025, 7, 1), datetime(2025, 7, 8))
+
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM api_story_regions" in sql
+        assert " UNION " in sql
+        assert "FROM api_job_watermarks" in sql